@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from numpy import array, full, random, testing
+
+from module import battery
+
+
+class TestBattery(unittest.TestCase):
+
+    def setUp(self):
+        self.battery = battery.Battery(capacity=1_000, min_state_of_charge=10, max_charging_power=1_000,
+                                       load_efficiency=0.9, converter_efficiency=0.8, max_converter_power=800)
+
+    def test_charge_and_discharge(self):
+        result = self.battery.simulate(array([400., 400., -160., 0.]), state_of_charge=50)
+        # 400 W for 15 min with 90 % efficiency are 90 Wh, 160 W missing take 50 Wh out of the battery
+        testing.assert_allclose(result.state_of_charge, [59., 68., 63., 63.])
+        testing.assert_allclose(result.charge, [90., 90., 0., 0.])
+        testing.assert_allclose(result.discharge, [0., 0., 50., 0.])
+
+    def test_limits(self):
+        state = self.battery.simulate(full(8, 4_000.), state_of_charge=60).state_of_charge
+        self.assertEqual(state.max(), 100.)
+        # the charging power limits the first step to 1000 W
+        self.assertAlmostEqual(state[0], 60 + 1_000 * 0.25 * 0.9 / 10)
+
+        state = self.battery.simulate(full(8, -4_000.), state_of_charge=30).state_of_charge
+        self.assertEqual(state[-1], 10.)
+
+    def test_overload(self):
+        pv, overload = self.battery.limit_pv(array([500., 1_000.]))
+        testing.assert_allclose(pv, [500., 800.])
+        testing.assert_allclose(overload, [0., 200.])
+        state = self.battery.simulate(pv - pv, 50, overload).state_of_charge
+        testing.assert_allclose(state, [50., 55.])
+
+    def test_year(self):
+        net_power = random.default_rng(1).normal(0, 600, 365 * 96)
+        start = time.perf_counter()
+        state = self.battery.simulate(net_power, 50).state_of_charge
+        self.assertLess(time.perf_counter() - start, 0.5)
+        testing.assert_allclose(state, battery._scan_array(self.battery.net_energy(net_power) / 10, 50., 10., 100.))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from module import fetch, forecast_store, price_store, sessions
+
+DELAY: float = 0.3
+
+
+def forecast(query: dict) -> dict:
+    start = datetime.date.fromisoformat(query["start_date"][0])
+    end = datetime.date.fromisoformat(query["end_date"][0])
+    days = [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+    hours = [f"{day}T{h:02d}:00" for day in days for h in range(24)]
+    min15 = [f"{day}T{h:02d}:{m:02d}" for day in days for h in range(24) for m in range(0, 60, 15)]
+    return {"hourly": {"time": hours, "temperature_2m": [15.0] * len(hours), "cloudcover": [20] * len(hours)},
+            "minutely_15": {"time": min15, "direct_radiation": [100.0] * len(min15),
+                            "direct_normal_irradiance": [200.0] * len(min15),
+                            "shortwave_radiation": [300.0] * len(min15)}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    failures: dict = {}
+    requested: list = []
+    markets: int = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        time.sleep(DELAY)
+
+        if self.failures.get(url.path, 0) > 0:
+            self.failures[url.path] -= 1
+            self._send(503, {"reason": "busy"})
+        elif url.path == "/v1/forecast":
+            self.requested.append(url.query)
+            self._send(200, forecast(parse_qs(url.query)))
+        elif url.path == "/v1/marketdata":
+            _Handler.markets += 1
+            start = int(parse_qs(url.query)["start"][0])
+            self._send(200, {"data": [{"start_timestamp": start + i * 3_600_000,
+                                       "end_timestamp": start + (i + 1) * 3_600_000,
+                                       "marketprice": 100.0, "unit": "Eur/MWh"} for i in range(24)]})
+        else:
+            self._send(404, {})
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFetch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.config = {"coordinates": {"latitude": 49.46, "longitude": 11.11}, "market": {"consumer_price": 20}}
+        _Handler.failures = {}
+        _Handler.requested = []
+        _Handler.markets = 0
+        self.store = forecast_store.ForecastStore()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.prices = price_store.PriceStore(f"{self.cache_dir.name}/prices.sqlite")
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def _fetch(self, days: int = 1, retries: int = 0, **kwargs):
+        session = sessions.mount_retries(requests.Session(), retries)
+        return fetch.get_weather_and_market(self.config, days=days, weather_url=self.url, market_url=self.url,
+                                            weather_session=session, market_session=session,
+                                            store=self.store, prices=self.prices, **kwargs)
+
+    def test_requests_are_concurrent(self):
+        start = time.perf_counter()
+        weather, market = self._fetch()
+        duration = time.perf_counter() - start
+
+        self.assertLess(duration, 2 * DELAY)
+        self.assertEqual(weather.dates, [datetime.date.today().strftime("%d-%m-%Y")])
+        self.assertEqual(float(weather.column("ghi_radiation")[0]), 300.0)
+        self.assertEqual(len(market.data), 24)
+        self.assertEqual(market.data[0]["marketprice"], 10.0)
+
+    def test_retry_on_server_error(self):
+        _Handler.failures = {"/v1/marketdata": 1}
+        _, market = self._fetch(retries=2)
+        self.assertEqual(len(market.data), 24)
+
+        # the session is the only retry layer, a request is sent once plus the number of retries
+        _Handler.failures = {"/v1/marketdata": 5}
+        with self.assertRaises(requests.HTTPError):
+            self._fetch(start_time="2024-01-01T00:00", end_time="2024-01-02T00:00", retries=2)
+        self.assertEqual(_Handler.failures["/v1/marketdata"], 2)
+
+    def test_only_missing_days_are_requested(self):
+        self._fetch(days=3)
+        weather, _ = self._fetch(days=5)
+
+        self.assertEqual(len(weather.dates), 5)
+        start = datetime.date.today() + datetime.timedelta(days=3)
+        self.assertIn(f"start_date={start}&end_date={start + datetime.timedelta(days=1)}", _Handler.requested[-1])
+        self._fetch(days=4)
+        self.assertEqual(len(_Handler.requested), 2)
+        self.assertEqual(_Handler.markets, 1)
+
+    def test_timeout(self):
+        with self.assertRaises(requests.Timeout):
+            self._fetch(timeout=DELAY / 3, retries=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
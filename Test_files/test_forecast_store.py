@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from numpy import datetime64, timedelta64
+
+from module import forecast_store
+
+
+def _response(first_day: str, days: int, value: float) -> dict:
+    start = datetime64(first_day, "D")
+    dates = [str(start + i) for i in range(days)]
+    hours = [f"{date}T{h:02d}:00" for date in dates for h in range(24)]
+    min15 = [f"{date}T{h:02d}:{m:02d}" for date in dates for h in range(24) for m in range(0, 60, 15)]
+    return {"hourly": {"time": hours, "temperature_2m": [value] * len(hours), "cloudcover": [0] * len(hours)},
+            "minutely_15": {"time": min15, "direct_radiation": [value] * len(min15),
+                            "direct_normal_irradiance": [value] * len(min15),
+                            "shortwave_radiation": [value] * len(min15)}}
+
+
+class TestForecastStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = forecast_store.ForecastStore(max_age=3600)
+        self.now = datetime64("2024-06-10T08:00", "s")
+        self.first, self.last = datetime64("2024-06-10"), datetime64("2024-06-16")
+
+    def test_empty_store_requests_everything(self):
+        self.assertEqual(self.store.missing_range(49.46, 11.11, self.first, self.last, self.now),
+                         (self.first, self.last))
+
+    def test_only_missing_horizon(self):
+        self.store.update(49.46, 11.11, _response("2024-06-10", 3, 1.0), self.now)
+        self.assertEqual(self.store.missing_range(49.46, 11.11, self.first, self.last, self.now),
+                         (datetime64("2024-06-13"), self.last))
+        self.assertIsNone(self.store.missing_range(49.46, 11.11, self.first, self.first + 2, self.now))
+        self.assertIsNotNone(self.store.missing_range(49.46, 11.12, self.first, self.first + 2, self.now))
+
+    def test_stale_days(self):
+        self.store.update(49.46, 11.11, _response("2024-06-09", 3, 1.0), self.now - timedelta64(2, "h"))
+        missing = self.store.missing_range(49.46, 11.11, datetime64("2024-06-09"), datetime64("2024-06-11"),
+                                           self.now)
+        # the 9th was fetched after it was over, it does not change any more
+        self.assertEqual(missing, (datetime64("2024-06-10"), datetime64("2024-06-11")))
+
+    def test_merge(self):
+        self.store.update(49.46, 11.11, _response("2024-06-10", 3, 1.0), self.now)
+        self.store.update(49.46, 11.11, _response("2024-06-12", 2, 2.0), self.now)
+
+        weather = self.store.weather(49.46, 11.11, self.first, self.last)
+        self.assertEqual(weather.dates, ["10-06-2024", "11-06-2024", "12-06-2024", "13-06-2024"])
+        self.assertEqual(len(weather.series), 4 * 96)
+        self.assertEqual(float(weather.column("temp")[96]), 1.0)
+        self.assertEqual(float(weather.column("temp")[2 * 96]), 2.0)
+
+        part = self.store.weather(49.46, 11.11, datetime64("2024-06-11"), datetime64("2024-06-11"))
+        self.assertEqual(part.dates, ["11-06-2024"])
+
+    def test_past_days_are_evicted(self):
+        store = forecast_store.ForecastStore(max_age=3600, keep_days=1)
+        store.update(49.46, 11.11, _response("2024-06-07", 4, 1.0), self.now)
+        # the past days of a response are kept until the next update
+        self.assertEqual(len(store.weather(49.46, 11.11, datetime64("2024-06-07"), self.last).dates), 4)
+
+        store.update(49.46, 11.11, _response("2024-06-11", 1, 2.0), self.now)
+        weather = store.weather(49.46, 11.11, datetime64("2024-06-07"), self.last)
+        self.assertEqual(weather.dates, ["09-06-2024", "10-06-2024", "11-06-2024"])
+        self.assertEqual(store.missing_range(49.46, 11.11, datetime64("2024-06-08"), datetime64("2024-06-09"),
+                                             self.now), (datetime64("2024-06-08"), datetime64("2024-06-08")))
+
+    def test_max_locations(self):
+        store = forecast_store.ForecastStore(max_age=3600, max_locations=2)
+        for longitude in (11.11, 11.12, 11.11, 11.13):
+            store.update(49.46, longitude, _response("2024-06-10", 1, 1.0), self.now)
+
+        # 11.12 was the least recently updated location
+        self.assertIsNotNone(store.missing_range(49.46, 11.12, self.first, self.first, self.now))
+        self.assertIsNone(store.missing_range(49.46, 11.11, self.first, self.first, self.now))
+        self.assertIsNone(store.missing_range(49.46, 11.13, self.first, self.first, self.now))
+        self.assertEqual(store.weather(49.46, 11.12, self.first, self.first).dates, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
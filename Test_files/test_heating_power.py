@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+
+from numpy import array, testing
+
+from module import classes
+
+
+def _element(area: float = 0., u_wert: float | None = 0.) -> SimpleNamespace:
+    return SimpleNamespace(area=area, u_wert=u_wert)
+
+
+def _wall(area: float, u_wert: float, window: SimpleNamespace, interior_wall_temp: float = 0) -> SimpleNamespace:
+    return SimpleNamespace(area=area, u_wert=u_wert, temp_diff=0, interior_wall_temp=interior_wall_temp,
+                           Window1=window, Window2=_element(), Window3=_element(), Window4=_element(),
+                           Door=_element())
+
+
+class TestHeatingPower(unittest.TestCase):
+
+    def setUp(self):
+        self.room = SimpleNamespace(Wall1=_wall(10., 1.0, _element(2., 3.0)),
+                                    Wall2=_wall(8., 0.5, _element(1., None)),
+                                    Wall3=_wall(12., 0.4, _element(), interior_wall_temp=18),
+                                    Wall4=_wall(0., 0., _element()))
+
+    def test_ua(self):
+        # (10 - 2) * 1.0 + 2 * 3.0, a window without u value has no loss
+        self.assertEqual(classes.RequiredHeatingPower.wall_ua(self.room.Wall1), 14.)
+        self.assertEqual(classes.RequiredHeatingPower.wall_ua(self.room.Wall2), 3.5)
+
+    def test_array(self):
+        outdoor_temps = array([-10., 0., 12.5, 22.])
+        power = classes.RequiredHeatingPower.calc_heating_power_array(self.room, outdoor_temps, 22)
+        # the interior wall loses 12 * 0.4 * |18 - 22| independent of the outdoor temperature
+        testing.assert_allclose(power, 17.5 * (22 - outdoor_temps) + 19.2, rtol=1e-6)
+
+        for outdoor_temp, expected in zip(outdoor_temps, power):
+            for wall in (self.room.Wall1, self.room.Wall2, self.room.Wall4):
+                wall.temp_diff = 22 - outdoor_temp
+            self.room.Wall3.temp_diff = 4
+            self.assertAlmostEqual(float(classes.RequiredHeatingPower.calc_heating_power(self.room)), float(expected),
+                                   places=3)
+
+
+class TestUValueTable(unittest.TestCase):
+
+    def test_interval(self):
+        self.assertEqual(classes.U_VALUES.get("Wand", "Außenwand", "Massivbauweise", year=1918), 1.7)
+        self.assertEqual(classes.U_VALUES.get("Wand", "Außenwand", "Massivbauweise", year=1960), 1.4)
+        self.assertEqual(classes.U_VALUES.get("Fenster", "Kunststoffrahmen", "Isolierverglasung", year=1995), 1.8)
+
+    def test_missing(self):
+        # before the first interval, between the ENEV years and an unknown element
+        self.assertIsNone(classes.U_VALUES.get("Wand", "Außenwand", "Massivbauweise", year=1900))
+        self.assertIsNone(classes.U_VALUES.get("Fenster", "ENEV", year=2010))
+        self.assertIsNone(classes.U_VALUES.get("Fenster", "Stein", "Isolierverglasung", year=1960))
+        self.assertEqual(classes.U_VALUES.get("Türen", "alle", year=1900, default=0), 0)
+
+    def test_enev(self):
+        self.assertEqual(classes.U_VALUES.get("Fenster", "ENEV", year=2016), 0.98)
+        self.assertEqual(classes.U_VALUES.get("Decke", "ENEV Dach", year=2014), 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
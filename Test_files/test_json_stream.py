@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+
+from module import json_stream
+
+
+class TestJsonStream(unittest.TestCase):
+
+    def test_array(self):
+        data = [1234567, {"a": [1, 2]}, "x, ]", None, 1.5]
+        items = list(json_stream.iter_items(io.StringIO(json.dumps(data)), block_size=3))
+        self.assertEqual(items, list(enumerate(data)))
+
+    def test_object(self):
+        data = {"01-01": {"00:00": 1}, "b": 22, "c": []}
+        items = list(json_stream.iter_items(io.StringIO(json.dumps(data, indent=2)), block_size=4))
+        self.assertEqual(items, list(data.items()))
+        self.assertEqual(list(json_stream.iter_items(io.StringIO(" [ ] "))), [])
+
+    def test_path(self):
+        data = {"inputs": {"year_min": 2005}, "outputs": {"daily": [[1], {"x": "]}"}], "hourly": [{"a": 1}, 2]},
+                "meta": None}
+        others = {}
+        items = list(json_stream.iter_items(io.StringIO(json.dumps(data)), ("outputs", "hourly"), others,
+                                            block_size=5))
+        self.assertEqual(items, [(0, {"a": 1}), (1, 2)])
+        self.assertEqual(others, {"inputs": {"year_min": 2005}, "daily": [[1], {"x": "]}"}], "meta": None})
+
+        skipped = list(json_stream.iter_items(io.StringIO(json.dumps(data)), ("outputs", "hourly"), block_size=2))
+        self.assertEqual(skipped, items)
+        self.assertEqual(list(json_stream.iter_items(io.StringIO(json.dumps(data)), ("missing",))), [])
+
+    def test_large_value(self):
+        file = io.StringIO(json.dumps([list(range(100_000))]))
+        reads = []
+        read = file.read
+        file.read = lambda size: reads.append(size) or read(size)
+
+        self.assertEqual(list(json_stream.iter_items(file, block_size=16)), [(0, list(range(100_000)))])
+        # the read size grows while the value is incomplete
+        self.assertLess(len(reads), 30)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(json_stream.iter_items(io.StringIO('[1, 2')))
+        with self.assertRaises(ValueError):
+            list(json_stream.iter_items(io.StringIO('1')))
+
+
+if __name__ == '__main__':
+    unittest.main()
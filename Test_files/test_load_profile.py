@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from numpy import array, isnan, memmap
+from pandas import DataFrame
+
+from module import functions, load_profile
+
+
+class TestLoadProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "profile.xlsx")
+        self._write(["1,5", "2,25", "3"])
+        patch = mock.patch.object(load_profile.consts, "LOAD_PROFILE_CACHE_PATH",
+                                  os.path.join(self.folder.name, "cache"))
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(self.folder.cleanup)
+
+    def _write(self, loads: list):
+        DataFrame({"Zeit": ["01.01.2023 00:00:00", "01.01.2023 00:15:00", "02.01.2023 00:00:00"],
+                   "Last": loads}).to_excel(self.path, index=False)
+
+    def _file(self, name: str, text: str) -> str:
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_parse(self):
+        profile = functions.load_load_profile(self.path)
+        self.assertEqual(profile.shape, (366, 96))
+        self.assertEqual(profile[0, :2].tolist(), [1.5, 2.25])
+        self.assertEqual(profile[1, 0], 3.0)
+        self.assertTrue(isnan(profile[0, 2]))
+
+    def test_profile_days(self):
+        days = array(["2023-02-28", "2023-03-01", "2024-02-29", "2024-12-31"], dtype="datetime64[D]")
+        self.assertEqual(load_profile.profile_days(days).tolist(), [58, 60, 59, 365])
+
+    def test_cache(self):
+        functions.load_load_profile(self.path)
+        self.assertIsInstance(load_profile.read_cached(self.path), memmap)
+
+        # the file is not read again while its size and modification time are the same
+        with mock.patch.object(load_profile, "read_load_profile") as read:
+            load_profile.read_cached(self.path)
+        read.assert_not_called()
+
+        cache = os.path.join(self.folder.name, "cache")
+        others = ["profile-notes.npy", f"profile-{'0' * 32}.npy.99.tmp"]
+        for other in others:
+            open(os.path.join(cache, other), "w").close()
+
+        self._write(["4", "5", "6"])
+        self.assertEqual(functions.load_load_profile(self.path)[0, 0], 4.0)
+        self.assertEqual(len([name for name in os.listdir(cache) if name not in others]), 1)
+        self.assertTrue(all(os.path.exists(os.path.join(cache, other)) for other in others))
+
+    def test_bad_rows(self):
+        lines = ["Zeit;Last", "01.01.2023 00:00;1", "01.01.2023 00:15;x", "01.01.2023 00:30;3", "01.01.2023 00:45;4"]
+        profile, report = load_profile.read_load_profile(self._file("bad.csv", "\n".join(lines)))
+        self.assertEqual(profile[0, 0], 1.)
+        self.assertTrue(isnan(profile[0, 1]))
+        self.assertEqual(profile[0, 2:4].tolist(), [3., 4.])
+        # the header is no bad row
+        self.assertEqual((report.rows, report.bad_rows), (4, 1))
+        self.assertEqual(report.examples, [(3, "01.01.2023 00:15", "x")])
+
+    def test_null_profile(self):
+        self.assertIs(functions.load_load_profile(None), load_profile.NULL_LOAD_PROFILE)
+        self.assertIs(functions.load_load_profile(self._file("empty.json", "[]")), load_profile.NULL_LOAD_PROFILE)
+        self.assertFalse(load_profile.NULL_LOAD_PROFILE.flags.writeable)
+
+    def test_csv_chunks(self):
+        # one value per minute is averaged to 15 minutes
+        lines = [f"2023-03-01 00:{minute:02d};{minute}" for minute in range(60)]
+        path = self._file("minutes.csv", "\n".join(["Zeit;Last", "Messung;kW", *lines, "kaputt;1"]))
+        profile, report = load_profile.read_load_profile(path, chunksize=7)
+        self.assertEqual(profile[60, :4].tolist(), [7., 22., 37., 52.])
+        self.assertEqual((report.rows, report.bad_rows, report.interval), (61, 1, 1))
+
+    def test_hourly(self):
+        path = self._file("hours.csv", "01.01.2023 00:00,100\n01.01.2023 01:00,200\n01.01.2023 03:00,400\n")
+        profile, report = load_profile.read_load_profile(path)
+        self.assertEqual(report.interval, 60)
+        self.assertEqual(profile[0, :8].tolist(), [100.] * 4 + [200.] * 4)
+        self.assertTrue(isnan(profile[0, 8]))
+        self.assertEqual(profile[0, 12:16].tolist(), [400.] * 4)
+
+    def test_json(self):
+        records = [{"time": "2023-01-01T00:00:00", "load": 1}, ["2023-01-01T00:15:00", "2,5"], "falsch"]
+        profile, report = load_profile.read_load_profile(self._file("records.json", json.dumps(records)),
+                                                         chunksize=1)
+        self.assertEqual(profile[0, :2].tolist(), [1., 2.5])
+        self.assertEqual(report.bad_rows, 1)
+
+        days = {"01-01": {"00:00": 3, "00:15": 4}, "29-02": {"23:45": 5}}
+        profile, _ = load_profile.read_load_profile(self._file("days.json", json.dumps(days)))
+        self.assertEqual(profile[0, :2].tolist(), [3., 4.])
+        self.assertEqual(profile[59, 95], 5.)
+
+
+if __name__ == '__main__':
+    unittest.main()
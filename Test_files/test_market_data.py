@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from module import classes
+
+HOUR: int = 3_600_000
+# 2024-03-30 00:00 UTC, the range contains the change to summer time in Europe
+START: int = 1_711_756_800_000
+
+
+def _data(hours: int) -> list[dict]:
+    return [{"start_timestamp": START + i * HOUR, "end_timestamp": START + (i + 1) * HOUR,
+             "marketprice": 80.0 + i * 1.337, "unit": "Eur/MWh"} for i in range(hours)]
+
+
+class TestMarketData(unittest.TestCase):
+
+    def setUp(self):
+        self.market = classes.MarketData(20.0, data=_data(72))
+
+    def test_times_match_scalar_conversion(self):
+        for i, price in enumerate(self.market.data):
+            start, date = classes.MarketData.convert_ms_to_time(START + i * HOUR)
+            self.assertEqual(price["start_timestamp"], start)
+            self.assertEqual(price["date"], date)
+            self.assertEqual(price["end_timestamp"], classes.MarketData.convert_ms_to_time(START + (i + 1) * HOUR)[0])
+            self.assertEqual(self.market.labels[i], f"{date} {start}")
+
+    def test_prices_keep_precision(self):
+        self.assertEqual(self.market.market_prices[3], round((80.0 + 3 * 1.337) / 10, 3))
+        self.assertAlmostEqual(self.market.consumer_prices[3], round((round(8.4011, 3) + 20.0) * 1.19, 3))
+        self.assertEqual(self.market.data[3]["unit"], "ct/kWh")
+
+    def test_hash_by_data(self):
+        self.assertEqual(self.market, classes.MarketData(20.0, data=_data(72)))
+        self.assertEqual(hash(self.market), hash(classes.MarketData(20.0, data=_data(72))))
+        self.assertNotEqual(self.market, classes.MarketData(21.0, data=_data(72)))
+
+    def test_empty(self):
+        market = classes.MarketData(20.0, data=[])
+        self.assertEqual(market.data, [])
+        self.assertEqual(len(market.labels), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import unittest
+
+from module import price_store
+
+HOUR: int = price_store.HOUR_MS
+START: int = 1_718_000_000_000 - 1_718_000_000_000 % HOUR
+
+
+def _prices(first: int, hours: int, price: float = 100.0) -> list[dict]:
+    return [{"start_timestamp": START + (first + i) * HOUR, "end_timestamp": START + (first + i + 1) * HOUR,
+             "marketprice": price, "unit": "Eur/MWh"} for i in range(hours)]
+
+
+class TestPriceStore(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.store = price_store.PriceStore(f"{self.cache_dir.name}/prices.sqlite")
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_empty_store(self):
+        self.assertEqual(self.store.missing_ranges(START, START + 24 * HOUR), [(START, START + 24 * HOUR)])
+        self.assertEqual(self.store.query(START, START + 24 * HOUR), [])
+
+    def test_missing_ranges(self):
+        self.store.insert(_prices(0, 6))
+        self.store.insert(_prices(10, 4))
+        self.assertEqual(self.store.missing_ranges(START, START + 24 * HOUR),
+                         [(START + 6 * HOUR, START + 10 * HOUR), (START + 14 * HOUR, START + 24 * HOUR)])
+        self.assertEqual(self.store.missing_ranges(START + HOUR, START + 5 * HOUR), [])
+
+    def test_append_only(self):
+        self.assertEqual(self.store.insert(_prices(0, 4, 100.0)), 4)
+        self.assertEqual(self.store.insert(_prices(2, 4, 200.0)), 2)
+
+        prices = self.store.query(START, START + 6 * HOUR)
+        self.assertEqual([price["marketprice"] for price in prices], [100.0] * 4 + [200.0] * 2)
+        self.assertEqual(prices[0], _prices(0, 1)[0])
+
+    def test_end_of_range(self):
+        self.assertEqual(self.store.end_of_range(START), START + 24 * HOUR)
+        self.assertEqual(self.store.end_of_range(START, START + HOUR), START + HOUR)
+
+
+if __name__ == '__main__':
+    unittest.main()
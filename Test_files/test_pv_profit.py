@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import math
+import unittest
+
+from numpy import array
+
+from module import classes
+
+
+class TestPVProfitArray(unittest.TestCase):
+
+    def setUp(self):
+        self.pv = classes.PVProfit(25.0, 2.5, 45.0, 60.0, -0.35, 25.0, 0)
+        # sun height, sun azimuth, radiation, temperature
+        self.cases = [(30, 150, 500, 20), (10, 250, 100, 5), (-5, 10, 0, 0), (55, 180, 800, 30)]
+
+    def test_power_matches_scalar(self):
+        elevation, azimuth, radiation, temperature = map(array, zip(*self.cases))
+        power = self.pv.calc_power_array(radiation, temperature, elevation, azimuth)
+
+        for i, (el, az, rad, temp) in enumerate(self.cases):
+            incidence_angle = self.pv.calc_incidence_angle(el, az)
+            efficiency = self.pv.calc_temp_dependency(temp, rad)
+            self.assertAlmostEqual(float(power[i]), float(self.pv.calc_power(rad, incidence_angle, el, efficiency)),
+                                   places=2)
+
+    def test_power_with_dni_matches_scalar(self):
+        elevation, azimuth, radiation, temperature = map(array, zip(*self.cases))
+        power = self.pv.calc_power_array(radiation, temperature, elevation, azimuth, dni=True)
+
+        for i, (el, az, rad, temp) in enumerate(self.cases):
+            incidence_angle = self.pv.calc_incidence_angle(el, az)
+            self.assertAlmostEqual(float(power[i]), float(self.pv.calc_power_with_dni(rad, incidence_angle, temp)),
+                                   places=2)
+
+    def test_night_is_zero(self):
+        power = self.pv.calc_power_array(array([500.0]), array([20.0]), array([-1.0]), array([180.0]))
+        self.assertEqual(float(power[0]), 0.0)
+
+
+class TestPVPlant(unittest.TestCase):
+
+    def test_plant_is_sum_of_arrays(self):
+        pv_classes = [classes.PVProfit(25.0, 2.5, 45.0, 60.0, -0.35, 25.0, 0),
+                      classes.PVProfit(20.0, 1.5, 30.0, -60.0, -0.4, 25.0, 2),
+                      classes.PVProfit(21.0, 4.0, 10.0, 0.0, -0.3, 25.0, 6)]
+        plant = classes.PVPlant(pv_classes)
+        elevation, azimuth = array([30.0, 10.0, -5.0, 55.0]), array([150.0, 250.0, 10.0, 180.0])
+        radiation, temperature = array([500.0, 100.0, 0.0, 800.0]), array([20.0, 5.0, 0.0, 30.0])
+
+        breakdown = plant.calc_array_power(radiation, temperature, elevation, azimuth)
+        total = plant.calc_power_array(radiation, temperature, elevation, azimuth)
+
+        self.assertEqual(breakdown.shape, (3, 4))
+        for i, pv in enumerate(pv_classes):
+            power = pv.calc_power_array(radiation, temperature, elevation, azimuth)
+            for j in range(4):
+                self.assertAlmostEqual(float(breakdown[i][j]), float(power[j]), places=3)
+        self.assertAlmostEqual(float(total.sum()), float(breakdown.sum()), places=2)
+
+
+class TestPerez(unittest.TestCase):
+
+    def setUp(self):
+        self.pv = classes.PVProfit(25.0, 2.5, 45.0, 60.0, -0.35, 25.0, 0)
+
+    def test_diffuse_matches_reference(self):
+        # sun height, sun azimuth, diffuse horizontal, direct normal
+        for el, az, dhi, dni in [(30, 150, 120, 400), (10, 250, 60, 50), (55, 180, 90, 850), (20, 100, 200, 0)]:
+            incidence_angle = self.pv.calc_incidence_angle(el, az)
+            zenith = math.radians(90 - el)
+            epsilon = ((dhi + dni) / dhi + 1.041 * zenith ** 3) / (1 + 1.041 * zenith ** 3)
+            index = next((i for i, edge in enumerate([1.065, 1.23, 1.5, 1.95, 2.8, 4.5, 6.2], 1) if epsilon <= edge), 8)
+            delta = dhi / math.cos(zenith) / 1361
+            f_1 = max(0.0, self.pv.diffuse_index_F11[index] + self.pv.diffuse_index_F12[index] * delta +
+                      self.pv.diffuse_index_F13[index] * zenith)
+            f_2 = (self.pv.diffuse_index_F21[index] + self.pv.diffuse_index_F22[index] * delta +
+                   self.pv.diffuse_index_F23[index] * zenith)
+            a = max(0.0, math.cos(math.radians(incidence_angle)))
+            b = max(0.087, math.cos(zenith))
+            tilt = math.radians(self.pv.tilt_angle)
+            expected = dhi * ((1 - f_1) * (1 + math.cos(tilt)) / 2 + f_1 * a / b + f_2 * math.sin(tilt))
+
+            diffuse = self.pv.calc_diffuse_radiation(el, dhi, dni, incidence_angle)
+            self.assertAlmostEqual(float(diffuse), expected, delta=abs(expected) * 1e-3 + 1e-3)
+
+    def test_diffuse_is_added_to_power(self):
+        elevation, azimuth = array([30.0, -5.0]), array([150.0, 10.0])
+        direct, diffuse = array([300.0, 0.0]), array([120.0, 40.0])
+        temperature = array([20.0, 5.0])
+
+        plant = classes.PVPlant([self.pv])
+        direct_power = plant.calc_power_array(direct, temperature, elevation, azimuth)
+        power = plant.calc_power_array(direct, temperature, elevation, azimuth, diffuse_radiation=diffuse)
+
+        self.assertGreater(float(power[0]), float(direct_power[0]))
+        self.assertEqual(float(power[1]), 0.0)
+
+    def test_horizontal_plane_gets_ghi(self):
+        # without losses the power of 1 m² is the radiation on the plane
+        plant = classes.PVPlant([classes.PVProfit(100.0, 1, 0.0, 0.0, 0.0, 25.0, 0)])
+        elevation, azimuth = array([10.0, 30.0, 60.0]), array([120.0, 150.0, 180.0])
+        dni, diffuse = array([200.0, 500.0, 850.0]), array([60.0, 120.0, 90.0])
+        direct = dni * [math.sin(math.radians(el)) for el in elevation]
+
+        for dni_radiation in (None, dni):
+            power = plant.calc_power_array(direct, array([20.0] * 3), elevation, azimuth, diffuse_radiation=diffuse,
+                                           dni_radiation=dni_radiation)
+            for i in range(3):
+                self.assertAlmostEqual(float(power[i]), direct[i] + diffuse[i], delta=0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
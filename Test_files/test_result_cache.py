@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from numpy import arange
+
+from module import analytics, own_wrapper
+
+
+class TestDigest(unittest.TestCase):
+
+    def test_stable(self):
+        self.assertEqual(own_wrapper.digest({"a": 1, "b": [1, 2]}), own_wrapper.digest({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(own_wrapper.digest({"a": 1}), own_wrapper.digest({"a": 1.0}))
+        self.assertNotEqual(own_wrapper.digest(arange(3)), own_wrapper.digest(arange(4)))
+
+    def test_own_digest(self):
+        first, second = mock.Mock(_digest=b"1"), mock.Mock(_digest=mock.Mock(return_value=b"1"))
+        self.assertEqual(own_wrapper.digest(first), own_wrapper.digest(second))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def _cached(self, **kwargs):
+        @own_wrapper.result_cache(**kwargs)
+        def square(value: dict) -> int:
+            self.calls.append(value["x"])
+            return value["x"] ** 2
+        return square
+
+    def test_lru(self):
+        square = self._cached(maxsize=2)
+        for x in (1, 2, 1, 3, 1, 2):
+            self.assertEqual(square({"x": x}), x ** 2)
+        # 2 was the least recently used entry when 3 was added
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_ttl(self):
+        square = self._cached(ttl=10)
+        with mock.patch.object(own_wrapper.time, "time", return_value=100.):
+            square({"x": 2})
+            square({"x": 2})
+        with mock.patch.object(own_wrapper.time, "time", return_value=111.):
+            square({"x": 2})
+        self.assertEqual(self.calls, [2, 2])
+
+
+class TestAnalyzeData(unittest.TestCase):
+
+    def setUp(self):
+        analytics._cached_analysis.cache_clear()
+        self.addCleanup(analytics._cached_analysis.cache_clear)
+
+    def test_journal_on_cache_hit(self):
+        config = {section: {} for section in analytics.ANALYTICS_SECTIONS}
+        weather = mock.Mock(_digest=b"weather")
+        with mock.patch.object(analytics, "_analyze_data", return_value=(("10-06-2024", 55.0), "result")) as analyze, \
+                mock.patch.object(analytics.soc_journal, "get_journal") as journal:
+            self.assertEqual(analytics.analyze_data(config, weather), "result")
+            self.assertEqual(analytics.analyze_data(config, weather), "result")
+
+        analyze.assert_called_once()
+        # the state of charge is written also if the result comes from the cache
+        self.assertEqual(journal.return_value.record.call_args_list, [mock.call("10-06-2024", 55.0)] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from module import consts, sessions
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    clients: set = set()
+
+    def do_GET(self):
+        self.clients.add(self.client_address)
+        data = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSessions(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.patch = mock.patch.object(consts, "HTTP_CACHE_PATH", f"{self.cache_dir.name}/http.cache")
+        self.patch.start()
+        sessions.close_session()
+
+    def tearDown(self):
+        sessions.close_session()
+        self.patch.stop()
+        self.cache_dir.cleanup()
+
+    def test_session_is_shared(self):
+        found: list = []
+        threads = [threading.Thread(target=lambda: found.append(sessions.get_session())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(session is found[0] for session in found))
+        self.assertIs(sessions.get_session(), found[0])
+
+    def test_connection_is_reused(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        _Handler.clients = set()
+        try:
+            session = sessions.get_session()
+            for i in range(5):
+                self.assertEqual(session.get(f"{url}/{i}").json(), {"path": f"/{i}"})
+            self.assertTrue(session.get(f"{url}/0").from_cache)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(len(_Handler.clients), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
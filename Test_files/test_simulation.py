@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import datetime
+import math
+import unittest
+from unittest import mock
+
+from numpy import array, full, nan
+
+from module import analytics, classes, consts, load_profile
+
+DAYS: int = 3
+HOUR: int = 3_600_000
+# 2024-06-10 00:00 local time, the prices are looked up by the local hour
+START: int = int(datetime.datetime(2024, 6, 10).timestamp()) * 1000
+
+
+def _weather() -> classes.Weather:
+    hours = [f"2024-06-{10 + d:02d}T{h:02d}:00" for d in range(DAYS) for h in range(24)]
+    min15 = [f"2024-06-{10 + d:02d}T{h:02d}:{m:02d}" for d in range(DAYS) for h in range(24) for m in range(0, 60, 15)]
+    # clear days, the sun shines from 06:00 to 20:00
+    ghi = [max(800 * math.sin(math.pi * (i % 96 - 24) / 56), 0.) for i in range(len(min15))]
+    response = {
+        "hourly": {"time": hours, "temperature_2m": [20.] * len(hours), "cloudcover": [0] * len(hours)},
+        "minutely_15": {"time": min15, "direct_radiation": [0.8 * g for g in ghi],
+                        "direct_normal_irradiance": [g for g in ghi], "shortwave_radiation": ghi}
+    }
+    with mock.patch.object(classes.sessions, "get_session"), \
+            mock.patch.object(classes.Weather, "get_weather", return_value=response):
+        return classes.Weather(49.46, 11.11, days=DAYS)
+
+
+def _market(hours: int = DAYS * 24) -> classes.MarketData:
+    return classes.MarketData(20.0, data=[{"start_timestamp": START + i * HOUR, "end_timestamp": START + (i + 1) * HOUR,
+                                           "marketprice": 80.0 + i, "unit": "Eur/MWh"} for i in range(hours)])
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            "coordinates": {"latitude": 49.46, "longitude": 11.11},
+            "pv": {"alignment": 1, "pv_lifetime": 25.0, "pv_peak_power": 870.0, "pv_cost": 200.0,
+                   "tilt_angle1": 30.0, "area1": 4.0, "module_efficiency1": 22.0, "exposure_angle1": 0.0,
+                   "temperature_coefficient1": -0.35, "nominal_temperature1": 25.0, "mounting_type1": 0.0},
+            "converter": {"max_power": 800.0, "efficiency": 94.0},
+            "battery": {"capacity": 1.6, "charging_power": 1200.0, "max_deload": 90.0, "load_efficiency": 95.0,
+                        "load_cycle": 6000.0, "price": 700.0},
+            "heater": {"heater_type": "fuel", "heater_efficiency": 85.0, "heater_price": 0.8},
+            "load_profile": {"name": "None"}
+        }
+        self.weather = _weather()
+        slots = DAYS * consts.SLOTS_PER_DAY
+        self.heating = (self.weather.labels.tolist(), [0.] * slots, [1.] * slots)
+        self.load_profile = full((consts.LOAD_PROFILE_DAYS, consts.SLOTS_PER_DAY), 150.)
+
+    def _days(self, calc_cost: bool = False) -> list:
+        return list(analytics.simulate_days(self.config, self.weather, init_battery_charge=50, calc_cost=calc_cost,
+                                            market_data=_market(), load_profile_data=self.load_profile,
+                                            heating=self.heating))
+
+    def test_days(self):
+        days = self._days()
+        self.assertEqual([day['date'] for day in days], ["10-06-2024", "11-06-2024", "12-06-2024"])
+        for day in days:
+            for key in ('times', 'pv', 'heating', 'battery', 'charge', 'discharge', 'feed_in', 'grid'):
+                self.assertEqual(len(day[key]), consts.SLOTS_PER_DAY, key)
+            self.assertEqual(day['state_of_charge'], float(day['battery'][-1]))
+            self.assertGreater(day['energy'], 0)
+
+    def test_state_of_charge_is_carried(self):
+        days = self._days()
+        for yesterday, today in zip(days, days[1:]):
+            # the battery is charged by the sun and is discharged by the load in the night
+            self.assertGreater(yesterday['state_of_charge'], 10.)
+            self.assertLess(float(today['battery'][0]), yesterday['state_of_charge'])
+            stored = (float(today['battery'][0]) - yesterday['state_of_charge']) * 1_600 / 100
+            self.assertAlmostEqual(float(today['charge'][0] - today['discharge'][0]), stored, places=6)
+
+    def test_missing_profile_day(self):
+        # 11-06-2024 is missing in the load profile, so it is not simulated
+        row = int(load_profile.profile_days(array(["2024-06-11"], dtype="datetime64[D]"))[0])
+        self.load_profile[row] = nan
+        slots = consts.SLOTS_PER_DAY
+        self.heating = (self.heating[0], [0.] * slots + [500.] * slots + [2000.] * slots, [1.] * (DAYS * slots))
+
+        days = self._days()
+        self.assertEqual(len(days[1]['diff_energy']), 0)
+        self.assertEqual(float(days[2]['heating'][0]), 2000.)
+        # in the night the load and the heating of the day are missing
+        self.assertAlmostEqual(float(days[2]['diff_energy'][0]), 2150.)
+
+    def test_period_totals(self):
+        days = self._days(calc_cost=True)
+        summary = analytics.simulate_period(self.config, self.weather, init_battery_charge=50, market_data=_market(),
+                                            load_profile_data=self.load_profile, heating=self.heating)
+
+        self.assertEqual(summary['days'], DAYS)
+        self.assertAlmostEqual(summary['pv_energy'], sum(day['energy'] for day in days))
+        for key, total_key in (('feed_in', 'feed_in'), ('grid', 'grid'), ('charge', 'charged'),
+                               ('discharge', 'discharged')):
+            self.assertAlmostEqual(summary[total_key], sum(float(day[key].sum()) for day in days), places=6)
+        self.assertAlmostEqual(summary['full_cycles'], summary['discharged'] / 1_600)
+        self.assertEqual(summary['cost'], sum(day['cost']['heater'] if day['option'] == 1 else day['cost']['strom']
+                                              for day in days))
+        self.assertEqual(summary['priced_days'], DAYS)
+        self.assertTrue(0 < summary['self_consumption'] <= 1)
+
+    def test_days_without_prices(self):
+        slots = DAYS * consts.SLOTS_PER_DAY
+        self.heating = (self.heating[0], [1000.] * slots, [1.] * slots)
+        kwargs = dict(init_battery_charge=50, market_data=_market(24), load_profile_data=self.load_profile,
+                      heating=self.heating)
+
+        days = list(analytics.simulate_days(self.config, self.weather, calc_cost=True, **kwargs))
+        self.assertIsNotNone(days[0]['cost'])
+        self.assertEqual([day['cost'] for day in days[1:]], [None, None])
+        self.assertEqual(analytics.simulate_period(self.config, self.weather, **kwargs)['priced_days'], 1)
+
+        # the forecast assumes the most expensive price plus 10 % for the days without prices
+        estimated = list(analytics.simulate_days(self.config, self.weather, calc_cost=True, estimate_prices=True,
+                                                 **kwargs))
+        self.assertEqual(estimated[0]['cost'], days[0]['cost'])
+        self.assertGreater(estimated[1]['cost']['strom'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
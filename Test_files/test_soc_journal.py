@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import datetime
+import tempfile
+import unittest
+
+from module import soc_journal
+
+
+class TestSocJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = soc_journal.SocJournal(f"{self.directory.name}/soc.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_latest_before(self):
+        self.assertIsNone(self.journal.latest_before("01-03-2024"))
+        self.journal.record("28-02-2024", 40.)
+        self.journal.record(datetime.date(2024, 3, 2), 60.)
+        self.journal.record("01-01-2025", 80.)
+
+        # the iso date sorts over months and years
+        self.assertEqual(self.journal.latest_before("03-03-2024"), (datetime.date(2024, 3, 2), 60.))
+        self.assertEqual(self.journal.latest_before("02-03-2024"), (datetime.date(2024, 2, 28), 40.))
+        self.assertEqual(self.journal.latest_before(datetime.date(2026, 1, 1))[1], 80.)
+
+    def test_replace_day(self):
+        self.journal.record("02-03-2024", 60.)
+        self.journal.record("02-03-2024", 20.)
+        self.assertEqual(self.journal.latest_before("03-03-2024")[1], 20.)
+
+    def test_import_toml(self):
+        path = f"{self.directory.name}/data.toml"
+        with open(path, mode="w") as file:
+            file.write('[02-03-2024]\nstate_of_charge = 44.5\n\n[09-03-2025]\nstate_of_charge = 78.4\n\n'
+                       '[write_time]\ntime = "09-03-2025 10:00:00"\n')
+
+        journal = soc_journal.SocJournal(f"{self.directory.name}/imported.sqlite", import_path=path)
+        self.assertEqual(journal.latest_before("01-01-2030"), (datetime.date(2025, 3, 9), 78.4))
+        self.assertEqual(journal.latest_before("09-03-2025"), (datetime.date(2024, 3, 2), 44.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from numpy import array, testing
+
+from module import classes
+
+
+class TestCalcSunPosArray(unittest.TestCase):
+
+    def test_array_matches_scalar(self):
+        sun = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+        timestamps = array(["2024-07-21T08:15", "2024-07-21T12:30", "2024-07-21T17:45"], dtype="datetime64[m]")
+        azimuth, elevation = sun.calc_sun_position_array(timestamps)
+
+        for i, t in enumerate([8.15, 12.30, 17.45]):
+            self.assertAlmostEqual(float(azimuth[i]), float(sun.calc_azimuth(t)), places=2)
+            self.assertAlmostEqual(float(elevation[i]), float(sun.calc_solar_elevation(t)), places=2)
+
+    def test_array_uses_declination_per_day(self):
+        timestamps = array(["2024-03-01T12:00", "2024-12-31T12:00"], dtype="datetime64[m]")
+        _, elevation = classes.CalcSunPos(49.46, 11.11, "01-03-2024").calc_sun_position_array(timestamps)
+
+        winter = classes.CalcSunPos(49.46, 11.11, "31-12-2024").calc_solar_elevation(12.0)
+        testing.assert_allclose(elevation[1], winter, atol=1e-2)
+
+    def test_azimuth_independent_of_call_order(self):
+        sun = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+        sun.calc_solar_elevation(17.45)
+        sun.calc_solar_elevation(8.00)
+        position = sun.calc_position(17.45)
+
+        fresh = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+        self.assertEqual(sun.calc_azimuth(17.45), position.azimuth)
+        self.assertEqual(fresh.calc_azimuth(17.45), position.azimuth)
+        self.assertGreater(position.real_local_time, 12)
+
+    def test_adjust_for_new_angle_array(self):
+        sun = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+        timestamps = array(["2024-07-21T09:00", "2024-07-21T12:30", "2024-07-21T15:45"], dtype="datetime64[m]")
+        azimuth, elevation = sun.calc_sun_position_array(timestamps)
+        adjusted = classes.CalcSunPos.adjust_for_new_angle_array(array([300., 500., 400.]), 35, 0, 45, 60, azimuth,
+                                                                 elevation)
+
+        for i, (gb, t) in enumerate([(300., 9.0), (500., 12.30), (400., 15.45)]):
+            testing.assert_allclose(adjusted[i], sun.adjust_for_new_angle(gb, 35, 0, 45, 60, t), rtol=1e-3)
+
+
+class TestCalcSunPosTable(unittest.TestCase):
+
+    def test_lookup_by_date_and_time(self):
+        table = classes.CalcSunPosTable(49.46, 11.11, "01-07-2024", "31-07-2024")
+        sun = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+
+        azimuth, elevation = table.calc_position_at("21-07-2024", 15.45)
+        self.assertAlmostEqual(float(azimuth), float(sun.calc_azimuth(15.45)), places=3)
+        self.assertAlmostEqual(float(elevation), float(sun.calc_solar_elevation(15.45)), places=3)
+
+    def test_inherited_methods(self):
+        table = classes.CalcSunPosTable(49.46, 11.11, "21-07-2024", "31-07-2024")
+        sun = classes.CalcSunPos(49.46, 11.11, "21-07-2024")
+
+        self.assertEqual(table.calc_azimuth(12.0), sun.calc_azimuth(12.0))
+        self.assertEqual(table.adjust_for_new_angle(500., 35, 0, 45, 60, 12.0),
+                         sun.adjust_for_new_angle(500., 35, 0, 45, 60, 12.0))
+        self.assertEqual(str(table), str(sun))
+
+    def test_for_date_is_reused(self):
+        table = classes.CalcSunPosTable(49.46, 11.11, "01-07-2024", "31-07-2024")
+        self.assertIs(table.for_date("02-07-2024"), table.for_date("02-07-2024"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from module import sweep
+
+
+def _summary(config_data, *args, **kwargs) -> dict:
+    capacity = config_data["battery"]["capacity"]
+    return {"pv_energy": 10_000., "self_consumption": min(capacity / 10, 1), "grid": 0., "feed_in": 0.,
+            "full_cycles": 1., "cost": 1_000 / capacity, "priced_days": 14}
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {"pv": {"tilt_angle1": 30}, "battery": {"capacity": 1.6}, "converter": {"max_power": 800},
+                       "load_profile": {"name": "None"}}
+
+    def test_grid(self):
+        grid = sweep.parse_grid(["battery.capacity=1,2.5", "pv.mounting_type1=roof"])
+        self.assertEqual(grid, {"battery.capacity": [1, 2.5], "pv.mounting_type1": ["roof"]})
+        self.assertEqual(len(sweep.scenarios({"battery.capacity": [1, 2, 3], "converter.max_power": [600, 800]})), 6)
+
+        with self.assertRaises(ValueError):
+            sweep.scenarios({"heater.heater_price": [1]})
+        with self.assertRaises(ValueError):
+            sweep.parse_grid(["battery.capacity"])
+
+    def test_scenario_config(self):
+        config = sweep.scenario_config(self.config, {"battery.capacity": 5})
+        self.assertEqual(config["battery"]["capacity"], 5)
+        self.assertEqual(self.config["battery"]["capacity"], 1.6)
+        self.assertIs(config["load_profile"], self.config["load_profile"])
+
+    def test_ranking(self):
+        with mock.patch.object(sweep.analytics, "simulate_period", side_effect=_summary), \
+                mock.patch.object(sweep.analytics, "heating_power", return_value=([], [], [])), \
+                mock.patch.object(sweep.functions, "load_load_profile",
+                                  return_value=sweep.functions.load_profile.NULL_LOAD_PROFILE):
+            table = sweep.run_sweep(self.config, mock.Mock(), {"battery.capacity": [1, 5, 2.5]}, mock.Mock(),
+                                    workers=1)
+
+        self.assertEqual(table["battery.capacity"].tolist(), [5, 2.5, 1])
+        self.assertEqual(table["cost"].tolist(), [2., 4., 10.])
+        self.assertEqual(table.loc[1, "self_consumption"], 50.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from module import upload
+
+
+def _export(slope: float = 0.) -> dict:
+    hourly = [{"time": f"202406{10 + day:02d}:{hour:02d}10", "Gb(i)": 500. if 8 <= hour <= 16 else 0.,
+               "Gd(i)": 100. if 6 <= hour <= 18 else 0., "T2m": 20. + hour} for day in range(2) for hour in range(24)]
+    return {"inputs": {"location": {"latitude": 49.46, "longitude": 11.11, "elevation": 300.},
+                       "meteo_data": {"year_min": 2024, "year_max": 2024},
+                       "mounting_system": {"fixed": {"slope": {"value": slope}, "azimuth": {"value": 0.}}}},
+            "outputs": {"hourly": hourly}}
+
+
+class TestReadWeather(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def _write(self, data: dict) -> str:
+        path = os.path.join(self.folder.name, "pvgis.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        return path
+
+    def test_horizontal(self):
+        weather = upload.read_weather(self._write(_export()))
+        self.assertEqual(weather.dates, ["10-06-2024", "11-06-2024"])
+        self.assertEqual(len(weather.series), 2 * 96)
+        self.assertEqual(weather.times[:2].tolist(), ["00:00", "00:15"])
+
+        # 12:00 to 12:45 get the values of 12:10
+        noon = weather.series.iloc[48:52]
+        self.assertEqual(noon["temp"].tolist(), [32.] * 4)
+        self.assertEqual(noon["direct_radiation"].tolist(), [500.] * 4)
+        self.assertEqual(noon["ghi_radiation"].tolist(), [600.] * 4)
+        self.assertGreater(float(noon["dni_radiation"].iloc[0]), 500.)
+        self.assertEqual(float(weather.series["ghi_radiation"].iloc[0]), 0.)
+
+    def test_tilted_plane_is_projected(self):
+        horizontal = upload.read_weather(self._write(_export())).series
+        tilted = upload.read_weather(self._write(_export(35.))).series
+        # the same direct radiation on a plane facing the sun is less on the horizontal plane
+        for slot in (40, 52, 60):
+            self.assertLess(float(tilted["direct_radiation"].iloc[slot]),
+                            float(horizontal["direct_radiation"].iloc[slot]))
+
+    def test_without_components(self):
+        data = _export()
+        for record in data["outputs"]["hourly"]:
+            del record["Gd(i)"]
+        with self.assertRaises(ValueError):
+            upload.read_weather(self._write(data))
+
+
+class TestDataAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        patch = mock.patch.object(upload.consts, "DOWNLOADS_FILE_PATH", f"{self.folder.name}/")
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.config = {"coordinates": {"latitude": 49.46, "longitude": 11.11},
+                       "pv": {"tilt_angle1": 30.0, "area1": 2.0, "module_efficiency1": 20.0, "exposure_angle1": 0.0,
+                              "temperature_coefficient1": -0.35, "nominal_temperature1": 25.0,
+                              "mounting_type1": 0.0}}
+
+    def _analyze(self, diffuse_model: bool, data: dict) -> list:
+        path = os.path.join(self.folder.name, "pvgis.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        self.config["pv"]["diffuse_model"] = diffuse_model
+        return upload.data_analyzer(self.config, path)[7]
+
+    def test_diffuse_model(self):
+        without_diffuse = _export()
+        for record in without_diffuse["outputs"]["hourly"]:
+            record["Gd(i)"] = 0.
+        direct = self._analyze(True, without_diffuse)
+        power = self._analyze(True, _export())
+
+        # the diffuse radiation is added in the morning and evening without direct radiation
+        self.assertEqual(direct[7], 0.)
+        self.assertGreater(power[7], 0.)
+        self.assertGreater(power[12], direct[12])
+        self.assertNotEqual(self._analyze(False, _export()), power)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from module import classes
+
+
+def _response(days: int = 2, missing: int = 3) -> dict:
+    hours = [f"2024-06-{10 + d:02d}T{h:02d}:00" for d in range(days) for h in range(24)]
+    min15 = [f"2024-06-{10 + d:02d}T{h:02d}:{m:02d}" for d in range(days) for h in range(24) for m in range(0, 60, 15)]
+    min15 = min15[:len(min15) - missing]
+    return {
+        "hourly": {"time": hours, "temperature_2m": [float(i % 24) for i in range(len(hours))],
+                   "cloudcover": [50] * len(hours)},
+        "minutely_15": {"time": min15, "direct_radiation": [float(i) for i in range(len(min15))],
+                        "direct_normal_irradiance": [2.0 * i for i in range(len(min15))],
+                        "shortwave_radiation": [3.0 * i for i in range(len(min15))]}
+    }
+
+
+def _weather(response: dict) -> classes.Weather:
+    with mock.patch.object(classes.sessions, "get_session"), \
+            mock.patch.object(classes.Weather, "get_weather", return_value=response):
+        return classes.Weather(49.46, 11.11, days=2)
+
+
+class TestWeather(unittest.TestCase):
+
+    def setUp(self):
+        self.weather = _weather(_response())
+
+    def test_series(self):
+        self.assertEqual(len(self.weather.series), 2 * 96)
+        self.assertEqual(self.weather.dates, ["10-06-2024", "11-06-2024"])
+        self.assertEqual(self.weather.day_slices()["11-06-2024"], slice(96, 192))
+        self.assertEqual(float(self.weather.column("temp")[5]), 1.0)
+        self.assertEqual(float(self.weather.column("dni_radiation")[-1]), 0.0)
+
+    def test_times_and_labels(self):
+        self.assertEqual(self.weather.times[:2].tolist(), ["00:00", "00:15"])
+        self.assertEqual(self.weather.times[-1], "23:45")
+        self.assertEqual(self.weather.labels[97], "11-06-2024 00:15")
+
+    def test_compatibility_view(self):
+        data = self.weather.data
+        self.assertEqual(list(data["10-06-2024"].keys())[:2], ["00:00", "00:15"])
+        self.assertEqual(data["10-06-2024"]["01:30"],
+                         {"temp": 1.0, "cloudcover": 50.0, "direct_radiation": 6.0, "dni_radiation": 12.0,
+                          "ghi_radiation": 18.0})
+        self.assertEqual(data["11-06-2024"]["23:45"]["ghi_radiation"], "")
+
+    def test_15_minute_values_by_time(self):
+        response = _response(missing=0)
+        min15 = response["minutely_15"]
+        # the 15 minute data starts an hour before the hourly data and misses 00:30 of the first day
+        min15["time"] = ["2024-06-09T23:00", "2024-06-09T23:15", "2024-06-09T23:30", "2024-06-09T23:45"] + \
+            min15["time"][:2] + min15["time"][3:]
+        for key in ("direct_radiation", "direct_normal_irradiance", "shortwave_radiation"):
+            min15[key] = [-1.0] * 4 + min15[key][:2] + min15[key][3:]
+
+        series = _weather(response).series
+        self.assertEqual(len(series), 2 * 96)
+        self.assertEqual(series["direct_radiation"].iloc[:2].tolist(), [0.0, 1.0])
+        self.assertTrue(series["direct_radiation"].isna().iloc[2])
+        self.assertEqual(series["ghi_radiation"].iloc[6], 18.0)
+        self.assertEqual(series["dni_radiation"].iloc[-1], 2.0 * 191)
+
+    def test_hash_by_data(self):
+        self.assertEqual(self.weather, _weather(_response()))
+        self.assertEqual(hash(self.weather), hash(_weather(_response())))
+        self.assertNotEqual(self.weather, _weather(_response(missing=4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
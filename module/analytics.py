@@ -1,14 +1,16 @@
 #  -*- coding: utf-8 -*-
 
 import datetime
-from functools import lru_cache
 
-import toml
-from numpy import float64, float32, float16, uint16, array, absolute
+from numpy import (float64, float32, float16, uint16, array, absolute, concatenate, flatnonzero, full, isnan,
+                   minimum, nan, ndarray, where)
 
 from module import functions
 
-from module import classes, consts, own_wrapper as wrap
+from module import battery, classes, consts, load_profile, soc_journal, own_wrapper as wrap
+
+# config sections which change the result of analyze_data
+ANALYTICS_SECTIONS: tuple = ("coordinates", "pv", "converter", "battery", "market", "heater", "load_profile", "house")
 
 
 def prepare_data_to_write(time, power: list[float], market_price: list[float], energy: float,
@@ -84,7 +86,7 @@ def prepare_data_to_write(time, power: list[float], market_price: list[float], e
         return -1
 
 
-def heating_power(config_data: dict, weather: dict) -> (list, list, list):
+def heating_power(config_data: dict, weather: classes.Weather) -> (list, list, list):
     def _calc_area(data_house: dict, prefix: str, prefix2: str | None = None) -> float16:
         try:
             if prefix2 is None:
@@ -97,71 +99,64 @@ def heating_power(config_data: dict, weather: dict) -> (list, list, list):
             print(f"Attribute Missing: {err}")
             return float16(0)
 
-    def _get_u_value(data_house: dict, u_value: dict, prefix: str) -> float16:
+    def _get_u_value(data_house: dict, u_value: classes.UValueTable, prefix: str) -> float16:
+        def _lookup(*key: str, year: int) -> float:
+            value: float | None = u_value.get(*key, year=year)
+            if value is None:
+                print(f"No U-value for {', '.join(key)} {year}")
+                return 0.
+            return value
+
         try:
+            year: int = min(int(data_house.get("house_year", 0)), 1995)
+
             if "wall" in prefix:
-                print(prefix)
                 wall_: str = data_house.get(prefix, "")
                 wall_type: str = data_house.get(f"construction_{prefix}", "")
-                print(wall_type)
-                year: uint16 = uint16(data_house.get(f"house_year", 0)
-                                      if data_house.get(f"house_year") < 1995 else 1995)
                 #TODO: fix wall_type Enev
                 if wall_ == "ENEV Außenwand" or wall_ == "ENEV Innenwand":
-                    wall_type = 2016
-                    print("a,",u_value.get("Wand"))
-                    print("b,",u_value.get("Wand").get(wall_))
-                    print("c,",u_value.get("Wand").get(wall_).get(uint16(wall_type)))
-                    return float16(u_value.get("Wand").get(wall_).get(uint16(wall_type)))
+                    return float16(_lookup("Wand", wall_, year=2016))
                 elif wall_ == "u_value":
                     return float16(data_house.get(f"{prefix}_u_value", 0))
                 else:
-                    return float16(u_value.get("Wand").get(wall_).get(wall_type).get(year))
+                    return float16(_lookup("Wand", wall_, wall_type, year=year))
 
             elif "window" in prefix:
                 window_: str = data_house.get(f"{prefix}_frame", "")
                 glazing: str = data_house.get(f"{prefix}_glazing", "")
-                window_year: uint16 = uint16(data_house.get(f"{prefix}_year", 0) if data_house.get(
-                    f"{prefix}_year") < 1995 else 1995)
+                window_year: int = min(int(data_house.get(f"{prefix}_year", 0)), 1995)
 
                 if window_ == "ENEV":
-                    return float16(u_value.get("Fenster").get(window_).get(uint16(glazing)))
+                    return float16(_lookup("Fenster", window_, year=int(glazing)))
                 elif window_ == "u_value":
                     return float16(data_house.get(f"{prefix}_u_value", 0))
                 else:
-                    return u_value.get("Fenster").get(window_).get(glazing).get(window_year)
+                    return _lookup("Fenster", window_, glazing, year=window_year)
 
             elif "door" in prefix:
-                year: uint16 = uint16(data_house.get(f"house_year", 0)
-                                      if data_house.get(f"house_year") < 1995 else 1995)
-                return float16(u_value.get("Türen").get("alle").get(year, 0))
+                return float16(u_value.get("Türen", "alle", year=year, default=0))
 
             elif "floor" in prefix:
                 floor_: str = data_house.get(f"floor", "")
                 floor_type: str = data_house.get(f"construction_floor", "")
-                year: uint16 = uint16(data_house.get(f"house_year", 0)
-                                      if data_house.get(f"house_year") < 1995 else 1995)
                 if floor_ == "ENEV unbeheiztes Geschoss" or floor_ == "ENEV beheiztes Geschoss":
-                    u: float16 = float16(u_value.get("Boden").get(floor_).get(uint16(floor_type)))
-                    return u
+                    return float16(_lookup("Boden", floor_, year=int(floor_type)))
                 elif floor_ == "u_value":
                     return float16(data_house.get(f"{prefix}_u_value", 0))
                 else:
-                    return float16(u_value.get("Boden").get(floor_).get(floor_type).get(year))
+                    return float16(_lookup("Boden", floor_, floor_type, year=year))
 
             elif "ceiling" in prefix:
                 ceiling_: str = data_house.get(f"ceiling", "")
                 ceiling_type: str = data_house.get(f"construction_ceiling", "")
-                year: uint16 = uint16(data_house.get(f"house_year", 0)
-                                      if data_house.get(f"house_year") < 1995 else 1995)
                 if (ceiling_ == "ENEV unbeheiztes Geschoss" or ceiling_ == "ENEV beheiztes Geschoss" or
                         ceiling_ == "ENEV Dach"):
-                    return float16(u_value.get("Decke").get(ceiling_).get(uint16(ceiling_type)))
+                    return float16(_lookup("Decke", ceiling_, year=int(ceiling_type)))
                 elif ceiling_ == "u_value":
                     return float16(data_house.get(f"{prefix}_u_value", 0))
                 else:
-                    return float16(u_value.get("Decke").get(ceiling_).get(ceiling_type).get(year))
-        except AttributeError as err:
+                    return float16(_lookup("Decke", ceiling_, ceiling_type, year=year))
+        except (AttributeError, TypeError, ValueError) as err:
             print(prefix)
             print(f"Attribute Missing: {err}")
             return float16(0.0)
@@ -222,271 +217,339 @@ def heating_power(config_data: dict, weather: dict) -> (list, list, list):
 
     indoor_temp: float16 = float16(22)
 
-    hp_data: list = []
-    diff_data: list = []
-    tme_data: list = []
-    cop_temp: list = []
-
-    old_temp: float16 = float16(16)
-    for date, weather_today in weather.items():
-        for tme, data in weather_today.items():
-
-            outdoor_temp: float16 = float16(data.get("temp", old_temp))
-            old_temp = outdoor_temp
-            diff_temp: float16 = indoor_temp - outdoor_temp
-
-            room.Floor.temp_diff = diff_temp
-            room.Ceiling.temp_diff = diff_temp
-
-            room.Wall1.temp_diff = diff_temp
-            if room.Wall1.interior_wall_temp:
-                room.Wall1.temp_diff = float16(absolute(room.Wall1.interior_wall_temp - indoor_temp))
-
-            room.Wall2.temp_diff = diff_temp
-            if room.Wall2.interior_wall_temp:
-                room.Wall2.temp_diff = float16(absolute(room.Wall2.interior_wall_temp - indoor_temp))
-
-            room.Wall3.temp_diff = diff_temp
-            if room.Wall3.interior_wall_temp:
-                room.Wall3.temp_diff = float16(absolute(room.Wall3.interior_wall_temp - indoor_temp))
-
-            room.Wall4.temp_diff = diff_temp
-            if room.Wall4.interior_wall_temp:
-                room.Wall4.temp_diff = float16(absolute(room.Wall4.interior_wall_temp - indoor_temp))
-
-            d = hp.calc_heating_power(room)
-
-            cop: float16 = float16(((1 / 14) * outdoor_temp + 2.5) if outdoor_temp > -20 else 1)
+    # missing temperatures are replaced with the last known one
+    outdoor_temps = weather.series["temp"].ffill().fillna(16).to_numpy(dtype=float16).astype(float64)
+
+    hp_data = hp.calc_heating_power_array(room, outdoor_temps, indoor_temp)
+    cop_temp = where(outdoor_temps > -20, (1 / 14) * outdoor_temps + 2.5, 1).astype(float16)
+
+    return weather.labels.tolist(), hp_data.tolist(), cop_temp.tolist()
+
+
+def _analytics_key(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                   init_battery_charge: float = 0, calc_cost: bool = True, index_data: bool = False,
+                   market_data: classes.MarketData | None = None) -> str:
+    return wrap.digest({section: config_data.get(section) for section in ANALYTICS_SECTIONS}, weather_data,
+                       consumption_data, float(init_battery_charge), calc_cost, index_data, market_data)
+
+
+@wrap.result_cache(maxsize=consts.RESULT_CACHE_SIZE, ttl=consts.RESULT_CACHE_TTL, key=_analytics_key)
+def _cached_analysis(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                     init_battery_charge: float = 0, calc_cost: bool = True, index_data: bool = False,
+                     market_data: classes.MarketData | None = None):
+    return _analyze_data(config_data, weather_data, consumption_data, init_battery_charge, calc_cost, index_data,
+                         market_data)
+
+
+def analyze_data(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                 init_battery_charge: float = 0, calc_cost: bool = True, index_data: bool = False,
+                 market_data: classes.MarketData | None = None):
+    """
+    Analyzes the forecast, the results are cached by the inputs. The state of charge at the end of today is written
+    to the journal on every call, also if the result comes from the cache.
+    :return: the result of _analyze_data.
+    """
+    state_of_charge, result = _cached_analysis(config_data, weather_data, consumption_data, init_battery_charge,
+                                               calc_cost, index_data, market_data)
+    if state_of_charge is not None:
+        # state of charge at the end of today for the start of the next run
+        soc_journal.get_journal().record(*state_of_charge)
+    return result
+
+
+def _slot_prices(market_class: classes.MarketData, timestamps: ndarray) -> ndarray:
+    """
+    Looks up the hourly consumer price for every time step.
+    :param market_class: market prices
+    :param timestamps: local times of the time steps as datetime64
+    :return: the prices in ct/kWh, nan without a price for the hour.
+    """
+    prices: ndarray = full(len(timestamps), nan, dtype=float64)
+    if not len(market_class.start_timestamps):
+        return prices
+    hours: ndarray = market_class.local_time(market_class.start_timestamps).astype("datetime64[h]")
+    order: ndarray = hours.argsort(kind="stable")
+    hours = hours[order]
+    slot_hours: ndarray = timestamps.astype("datetime64[h]")
+    indx: ndarray = hours.searchsorted(slot_hours).clip(max=len(hours) - 1)
+    found: ndarray = hours[indx] == slot_hours
+    prices[found] = market_class.consumer_prices[order][indx[found]]
+    return prices
+
+
+def simulate_days(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                  init_battery_charge: float = 0, calc_cost: bool = False,
+                  market_data: classes.MarketData | None = None, load_profile_data: ndarray | None = None,
+                  heating: tuple | None = None, estimate_prices: bool = False):
+    """
+    Simulates pv, load profile, heating, battery and heating costs one day after another. Only the state of the
+    battery is kept between the days, so the weather can span any period, for example a whole PVGIS year.
+    Every time step is priced with the market price of its hour. A day with missing prices gets no costs, with
+    estimate_prices the missing prices are the most expensive known price plus 10 %, as used for the forecast.
+    :param config_data: config
+    :param weather_data: weather of the period
+    :param consumption_data: False to ignore the load profile
+    :param init_battery_charge: state of charge at the start in %
+    :param calc_cost: compare the heating costs of every day
+    :param market_data: market prices, fetched for the period of the weather if None
+    :param load_profile_data: already loaded load profile, loaded from the config if None
+    :param heating: result of heating_power for the weather, calculated if None
+    :param estimate_prices: estimate the missing market prices instead of skipping the costs of the day
+    :return: generator of one dict per day.
+    """
+    load_profile_config: dict = config_data.get("load_profile")
+    slots: int = consts.SLOTS_PER_DAY
+
+    bat = battery.Battery.from_config(config_data)
+    state_of_charge: float = float(init_battery_charge)
+
+    weather_days: dict = weather_data.day_slices()
+    weather_dates: list = list(weather_days.keys())
+    sun_class = functions.init_sun_table(config_data, weather_dates[0], weather_dates[-1])
+
+    pv_plant = functions.init_pv_plant(config_data)
+
+    market_class = market_data if market_data is not None else functions.init_period_market(config_data,
+                                                                                             weather_data)
+    slot_prices: ndarray = _slot_prices(market_class, weather_data.timestamps)
+    price_estimate: float = float(market_class.consumer_prices.max(initial=0)) * 1.1
+
+    if load_profile_data is None:
+        load_profile_data = functions.load_load_profile(
+            f'{consts.LOAD_PROFILE_FOLDER}/{load_profile_config.get("name")}')
+
+    hp = heating if heating is not None else heating_power(config_data, weather_data)
+    heating_data: ndarray = array(hp[1], dtype=float64)
+    cop_data: ndarray = array(hp[2], dtype=float64)
+
+    sun_azimuth, sun_elevation = functions.get_sun_data_array(sun_class, weather_data.timestamps)
+    temp_data = weather_data.column("temp")
+    radiation_ghi_data = weather_data.column("ghi_radiation")
+    weather_times = weather_data.times.tolist()
+    weather_slots: ndarray = weather_data.slots
+    profile_rows: ndarray = load_profile.profile_days(weather_data.timestamps)
+
+    if config_data["pv"].get("diffuse_model", False):
+        radiation_direct_data = weather_data.column("direct_radiation")
+        pv_power, _ = functions.get_pv_plant_data_array(pv_plant, temp_data, radiation_direct_data, sun_azimuth,
+                                                        sun_elevation,
+                                                        diffuse_radiation=(radiation_ghi_data -
+                                                                           radiation_direct_data).clip(0),
+                                                        dni_radiation=weather_data.column("dni_radiation"))
+    else:
+        pv_power, _ = functions.get_pv_plant_data_array(pv_plant, temp_data, radiation_ghi_data, sun_azimuth,
+                                                        sun_elevation)
+
+    indx: int = 0
+    state_of_charge_old: float = -1.
+    state_of_charge_end_old: float = -1.
+    indx_charge: int = 0
+    indx_state_of_charge_end: int = 0
+    ret_old: int = 0
+
+    for date, day in weather_days.items():
+        state_of_charge_end: float = 0
+
+        day_times: list = weather_times[day]
+        pv_day, overload = bat.limit_pv(pv_power[day])
+
+        # the battery is only simulated for the times of the load profile
+        load_day: ndarray = load_profile_data[profile_rows[day], weather_slots[day]]
+        matched: ndarray = ~isnan(load_day)
+        count: int = int(matched.sum())
+
+        load_data = load_day[matched] if consumption_data else float64(0)
+        # heating and cop have a value for every weather slot, indx only counts the simulated ones
+        heating_day: ndarray = heating_data[day][matched]
+        net_power: ndarray = pv_day[matched] - load_data - heating_day / cop_data[day][matched]
+        diff_energy: ndarray = minimum(net_power, bat.max_charging_power)
+
+        result = bat.simulate(diff_energy, state_of_charge, overload[matched])
+        net_energy: ndarray = net_power * bat.interval
+        # surplus which does not fit into the battery goes to the grid, missing energy not covered by it comes from it
+        charged_from_pv: ndarray = ((result.charge - overload[matched] * bat.interval).clip(0) /
+                                    (bat.load_efficiency or 1))
+        feed_in: ndarray = (net_energy - charged_from_pv).clip(0) * (net_energy > 0)
+        grid: ndarray = (-net_energy - result.discharge * bat.converter_efficiency).clip(0) * (net_energy < 0)
+        state: ndarray = result.state_of_charge
+        previous: ndarray = concatenate(([state_of_charge_old], state[:-1]))
+        discharging: ndarray = previous > state
+
+        if not discharging.all():
+            state_of_charge_end = float(state[~discharging].max())
+            indx_state_of_charge_end = indx + int(flatnonzero(~discharging & (state == state_of_charge_end))[-1])
+
+        charging: ndarray = flatnonzero((previous == bat.min_state_of_charge) & (previous < state))
+        if len(charging):
+            indx_charge = indx + int(charging[-1])
+
+        if count:
+            state_of_charge = state_of_charge_old = float(state[-1])
+
+        diff_power: ndarray = diff_energy + where(discharging, absolute(diff_energy), 0)
+        diff_energy_abs: ndarray = absolute(diff_energy)
+        battery_load: ndarray = state.copy()
+
+        ret: int | None = None
+        cost: dict | None = None
+        prices_day: ndarray = slot_prices[day][matched]
+        if estimate_prices:
+            prices_day = where(isnan(prices_day), price_estimate, prices_day)
+
+        if calc_cost and count and not isnan(prices_day).any():
+            heating_cost_sum, heating_cost_other_sum = calc_heating_cost(config_data, diff_power, heating_day,
+                                                                         prices_day, diff_energy_abs)
 
-            cop_temp.append(cop)
-            diff_data.append(diff_temp)
-            hp_data.append(d)
-            tme_data.append(f"{date} {tme}")
+            if heating_cost_other_sum < heating_cost_sum:
+                ret = 1
 
-    return tme_data, hp_data, cop_temp
+                state_of_charge = state_of_charge_end
+                battery_load[max(indx_state_of_charge_end - indx, 0):] = state_of_charge_end
 
+                if ret_old == 1:
+                    charge_start: int = min(max(indx_charge - indx, 0), count)
+                    battery_load[:charge_start] = state_of_charge_end_old
+                    battery_load[charge_start:] = minimum(battery_load[charge_start:] + state_of_charge_end_old -
+                                                          bat.min_state_of_charge, 100)
+            else:
+                ret = 2
 
-@wrap.freeze_all
-def analyze_data(config_data: dict, weather_data: dict, consumption_data: bool = True, init_battery_charge: float = 0,
-                 calc_cost: bool = True, index_data: bool = False):
-    return _analyze_data(config_data, weather_data, consumption_data, init_battery_charge, calc_cost, index_data)
+            cost = {'heater': float(heating_cost_other_sum), 'strom': float(heating_cost_sum)}
+            ret_old = ret
+            state_of_charge_end_old = state_of_charge_end
 
+        indx += count
+
+        yield {
+            'date': date,
+            'times': [f'{date} {tme}' for tme in day_times],
+            'pv': pv_day,
+            'heating': heating_data[day],
+            'diff_power': diff_power,
+            'diff_energy': diff_energy_abs,
+            'battery': battery_load,
+            'charge': result.charge,
+            'discharge': result.discharge,
+            'feed_in': feed_in,
+            'grid': grid,
+            'state_of_charge': state_of_charge,
+            'energy': functions.calc_energy(pv_day.tolist(), interval=24 / slots, kwh=False, round_=2),
+            'cost': cost,
+            'option': ret
+        }
 
-@lru_cache(maxsize=1)
-def _analyze_data(config_data: dict, weather_data: dict, consumption_data: bool = True, init_battery_charge: float = 0,
-                  calc_cost: bool = False, index_data: bool = False):
-    converter = config_data.get("converter")
-    load_profile = config_data.get("load_profile")
-    battery = config_data.get('battery')
 
+def simulate_period(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                    init_battery_charge: float = 0, calc_cost: bool = True,
+                    market_data: classes.MarketData | None = None, load_profile_data: ndarray | None = None,
+                    heating: tuple | None = None, estimate_prices: bool = False) -> dict:
+    """
+    Sums up the simulation of a whole period without keeping the days, used to size the battery and converter.
+    The costs only contain the days with market prices, their number is given as priced_days.
+    :param config_data: config
+    :param weather_data: weather of the period
+    :param consumption_data: False to ignore the load profile
+    :param init_battery_charge: state of charge at the start in %
+    :param calc_cost: compare the heating costs of every day
+    :param market_data: market prices, fetched for the period of the weather if None
+    :param load_profile_data: already loaded load profile, loaded from the config if None
+    :param heating: result of heating_power for the weather, calculated if None
+    :param estimate_prices: estimate the missing market prices, see simulate_days
+    :return: dict with the totals of the period, energies in Wh and costs in ct.
+    """
+    capacity: float = battery.Battery.from_config(config_data).capacity
+    summary: dict = {'days': 0, 'pv_energy': 0., 'feed_in': 0., 'grid': 0., 'self_consumption': 0., 'charged': 0.,
+                     'discharged': 0., 'full_cycles': 0., 'min_state_of_charge': 100., 'max_state_of_charge': 0.,
+                     'heating_cost': 0., 'heating_cost_other': 0., 'cost': 0., 'heater_days': 0, 'priced_days': 0}
+
+    for day in simulate_days(config_data, weather_data, consumption_data, init_battery_charge, calc_cost,
+                             market_data, load_profile_data, heating, estimate_prices):
+        summary['days'] += 1
+        summary['pv_energy'] += day['energy']
+        summary['feed_in'] += float(day['feed_in'].sum())
+        summary['grid'] += float(day['grid'].sum())
+        summary['charged'] += float(day['charge'].sum())
+        summary['discharged'] += float(day['discharge'].sum())
+        if len(day['battery']):
+            summary['min_state_of_charge'] = min(summary['min_state_of_charge'], float(day['battery'].min()))
+            summary['max_state_of_charge'] = max(summary['max_state_of_charge'], float(day['battery'].max()))
+        if day['cost'] is not None:
+            summary['priced_days'] += 1
+            summary['heating_cost'] += day['cost']['strom']
+            summary['heating_cost_other'] += day['cost']['heater']
+            # the cheaper heating of the day is used
+            summary['cost'] += day['cost']['heater'] if day['option'] == 1 else day['cost']['strom']
+            summary['heater_days'] += day['option'] == 1
+
+    if summary['pv_energy'] > 0:
+        summary['self_consumption'] = max(1 - summary['feed_in'] / summary['pv_energy'], 0.)
+    summary['full_cycles'] = summary['discharged'] / capacity if capacity > 0 else 0.
+    return summary
+
+
+def _analyze_data(config_data: dict, weather_data: classes.Weather, consumption_data: bool = True,
+                  init_battery_charge: float = 0, calc_cost: bool = False, index_data: bool = False,
+                  market_data: classes.MarketData | None = None):
     pv_data_data: list = []
     weather_time: list = []
-
-    max_converter_power: float16 = float16(converter.get("max_power", 0))
-    converter_efficiency: float16 = float16(converter.get('efficiency'))
-
+    heating_data: list = []
     diff_energy_data: list = []
     diff_power: list = []
-
     battery_load: list = []
-    overload_energy: float32 = float32(0)
-    min_capacity: float32 = float32(
-        battery.get('capacity', 0) * 1_000 * (1 - battery.get('max_deload', 100) / 100))
-    charging_power: float32 = float32(battery.get('charging_power', 0) * 0.25)
-    battery_capacity: float32 = float32(battery.get('capacity', 0) * 1_000)
-    state_of_charge: float32 = float32(init_battery_charge)
-    min_state_of_charge: float32 = float32(min_capacity / battery_capacity * 100)
-    load_efficiency: float32 = float32(battery.get('load_efficiency', 0) / 100)
-
-    battery_max_charging_power: float16 = float16(battery.get('charging_power'))
-
-    sun_class = functions.init_sun(config_data)
-
-    pv_class = functions.init_pv(config_data, number=1)
-    pv_class2 = functions.init_pv(config_data, number=2)
-    pv_class3 = functions.init_pv(config_data, number=3)
-    pv_class4 = functions.init_pv(config_data, number=4)
-
-    market_class = functions.init_market(config_data)
-
-    market_time = [time.get('start_timestamp') for time in market_class.data]
-    market_price = [price.get('consumerprice') for price in market_class.data]
-
-    load_profile_data: dict = functions.load_load_profile(f'{consts.LOAD_PROFILE_FOLDER}/{load_profile.get("name")}')
-
-    hp = heating_power(config_data, weather_data)
-
-    indx: uint16 = uint16(0)
-    day_indx: uint16 = uint16(0)
-
-    state_of_charge_old: float32 = float32(-1)
-    state_of_charge_end_old: float32 = float32(-1)
-    indx_charge: uint16 = uint16(0)
-    ret: uint16 = uint16(0)
-    ret_old: uint16 = uint16(0)
-    indx_state_of_charge_end: int = 0
-
-    path_soc: str = r'./data/data.toml'
 
     vals: dict = {}
     price: dict = {}
     option: list = []
 
-    for date, weather_today in weather_data.items():
-        day_indx += 1
-        date_load: str = date.rsplit('-', 1)[0]
-        curr_load: dict = load_profile_data.get(date_load, "")
-        state_of_charge_end = 0
-        for (tme_pv, data), (tme_load, load_data) in zip(weather_today.items(), curr_load.items()):
-            time_float: float16 = functions.string_time_to_float(tme_pv)
-            temp: float16 = float16(data.get("temp", 0))
-            radiation_ghi: float16 = float16(data.get("ghi_radiation", 0))
-
-            azimuth, elevation = functions.get_sun_data(sun_class, time_float)
-
-            power_ghi: float32 = functions.get_pv_data(pv_class, temp, radiation_ghi, azimuth, elevation)
-
-            if config_data['pv']['alignment'] >= 2:
-                power_ghi += functions.get_pv_data(pv_class2, temp, radiation_ghi, azimuth, elevation)
-            if config_data['pv']['alignment'] >= 3:
-                power_ghi += functions.get_pv_data(pv_class3, temp, radiation_ghi, azimuth, elevation)
-            if config_data['pv']['alignment'] >= 4:
-                power_ghi += functions.get_pv_data(pv_class4, temp, radiation_ghi, azimuth, elevation)
-
-            if power_ghi > max_converter_power:
-                overload_energy = power_ghi - max_converter_power
-                power_ghi = max_converter_power
-
-            weather_time.append(f'{date} {tme_pv}')
-            pv_data_data.append(power_ghi)
-
-            if tme_pv != tme_load:
-                continue
-
-            heating_pwr: float16 = hp[1][indx]
-            cop: float16 = hp[2][indx]
-
-            if not consumption_data:
-                load_data = float16(0)
-
-            load_diff: float16 = power_ghi - load_data  # Strom überschuss
-
-            diff_energy: float16 = load_diff - (heating_pwr / cop)
-
-            if diff_energy > battery_max_charging_power:
-                diff_energy = battery_max_charging_power
-
-            energy: float16 = diff_energy * 0.25
-
-            if energy < 0:
-                netto_energy = energy / (converter_efficiency / 100)
-            else:
-                energy = min((energy, charging_power))
-                netto_energy = energy * load_efficiency
-
-            netto_energy += overload_energy * 0.25
-
-            state_of_charge += netto_energy / battery_capacity * 100
-            state_of_charge = max((min_state_of_charge, min((state_of_charge, 100))))
-            battery_load.append(state_of_charge)
-
-            discharge: float16 = float16(0)
-            if state_of_charge_old > state_of_charge:
-                discharge = abs(diff_energy)
-
-            elif state_of_charge >= state_of_charge_end:
-                state_of_charge_end = state_of_charge
-                indx_state_of_charge_end = indx
-
-            if state_of_charge_old == min_state_of_charge and state_of_charge_old < state_of_charge:
-                indx_charge = indx
-
-            state_of_charge_old = state_of_charge
-
-            diff_power.append(diff_energy + discharge)
-            diff_energy_data.append(abs(diff_energy))
-
-            if indx == 96:
-                file = open(path_soc, 'r')
-                data = toml.load(file)
-                file.close()
-
-                data.update({date_old: {
-                    'state_of_charge': float(state_of_charge)
-                }
-                })
-                file = open(path_soc, mode='w')
-                toml.dump(data, file)
-                file.close()
-            date_old = date
-            indx += 1
-
-        if calc_cost:
-            slicer: slice = slice(indx - 96, indx - 1)
-
-            if indx > 96:
-                market_price_calc: list = []
-                max_market_price = max(market_price) * 1.1
-                for _ in market_price:
-                    market_price_calc.append(max_market_price)
-            else:
-                market_price_calc = market_price
-
-            heating_cost_sum, heating_cost_other_sum = calc_heating_cost(config_data, diff_power[slicer], hp[1][slicer],
-                                                                         market_price_calc, diff_energy_data)
-
-            if heating_cost_other_sum < heating_cost_sum:
-                ret = uint16(1)
-
-                state_of_charge = state_of_charge_end
-
-                for i in range(indx_state_of_charge_end, 96 * day_indx):
-                    battery_load[i] = state_of_charge_end
-
-                if ret_old == 1:
-                    for i in range((day_indx - 1) * 96, day_indx * 96):
-
-                        if i < indx_charge:
-                            battery_load[i] = state_of_charge_end_old
-
-                        elif indx_charge <= i < (96 * day_indx):
-                            battery_load[i] = min(battery_load[i] + state_of_charge_end_old - min_state_of_charge, 100)
-            else:
-                ret = uint16(2)
-
-            en = functions.calc_energy(pv_data_data[slicer], kwh=False, round_=2)
-
-            option.append(int(ret))
-            price[int(day_indx)] = {
-                'heater': round(float(heating_cost_other_sum), 2),
-                'strom': round(float(heating_cost_sum), 2)
+    market_class = market_data if market_data is not None else functions.init_market(config_data)
+    # the forecast has market prices for today and tomorrow at most, the other days are estimated
+    days = simulate_days(config_data, weather_data, consumption_data, init_battery_charge, calc_cost, market_class,
+                         estimate_prices=True)
+
+    energy_today: float = 0
+    state_of_charge: tuple | None = None
+    for day_indx, day in enumerate(days, start=1):
+        if day_indx == 1:
+            energy_today = day['energy']
+            state_of_charge = (day['date'], day['state_of_charge'])
+
+        weather_time.extend(day['times'])
+        pv_data_data.extend(day['pv'].tolist())
+        heating_data.extend(day['heating'].tolist())
+        diff_power.extend(day['diff_power'].tolist())
+        diff_energy_data.extend(day['diff_energy'].tolist())
+        battery_load.extend(day['battery'].tolist())
+
+        if day['option'] is not None:
+            option.append(day['option'])
+            price[day_indx] = {
+                'heater': round(day['cost']['heater'], 2),
+                'strom': round(day['cost']['strom'], 2)
             }
-            vals[int(day_indx)] = {
-                'battery': round(float(max(battery_load[slicer])), 2),
-                'pv': round(float(max(pv_data_data[slicer])), 2),
-                'energy': float(en)
+            vals[day_indx] = {
+                'battery': round(float(day['battery'].max()), 2),
+                'pv': round(float(day['pv'].max()), 2),
+                'energy': day['energy']
             }
 
-            ret_old = ret
-            state_of_charge_end_old = state_of_charge_end
-
     if index_data:
-        return {'vals': vals, 'price': price, 'option': option}
+        return state_of_charge, {'vals': vals, 'price': price, 'option': option}
 
-    energy_today = functions.calc_energy(pv_data_data[:95], kwh=False, round_=2)
+    labels: list = weather_data.labels.tolist()
 
-    pv_power_data = [[time, value] for time, value in zip(weather_time, array(pv_data_data, dtype=float64))]
+    pv_power_data = [[time, value] for time, value in zip(weather_time, pv_data_data)]
 
-    market_data = [[time, value] for time, value in zip(market_time, array(market_price, dtype=float64))]
+    market_data = [[time, value] for time, value in zip(market_class.times.tolist(),
+                                                        market_class.consumer_prices.tolist())]
 
-    heating_power_data = [[time, value] for time, value in zip(hp[0], array(hp[1], dtype=float64))]
+    heating_power_data = [[time, value] for time, value in zip(labels, heating_data)]
 
-    difference_power = [[time, value] for time, value in zip(hp[0], array(diff_power, dtype=float64))]
+    difference_power = [[time, value] for time, value in zip(labels, diff_power)]
 
-    battery_power = [[time, value] for time, value in zip(hp[0], array(battery_load, dtype=float64))]
+    battery_power = [[time, value] for time, value in zip(labels, battery_load)]
 
-    return (energy_today, pv_power_data, market_data, heating_power_data, difference_power, battery_power,
-            diff_energy_data)
+    return state_of_charge, (energy_today, pv_power_data, market_data, heating_power_data, difference_power,
+                             battery_power, diff_energy_data)
 
 
 def calc_heating_cost(config_data: dict, difference_power: list, heating_power_data: list, market_data: list,
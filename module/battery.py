@@ -0,0 +1,120 @@
+#  -*- coding: utf-8 -*-
+import dataclasses
+from typing import NamedTuple
+
+from numpy import asarray, concatenate, diff, empty, float64, minimum, ndarray, where
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+class BatteryResult(NamedTuple):
+    state_of_charge: ndarray
+    charge: ndarray
+    discharge: ndarray
+
+
+def _scan_array(delta: ndarray, state_of_charge: float, lower: float, upper: float) -> ndarray:
+    out: ndarray = empty(len(delta), dtype=float64)
+    for i in range(len(delta)):
+        state_of_charge += delta[i]
+        if state_of_charge > upper:
+            state_of_charge = upper
+        if state_of_charge < lower:
+            state_of_charge = lower
+        out[i] = state_of_charge
+    return out
+
+
+def _scan_list(delta: ndarray, state_of_charge: float, lower: float, upper: float) -> ndarray:
+    out: list = []
+    append = out.append
+    for step in delta.tolist():
+        state_of_charge += step
+        if state_of_charge > upper:
+            state_of_charge = upper
+        if state_of_charge < lower:
+            state_of_charge = lower
+        append(state_of_charge)
+    return asarray(out, dtype=float64)
+
+
+# element access of numpy arrays is slow in python, without numba the loop runs over a list
+_scan = njit(cache=True)(_scan_array) if njit is not None else _scan_list
+
+
+@dataclasses.dataclass(frozen=True)
+class Battery:
+    """
+    Battery and converter parameters, powers in W, energies in Wh and the state of charge in %.
+    """
+    capacity: float
+    min_state_of_charge: float
+    max_charging_power: float
+    load_efficiency: float
+    converter_efficiency: float
+    max_converter_power: float
+    interval: float = 0.25
+
+    @classmethod
+    def from_config(cls, config_data: dict) -> "Battery":
+        """
+        Creates the battery from the "battery" and "converter" section of the config.
+        :param config_data: config
+        :return: the Battery object.
+        """
+        battery: dict = config_data.get("battery")
+        converter: dict = config_data.get("converter")
+        capacity: float = float(battery.get("capacity", 0) * 1_000)
+        return cls(capacity=capacity,
+                   min_state_of_charge=float(100 - battery.get("max_deload", 100)) if capacity > 0 else 0.,
+                   max_charging_power=float(battery.get("charging_power", 0)),
+                   load_efficiency=float(battery.get("load_efficiency", 0) / 100),
+                   converter_efficiency=float(converter.get("efficiency") / 100),
+                   max_converter_power=float(converter.get("max_power", 0)))
+
+    def limit_pv(self, pv_power: ndarray) -> tuple[ndarray, ndarray]:
+        """
+        Limits the pv power to the maximum power of the converter.
+        :param pv_power: pv power in W
+        :return: the limited power and the overload above the converter power in W.
+        """
+        pv_power = asarray(pv_power, dtype=float64)
+        limited: ndarray = minimum(pv_power, self.max_converter_power)
+        return limited, pv_power - limited
+
+    def net_energy(self, net_power: ndarray, overload_power: ndarray | None = None) -> ndarray:
+        """
+        Gets the energy which goes into (positive) or out of (negative) the battery in every interval.
+        :param net_power: surplus power in W, negative if power is missing
+        :param overload_power: power above the converter limit in W, it charges the battery directly
+        :return: the energy in Wh.
+        """
+        energy: ndarray = minimum(asarray(net_power, dtype=float64), self.max_charging_power) * self.interval
+        netto_energy: ndarray = where(energy < 0, energy / self.converter_efficiency,
+                                      minimum(energy, self.max_charging_power * self.interval) * self.load_efficiency)
+        if overload_power is not None:
+            netto_energy = netto_energy + asarray(overload_power, dtype=float64) * self.interval
+        return netto_energy
+
+    def simulate(self, net_power: ndarray, state_of_charge: float = 0,
+                 overload_power: ndarray | None = None) -> BatteryResult:
+        """
+        Simulates the state of charge over the intervals.
+        :param net_power: surplus power in W, negative if power is missing
+        :param state_of_charge: state of charge at the start in %
+        :param overload_power: power above the converter limit in W
+        :return: state of charge in % after every interval, charged and discharged energy in Wh.
+        """
+        start: float = min(max(float(state_of_charge), self.min_state_of_charge), 100.)
+        if self.capacity <= 0:
+            state: ndarray = empty(len(net_power), dtype=float64)
+            state.fill(start)
+        else:
+            delta: ndarray = self.net_energy(net_power, overload_power) / self.capacity * 100
+            state = _scan(delta, float(state_of_charge), float(self.min_state_of_charge), 100.)
+
+        stored: ndarray = diff(concatenate(([start], state))) * self.capacity / 100
+        return BatteryResult(state, stored.clip(0), (-stored).clip(0))
@@ -1,51 +1,73 @@
 # -*- coding: utf-8 -*-
 import dataclasses
 import datetime
+import hashlib
+import time
+from bisect import bisect_right
 from functools import lru_cache, wraps
+from typing import NamedTuple
 
 import requests
 import requests_cache
 from numpy import (float32, float16, uint16, sin, cos, arcsin, arccos, deg2rad, rad2deg, round as np_round, power,
-                   max as np_max)
+                   max as np_max, asarray, clip, where, ndarray, timedelta64, datetime64, arange, int64, absolute,
+                   nan_to_num, float64, unique, full, nan, char, errstate)
+from pandas import DataFrame, DatetimeIndex
 
-from module import debug, own_wrapper
+from module import consts, debug, own_wrapper, price_store, sessions
 
 class MarketData:
     """
     Gets the market data to the given time interval
     """
 
-    def __init__(self, consumer_costs: float16, start_time: None | str = None, end_time: None | str = None) -> None:
+    hour_labels: ndarray = asarray([f"{hour:02d}:00" for hour in range(24)])
+
+    def __init__(self, consumer_costs: float16, start_time: None | str = None, end_time: None | str = None,
+                 data: list | None = None) -> None:
         """
         Initialise the class object.
         :param consumer_costs: The cost of the network.
         :param start_time: Start time, if only return data is given, the time is 24 hours.
         :param end_time: End time, start time must be given.
+        :param data: Already received market data from the api, if given nothing is requested.
         """
-        time_start: str = "00:00:00,00"
-        self.session = requests_cache.CachedSession(r'./module/cache/marketdata.cache',
-                                                    expire_after=datetime.timedelta(hours=1))
+        self.session: requests_cache.CachedSession | None = None
+
+        if data is None:
+            self.session = sessions.get_session()
+            data = self.get_data(*self.time_range_ms(start_time, end_time))
 
+        self.start_timestamps: ndarray = asarray([], dtype=int64)
+        self.end_timestamps: ndarray = asarray([], dtype=int64)
+        self.market_prices: ndarray = asarray([], dtype=float64)
+        self.consumer_prices: ndarray = asarray([], dtype=float64)
+        self._data: list | None = None
+        self.convert_data(data, consumer_costs)
+
+    @classmethod
+    def time_range_ms(cls, start_time: None | str = None, end_time: None | str = None) -> tuple[int, int | None]:
+        """
+        Converts the start and end time to milliseconds, without times the start is today at 00:00.
+        :param start_time: Start time in the format %Y-%m-%dT%H:%M
+        :param end_time: End time in the format %Y-%m-%dT%H:%M
+        :return: start and end in milliseconds, end is None without times.
+        """
+        time_start: str = "00:00:00,00"
         if start_time is None and end_time is None:
             date_today: str = datetime.datetime.today().strftime("%Y-%m-%d")
-            time_start_ms: int = self.convert_time_to_ms(date_today, time_start)
-            self.data: dict = self.get_data(start=time_start_ms)
-        else:
-            time_start: datetime.datetime = datetime.datetime.strptime(start_time, "%Y-%m-%dT%H:%M")
-            time_end: datetime.datetime = datetime.datetime.strptime(end_time, "%Y-%m-%dT%H:%M")
-
-            date_start: str = time_start.strftime('%Y-%m-%d')
-            date_end: str = time_end.strftime('%Y-%m-%d')
+            return cls.convert_time_to_ms(date_today, time_start), None
 
-            time_start: str = time_start.strftime('%H:%M:%S,%f')
-            time_end: str = time_end.strftime('%H:%M:%S,%f')
+        time_start: datetime.datetime = datetime.datetime.strptime(start_time, "%Y-%m-%dT%H:%M")
+        time_end: datetime.datetime = datetime.datetime.strptime(end_time, "%Y-%m-%dT%H:%M")
 
-            time_start_ms: int = self.convert_time_to_ms(date_start, time_start)
-            end_time_ms: int = self.convert_time_to_ms(date_end, time_end)
+        date_start: str = time_start.strftime('%Y-%m-%d')
+        date_end: str = time_end.strftime('%Y-%m-%d')
 
-            self.data: dict = self.get_data(start=time_start_ms, end=end_time_ms)
+        time_start: str = time_start.strftime('%H:%M:%S,%f')
+        time_end: str = time_end.strftime('%H:%M:%S,%f')
 
-        self.convert_dict(consumer_costs)
+        return cls.convert_time_to_ms(date_start, time_start), cls.convert_time_to_ms(date_end, time_end)
 
     def __str__(self) -> str:
         """
@@ -54,6 +76,92 @@ class MarketData:
         """
         return str(self.data)
 
+    def __hash__(self) -> int:
+        """
+        The hash is build from the market data, so equal prices can be used as cache key.
+        :return: hash of the data.
+        """
+        return hash(self._digest())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MarketData):
+            return NotImplemented
+        return self._digest() == other._digest()
+
+    def _digest(self) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for values in (self.start_timestamps, self.end_timestamps, self.consumer_prices):
+            digest.update(values.tobytes())
+        return digest.digest()
+
+    @property
+    def data(self) -> list[dict]:
+        """
+        Compatibility view of the prices as list of dicts with the times formatted as %H:00 and the date as
+        %d-%m-%Y, the view is build on first access.
+        :return: the market data.
+        """
+        if self._data is None:
+            self._data = [{"start_timestamp": start, "end_timestamp": end, "marketprice": market_price,
+                           "unit": "ct/kWh", "date": date, "consumerprice": consumer_price}
+                          for start, end, market_price, date, consumer_price in
+                          zip(self.times.tolist(), self.format_hours(self.end_timestamps).tolist(),
+                              self.market_prices.tolist(), self.dates.tolist(), self.consumer_prices.tolist())]
+        return self._data
+
+    @property
+    def times(self) -> ndarray:
+        """
+        :return: the start times of the prices in the format %H:00.
+        """
+        return self.format_hours(self.start_timestamps)
+
+    @property
+    def dates(self) -> ndarray:
+        """
+        :return: the dates of the prices in the format %d-%m-%Y.
+        """
+        days: ndarray = self.local_time(self.start_timestamps).astype("datetime64[D]")
+        unique_days, inverse = unique(days, return_inverse=True)
+        return asarray([Weather.date_string(day) for day in unique_days] or [""])[inverse]
+
+    @property
+    def labels(self) -> ndarray:
+        """
+        :return: the date and start time of the prices in the format %d-%m-%Y %H:00.
+        """
+        return char.add(char.add(self.dates, " "), self.times)
+
+    @staticmethod
+    def local_time(ms: ndarray) -> ndarray:
+        """
+        Converts milliseconds since epoch to the local time. The utc offset is looked up once per day, only on
+        days with a change of the offset it is looked up for every timestamp.
+        :param ms: timestamps in milliseconds
+        :return: the local times as datetime64 without timezone.
+        """
+        seconds: ndarray = asarray(ms, dtype=int64) // 1000
+        days, inverse = unique(seconds // 86_400, return_inverse=True)
+        day_start: ndarray = asarray([time.localtime(day * 86_400).tm_gmtoff for day in days.tolist()], dtype=int64)
+        day_end: ndarray = asarray([time.localtime(day * 86_400 + 86_399).tm_gmtoff for day in days.tolist()],
+                                   dtype=int64)
+
+        offsets: ndarray = day_start[inverse]
+        changes: ndarray = (day_start != day_end)[inverse]
+        offsets[changes] = [time.localtime(second).tm_gmtoff for second in seconds[changes].tolist()]
+        return (seconds + offsets).astype("datetime64[s]").astype("datetime64[m]")
+
+    @classmethod
+    def format_hours(cls, ms: ndarray) -> ndarray:
+        """
+        Formats timestamps in milliseconds to the local hour.
+        :param ms: timestamps in milliseconds
+        :return: the times in the format %H:00.
+        """
+        local: ndarray = cls.local_time(ms)
+        hours: ndarray = (local - local.astype("datetime64[D]")) // timedelta64(1, "h")
+        return cls.hour_labels[hours]
+
     @staticmethod
     def convert_ms_to_time(ms: int) -> tuple[str, str]:
         """
@@ -78,43 +186,72 @@ class MarketData:
         dt_obj = int(datetime.datetime.strptime(f"{date} {t}", '%Y-%m-%d %H:%M:%S,%f').timestamp() * 1000)
         return dt_obj
 
-    def get_data(self, start: int | None = None, end: int | None = None) -> dict:
+    @staticmethod
+    def build_url(start: int | None = None, end: int | None = None, base_url: str = consts.MARKET_API_URL) -> str:
         """
-        Retrieves data from the AWATTAR API for 24 hours, or the specified start and end time.
-        Https://www.awattar.de/services/api
+        Builds the url of the AWATTAR API for 24 hours, or the specified start and end time.
         :param start: start time in a millisecond.
         :param end: End time in milliseconds.
-        :return: Json string of the data as dict.
+        :param base_url: url of the api.
+        :return: the url.
         """
         if start and not end:
-            url = rf"https://api.awattar.de/v1/marketdata?start={int(start)}"
+            url = rf"{base_url}/v1/marketdata?start={int(start)}"
         elif end and not start:
-            url = rf"https://api.awattar.de/v1/marketdata?end={int(end)}"
+            url = rf"{base_url}/v1/marketdata?end={int(end)}"
         elif start and end:
-            url = rf"https://api.awattar.de/v1/marketdata?start={int(start)}&end={int(end)}"
+            url = rf"{base_url}/v1/marketdata?start={int(start)}&end={int(end)}"
         else:
-            url = r"https://api.awattar.de/v1/marketdata"
+            url = rf"{base_url}/v1/marketdata"
+        return url
+
+    def get_data(self, start: int | None = None, end: int | None = None) -> list:
+        """
+        Retrieves data from the AWATTAR API for 24 hours, or the specified start and end time.
+        Https://www.awattar.de/services/api
+        With a start time only the intervals missing in the price store are requested.
+        :param start: start time in a millisecond.
+        :param end: End time in milliseconds.
+        :return: Json string of the data as dict.
+        """
+        if not start:
+            return self._request(self.build_url(start, end))
+
+        store = price_store.get_store()
+        end = store.end_of_range(start, end)
+        for gap_start, gap_end in store.missing_ranges(start, end):
+            store.insert(self._request(self.build_url(gap_start, gap_end)))
+        return store.query(start, end)
+
+    def _request(self, url: str) -> list:
+        """
+        Requests the url of the AWATTAR API.
+        :param url: the url
+        :return: the data of the response.
+        """
         print(url)
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=consts.API_TIMEOUT)
         if response.from_cache:
             print('Market data cached object')
         else:
             print('Market data new object')
         return response.json().get('data')
 
-    def convert_dict(self, consumer_costs: float16) -> None:
+    def convert_data(self, data: list | None, consumer_costs: float) -> None:
         """
-        Converts the millisecond timestamp in the dict to time
+        Converts the received data to arrays, the timestamps stay in milliseconds and the prices are converted
+        to ct/kWh.
+        :param data: the data of the api
+        :param consumer_costs: The cost of the network.
         :return: None
         """
-        for i, old_data in enumerate(self.data):
-            self.data[i]['start_timestamp'], self.data[i]['date'] = self.convert_ms_to_time(old_data.get(
-                'start_timestamp', 0))
-            self.data[i]['end_timestamp'] = self.convert_ms_to_time(old_data.get('end_timestamp', 0))[0]
-            self.data[i]['marketprice'] = np_round(old_data.get('marketprice', 0) / 10, 3)
-            self.data[i]['consumerprice'] = np_round(float16((old_data.get('marketprice', 0) + consumer_costs) * 1.19),
-                                                     3)
-            self.data[i]['unit'] = 'ct/kWh'
+        frame: DataFrame = DataFrame(data or [], columns=["start_timestamp", "end_timestamp", "marketprice"])
+        frame = frame.fillna(0)
+        self.start_timestamps = frame["start_timestamp"].to_numpy(dtype=int64)
+        self.end_timestamps = frame["end_timestamp"].to_numpy(dtype=int64)
+        self.market_prices = np_round(frame["marketprice"].to_numpy(dtype=float64) / 10, 3)
+        self.consumer_prices = np_round((self.market_prices + consumer_costs) * 1.19, 3)
+        self._data = None
 
 
 class Weather:
@@ -125,25 +262,29 @@ class Weather:
     # https://open-meteo.com/en/docs#latitude=49.5139&longitude=11.2825&minutely_15=diffuse_radiation_instant&
     # hourly=temperature_2m,cloudcover
 
+    columns: tuple = ("temp", "cloudcover", "direct_radiation", "dni_radiation", "ghi_radiation")
+    slot_times: ndarray = asarray([f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(0, 60, 15)])
+
     def __init__(self, latitude: float, longitude: float, start_date: str | None = None, end_date: str | None = None,
-                 days: int | None = None) -> None:
+                 days: int | None = None, weather_data: dict | None = None) -> None:
         """
         Initialize the class
         :param latitude:
         :param longitude:
         :param start_date: Format %d-%m-%Y
+        :param weather_data: Already received weather data from the api, if given nothing is requested.
         :return: none
         """
         self.latitude: float = latitude
         self.longitude: float = longitude
-        self._expire_time = 1
-        self.session = requests_cache.CachedSession(r'./module/cache/weatherdata.cache',
-                                                    expire_after=datetime.timedelta(hours=self._expire_time))
+        self.session: requests_cache.CachedSession | None = None
 
-        weather_data: dict = self.get_weather(start_date, end_date, days)
-        self.data: dict = {}
+        if weather_data is None:
+            self.session = sessions.get_session()
+            weather_data: dict = self.get_weather(start_date, end_date, days)
+        self.series: DataFrame = DataFrame(columns=list(self.columns), index=DatetimeIndex([]), dtype=float64)
+        self._data: dict | None = None
         try:
-            self._create_dict(weather_data)
             self._sort_weather(weather_data)
         except LookupError as e:
             if "reason" in weather_data.keys():
@@ -152,6 +293,25 @@ class Weather:
                 print(e)
         except Exception as e:
             print("Exceptions has occurred: ", e)
+        self._digest: bytes = self._calc_digest()
+
+    @classmethod
+    def from_series(cls, latitude: float, longitude: float, series: DataFrame) -> "Weather":
+        """
+        Creates the class from an already sorted series, without requesting the api.
+        :param latitude:
+        :param longitude:
+        :param series: DataFrame with 15 minute steps and the columns of Weather.columns
+        :return: The Weather object.
+        """
+        weather = cls.__new__(cls)
+        weather.latitude = latitude
+        weather.longitude = longitude
+        weather.session = None
+        weather.series = series[list(cls.columns)]
+        weather._data = None
+        weather._digest = weather._calc_digest()
+        return weather
 
     def __str__(self) -> str:
         """
@@ -160,85 +320,158 @@ class Weather:
         """
         return str(self.data)
 
-    def _create_dict(self, weather_data: dict) -> None:
+    def __hash__(self) -> int:
         """
-        Creates the dictionary for the weather data
-        :param weather_data: received weather data from the api.
-        :return:
+        The hash is build from the weather data, so equal forecasts can be used as cache key.
+        :return: hash of the data.
         """
-        days: list = [datetime.datetime.strptime(date, '%Y-%m-%dT%H:%M').strftime('%d-%m-%Y')
-                      for date in weather_data["hourly"]["time"]]
-
-        times: list = [f"{str(hour).zfill(2)}:{str(minute).zfill(2)}"
-                       for hour in range(24)
-                       for minute in range(0, 60, 15)]
-
-        for day in days:
-            self.data[str(day)] = {}
-            '''self.data[str(day)]["daily"] = {
-                "temp_max": "",
-                "temp_min": "",
-                "sunrise": "",
-                "sunset": ""
-            }'''
-            for t in times:
-                self.data[day][t] = {
-                    "temp": "",
-                    "cloudcover": "",
-                    "direct_radiation": "",
-                    "dni_radiation": "",
-                    "ghi_radiation": ""
-                }
+        return hash(self._digest)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Weather):
+            return NotImplemented
+        return self._digest == other._digest
+
+    def _calc_digest(self) -> bytes:
+        """
+        Calcs a digest of the weather data.
+        :return: the digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.series.index.values.tobytes())
+        digest.update(self.series.to_numpy(dtype=float64).tobytes())
+        return digest.digest()
+
+    @property
+    def data(self) -> dict:
+        """
+        Compatibility view of the series in the format {"%d-%m-%Y": {"%H:%M": {"temp": ..., ...}}}, missing
+        values are "". The view is build on first access.
+        :return: the weather data as dict.
+        """
+        if self._data is None:
+            records: list = self.series.astype(object).where(self.series.notna(), "").to_dict("records")
+            times: list = self.times.tolist()
+            self._data = {date: dict(zip(times[day], records[day])) for date, day in self.day_slices().items()}
+        return self._data
+
+    @property
+    def dates(self) -> list[str]:
+        """
+        :return: the dates of the weather data in the format %d-%m-%Y.
+        """
+        return list(self.day_slices().keys())
+
+    @property
+    def timestamps(self) -> ndarray:
+        """
+        :return: the timestamps of the weather data as numpy datetime64.
+        """
+        return self.series.index.values.astype("datetime64[m]")
+
+    @property
+    def slots(self) -> ndarray:
+        """
+        :return: the position of the weather data in its day, one slot per 15 minutes.
+        """
+        timestamps: ndarray = self.timestamps
+        return (timestamps - timestamps.astype("datetime64[D]")) // timedelta64(15, "m")
+
+    @property
+    def times(self) -> ndarray:
+        """
+        :return: the times of the weather data in the format %H:%M.
+        """
+        return self.slot_times[self.slots]
+
+    @property
+    def labels(self) -> ndarray:
+        """
+        :return: the date and time of the weather data in the format %d-%m-%Y %H:%M.
+        """
+        labels: ndarray = self.times.astype(object)
+        for date, day in self.day_slices().items():
+            labels[day] = date + " " + labels[day]
+        return labels.astype(str)
+
+    def day_slices(self) -> dict:
+        """
+        Gets the position of every day in the series.
+        :return: dict in the format {"%d-%m-%Y": slice}
+        """
+        days: ndarray = self.timestamps.astype("datetime64[D]")
+        first_days, starts = unique(days, return_index=True)
+        ends: list = list(starts[1:]) + [len(days)]
+        return {self.date_string(day): slice(int(start), int(end)) for day, start, end in zip(first_days, starts, ends)}
+
+    @staticmethod
+    def date_string(day: datetime64) -> str:
+        """
+        Formats a numpy date without strftime.
+        :param day: the date as datetime64
+        :return: the date in the format %d-%m-%Y.
+        """
+        iso: str = str(day.astype("datetime64[D]"))
+        return f"{iso[8:10]}-{iso[5:7]}-{iso[:4]}"
+
+    def column(self, key: str, default: float = 0) -> ndarray:
+        """
+        Gets one value of the weather data for all time steps.
+        :param key: The key of the value, e.g. "temp" or "ghi_radiation".
+        :param default: Value for missing entries.
+        :return: Array of the values.
+        """
+        return self.series[key].fillna(default).to_numpy(dtype=float32)
 
     def _sort_weather(self, unsorted_data: dict) -> None:
         """
-        Sorts the weather in the created dictionary
+        Sorts the weather in a series with 15 minute steps for every day of the hourly data. The time arrays are
+        parsed once, the positions of the values are calculated from the time differences.
         :return: None
         """
         min15 = unsorted_data["minutely_15"]
         hour = unsorted_data["hourly"]
-        #daily = unsorted_data["daily"]
-
-        date = datetime.datetime.strptime(min15["time"][0], '%Y-%m-%dT%H:%M').strftime('%d-%m-%Y')
-        for indx, tme in enumerate(min15["time"]):
-            self.data[date][tme[11:]]["direct_radiation"] = min15["direct_radiation"][indx]
-            self.data[date][tme[11:]]["dni_radiation"] = min15["direct_normal_irradiance"][indx]
-            self.data[date][tme[11:]]["ghi_radiation"] = min15["shortwave_radiation"][indx]
-            if tme[11:] == "23:45":
-                date = (datetime.datetime.strptime(date, '%d-%m-%Y') +
-                        datetime.timedelta(days=1)).strftime('%d-%m-%Y')
-
-        date = datetime.datetime.strptime(min15["time"][0], '%Y-%m-%dT%H:%M').strftime('%d-%m-%Y')
-
-        tme: str | None = None
-        for indx, t in enumerate(hour["time"]):
-            for x in range(0, 60, 15):
-                tme = f"{t[11:13]}:{str(x).zfill(2)}"
-                self.data[date][tme]["temp"] = hour["temperature_2m"][indx]
-                self.data[date][tme]["cloudcover"] = hour["cloudcover"][indx]
-            if tme == "23:45":
-                date = (datetime.datetime.strptime(date, '%d-%m-%Y') +
-                        datetime.timedelta(days=1)).strftime('%d-%m-%Y')
-
-        #date = datetime.datetime.strptime(min15["time"][0], '%Y-%m-%dT%H:%M').strftime('%d-%m-%Y')
-
-        '''for indx, d in enumerate(unsorted_data["daily"]["time"]):
-            self.data[date]["daily"]["temp_max"] = daily["temperature_2m_max"][indx]
-            self.data[date]["daily"]["temp_min"] = daily["temperature_2m_min"][indx]
-            self.data[date]["daily"]["sunrise"] = daily["sunrise"][indx][11:]
-            self.data[date]["daily"]["sunset"] = daily["sunset"][indx][11:]
-            date = (datetime.datetime.strptime(date, '%d-%m-%Y') +
-                    datetime.timedelta(days=1)).strftime('%d-%m-%Y')'''
 
-    def get_weather(self, start_date: str | None, end_date: str | None, days: int = 3) -> dict:
+        hour_times: ndarray = asarray(hour["time"], dtype="datetime64[m]")
+        first_day: datetime64 = hour_times.min().astype("datetime64[D]")
+        last_day: datetime64 = hour_times.max().astype("datetime64[D]")
+        slots: int = int((last_day - first_day) // timedelta64(1, "D") + 1) * len(self.slot_times)
+        timestamps: ndarray = first_day + arange(slots) * timedelta64(15, "m")
+
+        values: ndarray = full((slots, len(self.columns)), nan, dtype=float64)
+
+        # every hourly value is used for the four 15 minute steps of its hour
+        hour_slots: ndarray = ((hour_times - first_day) // timedelta64(15, "m"))[:, None] + arange(4)
+        hour_slots = hour_slots[::-1].ravel()
+        for column, key in ((0, "temperature_2m"), (1, "cloudcover")):
+            values[hour_slots, column] = asarray(hour[key], dtype=float64)[::-1].repeat(4)
+
+        # the 15 minute values are placed by their time, values outside of the days of the hourly data are dropped
+        min15_slots: ndarray = (asarray(min15["time"], dtype="datetime64[m]") - first_day) // timedelta64(15, "m")
+        in_range: ndarray = (min15_slots >= 0) & (min15_slots < slots)
+        for column, key in ((2, "direct_radiation"), (3, "direct_normal_irradiance"), (4, "shortwave_radiation")):
+            values[min15_slots[in_range], column] = asarray(min15[key], dtype=float64)[in_range]
+
+        self.series = DataFrame(values, index=DatetimeIndex(timestamps.astype("datetime64[ns]")),
+                                columns=list(self.columns))
+        self._data = None
+
+    @staticmethod
+    def build_url(latitude: float, longitude: float, start_date: str | None = None, end_date: str | None = None,
+                  days: int | None = 3, base_url: str = consts.WEATHER_API_URL) -> str:
         """
-        Gets the weather for the given latitude and longitude
-        :return: A dict with the following variables: direct radiation, temperatur, cloudcover, temperature max,
-                 temperatur min, sunrise, sunset.
+        Builds the url of the open-meteo api
+        :param latitude:
+        :param longitude:
+        :param start_date: Format %d-%m-%Y
+        :param end_date: Format %d-%m-%Y
+        :param days: forecast days, used if no start or end date is given
+        :param base_url: url of the api
+        :return: the url.
         """
         if (start_date is None or end_date is None) and days is not None:
-            url: str = (f"https://api.open-meteo.com/v1/forecast?"
-                        f"latitude={self.latitude}&longitude={self.longitude}&"
+            url: str = (f"{base_url}/v1/forecast?"
+                        f"latitude={latitude}&longitude={longitude}&"
                         f"minutely_15=direct_normal_irradiance,direct_radiation,shortwave_radiation"
                         f"&hourly=temperature_2m,cloudcover&"
                         f"models=best_match&"
@@ -249,8 +482,8 @@ class Weather:
             start: datetime = datetime.datetime.strptime(start_date, "%d-%m-%Y")
             end: datetime = datetime.datetime.strptime(end_date, "%d-%m-%Y")
 
-            url: str = (f"https://api.open-meteo.com/v1/forecast?"
-                        f"latitude={self.latitude}&longitude={self.longitude}&"
+            url: str = (f"{base_url}/v1/forecast?"
+                        f"latitude={latitude}&longitude={longitude}&"
                         f"minutely_15=direct_normal_irradiance,direct_radiation,shortwave_radiation"
                         f"&hourly=temperature_2m,cloudcover&"
                         f"models=best_match&"
@@ -258,9 +491,17 @@ class Weather:
                         f"timezone=Europe%2FBerlin&"
                         f"start_date={start.year}-{str(start.month).zfill(2)}-{str(start.day).zfill(2)}&"
                         f"end_date={end.year}-{str(end.month).zfill(2)}-{str(end.day).zfill(2)}")
+        return url
 
+    def get_weather(self, start_date: str | None, end_date: str | None, days: int = 3) -> dict:
+        """
+        Gets the weather for the given latitude and longitude
+        :return: A dict with the following variables: direct radiation, temperatur, cloudcover, temperature max,
+                 temperatur min, sunrise, sunset.
+        """
+        url: str = self.build_url(self.latitude, self.longitude, start_date, end_date, days)
         print(url)
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=consts.API_TIMEOUT)
         if response.from_cache:
             print('Weather data cached object')
         else:
@@ -554,6 +795,60 @@ class Weather:
         return data.get(code).get(day_or_night)
 
 
+class SunPosition(NamedTuple):
+    """
+    All quantities of one sun position calculation, the fields are floats or arrays of the same shape.
+    """
+    hour_angle: float32 | ndarray
+    real_local_time: float32 | ndarray
+    elevation: float32 | ndarray
+    azimuth: float32 | ndarray
+
+
+def calc_sun_position(hours: float | ndarray, latitude: float32, longitude: float32,
+                      sun_declination: float | ndarray, time_equation: float | ndarray) -> SunPosition:
+    """
+    Calcs the position of the sun without any state, the inputs can be scalars or arrays of the same shape.
+    :param hours: The time as decimal hours (e.g. 12.5 for 12:30).
+    :param latitude: latitude in radians
+    :param longitude: longitude in radians
+    :param sun_declination: The sun declination in radians.
+    :param time_equation: The time equation.
+    :return: Hour angle, real local time, solar elevation and azimuth, the angles in degrees.
+    """
+    time_last_calc = asarray(hours, dtype=float32) - float32(0.25)
+    mid_local_time = time_last_calc + longitude * deg2rad(4, dtype=float32)
+    real_local_time = mid_local_time + time_equation
+    hour_angle = (float32(12.00) - real_local_time) * deg2rad(15, dtype=float32)
+    sun_height = arcsin(cos(hour_angle, dtype=float32) *
+                        cos(latitude, dtype=float32) *
+                        cos(sun_declination, dtype=float32)
+                        + sin(latitude, dtype=float32) *
+                        sin(sun_declination, dtype=float32), dtype=float32)
+
+    cos_azimuth = clip((sin(sun_height, dtype=float32) * sin(latitude, dtype=float32) -
+                        sin(sun_declination, dtype=float32)) /
+                       (cos(sun_height, dtype=float32) * cos(latitude, dtype=float32)), -1, 1)
+    sun_azimuth = where(real_local_time > 12,
+                        deg2rad(180, dtype=float32) + arccos(cos_azimuth, dtype=float32),
+                        deg2rad(180, dtype=float32) - arccos(cos_azimuth, dtype=float32))
+
+    position = SunPosition(rad2deg(hour_angle, dtype=float32), asarray(real_local_time, dtype=float32),
+                           rad2deg(sun_height, dtype=float32), rad2deg(sun_azimuth, dtype=float32))
+    if position.azimuth.ndim == 0:
+        return SunPosition(*(float32(value) for value in position))
+    return position
+
+
+@lru_cache(maxsize=10_000)
+def _calc_sun_position_cached(hours: float32, latitude: float32, longitude: float32, sun_declination: float32,
+                              time_equation: float32) -> SunPosition:
+    """
+    Cached version of calc_sun_position for single values, all arguments are part of the key.
+    """
+    return calc_sun_position(hours, latitude, longitude, sun_declination, time_equation)
+
+
 class CalcSunPos:
     """
     Calcs the position of the sun
@@ -566,7 +861,6 @@ class CalcSunPos:
         :param longitude:longitude
         :param date: Format %d-%m-%Y
         """
-        self.real_local_time: float32 | None = None
         self.latitude: float32 = deg2rad(latitude, dtype=float32)
         self.longitude: float32 = deg2rad(longitude, dtype=float32)
         if date is None:
@@ -578,21 +872,27 @@ class CalcSunPos:
                                    datetime.datetime(current_date.year, 1, 1)).days + 1
         self.day_angle: float = deg2rad(360.0, dtype=float32) * left_days / days_per_year
 
-        self.sun_declination: float32 = (
-                deg2rad(0.3948, dtype=float32) - deg2rad(23.2559, dtype=float32) *
-                cos(self.day_angle + deg2rad(9.1, dtype=float32), dtype=float32) -
-                deg2rad(0.3915, dtype=float32) *
-                cos(2.0 * self.day_angle + deg2rad(5.4, dtype=float32), dtype=float32) -
-                deg2rad(0.1764, dtype=float32) *
-                cos(3.0 * self.day_angle + deg2rad(26.0, dtype=float32), dtype=float32))
+        self.sun_declination, self.time_equation = self.calc_day_parameters(self.day_angle)
 
-        self.time_equation: float32 = (
-                deg2rad(0.0066, dtype=float32) + deg2rad(7.3525, dtype=float32) *
-                cos(self.day_angle + deg2rad(85.9, dtype=float32), dtype=float32) +
-                deg2rad(9.9359, dtype=float32) *
-                cos(2.0 * self.day_angle + deg2rad(108.9, dtype=float32), dtype=float32) +
-                deg2rad(0.3387, dtype=float32) *
-                cos(3.0 * self.day_angle + deg2rad(105.2, dtype=float32), dtype=float32))
+    @classmethod
+    def from_day_parameters(cls, latitude: float32, longitude: float32, day_angle: float32,
+                            sun_declination: float32, time_equation: float32) -> "CalcSunPos":
+        """
+        Creates the class from already calculated day parameters, without parsing a date.
+        :param latitude: latitude in radians
+        :param longitude: longitude in radians
+        :param day_angle: The day angle in radians.
+        :param sun_declination: The sun declination in radians.
+        :param time_equation: The time equation.
+        :return: The CalcSunPos object for this day.
+        """
+        sun = cls.__new__(cls)
+        sun.latitude = float32(latitude)
+        sun.longitude = float32(longitude)
+        sun.day_angle = float32(day_angle)
+        sun.sun_declination = float32(sun_declination)
+        sun.time_equation = float32(time_equation)
+        return sun
 
     def __str__(self) -> str:
         """
@@ -604,45 +904,95 @@ class CalcSunPos:
                 f"Die aktuelle Sonnenposition ist: {np_round(self.calc_azimuth(t), 2)}°\n"
                 f"und die aktuelle Sonnenhöhe beträgt {np_round(self.calc_solar_elevation(t), 2)}°")
 
+    @staticmethod
+    def calc_day_parameters(day_angle: float | ndarray) -> (float32 | ndarray, float32 | ndarray):
+        """
+        Calcs the sun declination and the time equation, works for a single day angle or an array of day angles.
+        :param day_angle: The day angle in radians.
+        :return: The sun declination and the time equation.
+        """
+        day_angle = asarray(day_angle, dtype=float32)
+        sun_declination = (
+                deg2rad(0.3948, dtype=float32) - deg2rad(23.2559, dtype=float32) *
+                cos(day_angle + deg2rad(9.1, dtype=float32), dtype=float32) -
+                deg2rad(0.3915, dtype=float32) *
+                cos(2.0 * day_angle + deg2rad(5.4, dtype=float32), dtype=float32) -
+                deg2rad(0.1764, dtype=float32) *
+                cos(3.0 * day_angle + deg2rad(26.0, dtype=float32), dtype=float32))
+
+        time_equation = (
+                deg2rad(0.0066, dtype=float32) + deg2rad(7.3525, dtype=float32) *
+                cos(day_angle + deg2rad(85.9, dtype=float32), dtype=float32) +
+                deg2rad(9.9359, dtype=float32) *
+                cos(2.0 * day_angle + deg2rad(108.9, dtype=float32), dtype=float32) +
+                deg2rad(0.3387, dtype=float32) *
+                cos(3.0 * day_angle + deg2rad(105.2, dtype=float32), dtype=float32))
+
+        if day_angle.ndim == 0:
+            return float32(sun_declination), float32(time_equation)
+        return sun_declination.astype(float32), time_equation.astype(float32)
+
+    @staticmethod
+    def calc_day_angle(timestamps: ndarray) -> ndarray:
+        """
+        Calcs the day angle for every timestamp, each timestamp uses the length of its own year.
+        :param timestamps: Array of numpy datetime64.
+        :return: The day angles in radians.
+        """
+        days = asarray(timestamps).astype("datetime64[D]")
+        years = days.astype("datetime64[Y]")
+        left_days = (days - years.astype("datetime64[D]")).astype(float32)
+        days_per_year = ((years + 1).astype("datetime64[D]") - years.astype("datetime64[D]")).astype(float32)
+        return deg2rad(360.0, dtype=float32) * left_days / days_per_year
+
+    @staticmethod
+    def _float_time_to_hours(t: float) -> float32:
+        """
+        Converts the time float used by the scalar methods (12.30 -> 12:30) to decimal hours.
+        :param t: Time as float.
+        :return: The time in decimal hours.
+        """
+        return float32(uint16(t) + (t - uint16(t)) * 100 / 60)
+
+    def calc_sun_position_array(self, timestamps: ndarray) -> (ndarray, ndarray):
+        """
+        Calcs azimuth and solar elevation for a whole array of timestamps in one pass. The timestamps can span
+        multiple days, every day uses its own sun declination and time equation.
+        :param timestamps: Array of numpy datetime64.
+        :return: Two arrays, the azimuth and the solar elevation in degrees.
+        """
+        timestamps = asarray(timestamps, dtype="datetime64[m]")
+        sun_declination, time_equation = self.calc_day_parameters(self.calc_day_angle(timestamps))
+        hours = (timestamps - timestamps.astype("datetime64[D]")) / timedelta64(1, "h")
+        position: SunPosition = calc_sun_position(hours, self.latitude, self.longitude, sun_declination,
+                                                  time_equation)
+        return position.azimuth, position.elevation
+
     @own_wrapper.precision()
-    @lru_cache(maxsize=1_000)
+    def calc_position(self, t: float) -> SunPosition:
+        """
+        Calcs hour angle, real local time, solar elevation and azimuth to the given time in one calculation.
+        :param t: Time as float.
+        :return: The sun position.
+        """
+        return _calc_sun_position_cached(self._float_time_to_hours(t), self.latitude, self.longitude,
+                                         self.sun_declination, self.time_equation)
+
     def calc_azimuth(self, t: float) -> float32:
         """
         Calcs the azimuth to the given time.
         :param t: Time as float.
         :return: The azimuth in degrees.
         """
-        sun_height: float32 = deg2rad(self.calc_solar_elevation(t), dtype=float32)
-        if self.real_local_time > 12:
-            sun_azimuth: float32 = deg2rad(180, dtype=float32) + arccos(
-                (sin(sun_height, dtype=float32) *
-                 sin(self.latitude, dtype=float32) - sin(self.sun_declination, dtype=float32)) /
-                (cos(sun_height, dtype=float32) * cos(self.latitude, dtype=float32)))
-        else:
-            sun_azimuth: float32 = deg2rad(180, dtype=float32) - arccos(
-                (sin(sun_height, dtype=float32) *
-                 sin(self.latitude, dtype=float32) - sin(self.sun_declination, dtype=float32)) /
-                (cos(sun_height, dtype=float32) * cos(self.latitude, dtype=float32)))
-        return rad2deg(sun_azimuth, dtype=float32)
+        return self.calc_position(t).azimuth
 
-    @own_wrapper.precision()
-    @lru_cache(maxsize=1_000)
     def calc_solar_elevation(self, t: float) -> float32:
         """
         Calcs solar elevation to the given time.
         :param t: Time as a float.
         :return: The solar elevation in degrees.
         """
-        time_last_calc: float16 = float16((uint16(t)) + ((t - uint16(t)) * 100 / 60) - 0.25)
-        mid_local_time: float32 = time_last_calc + self.longitude * deg2rad(4, dtype=float32)
-        self.real_local_time: float32 = mid_local_time + self.time_equation
-        hour_angle: float32 = (12.00 - self.real_local_time) * deg2rad(15, dtype=float32)
-        sun_height: float32 = arcsin(cos(hour_angle, dtype=float32) *
-                                     cos(self.latitude, dtype=float32) *
-                                     cos(self.sun_declination, dtype=float32)
-                                     + sin(self.latitude, dtype=float32) *
-                                     sin(self.sun_declination, dtype=float32), dtype=float32)
-        return rad2deg(sun_height, dtype=float32)
+        return self.calc_position(t).elevation
 
     @own_wrapper.precision()
     @lru_cache(maxsize=1_000)
@@ -659,7 +1009,7 @@ class CalcSunPos:
         :return:
         """
 
-        @own_wrapper.precision()()
+        @own_wrapper.precision()
         @lru_cache(maxsize=1_000)
         def _calc_incidence_angle(elevation_sun, azimuth_sun, tilt_angle, panel_azimuth) -> float32:
             """
@@ -680,8 +1030,9 @@ class CalcSunPos:
                 )
             )
 
-        sun_azimuth: float32 = self.calc_azimuth(tme)
-        sun_elevation: float32 = self.calc_solar_elevation(tme)
+        position: SunPosition = self.calc_position(tme)
+        sun_azimuth: float32 = position.azimuth
+        sun_elevation: float32 = position.elevation
         incidence_angle_original: float32 = _calc_incidence_angle(sun_elevation, sun_azimuth, original_tilt_angle,
                                                                   original_azimuth_angle)
         gb_horizontal: float32 = original_gb / cos(deg2rad(incidence_angle_original))
@@ -691,12 +1042,148 @@ class CalcSunPos:
 
         return adjusted_gb
 
+    @staticmethod
+    def adjust_for_new_angle_array(original_gb: ndarray, original_tilt_angle: float, original_azimuth_angle: float,
+                                   new_tilt_angle: float, new_azimuth_angle: float, sun_azimuth: ndarray,
+                                   sun_elevation: ndarray) -> ndarray:
+        """
+        Projects the direct radiation of a plane to an other plane for whole arrays, like adjust_for_new_angle.
+        :param original_gb: direct radiation on the original plane in W/m²
+        :param original_tilt_angle: tilt angle of the original plane in degrees
+        :param original_azimuth_angle: azimuth of the original plane in degrees
+        :param new_tilt_angle: tilt angle of the new plane in degrees
+        :param new_azimuth_angle: azimuth of the new plane in degrees
+        :param sun_azimuth: azimuth of the sun in degrees
+        :param sun_elevation: solar elevation in degrees
+        :return: the direct radiation on the new plane in W/m².
+        """
+        def _cos_incidence_angle(tilt_angle: float, panel_azimuth: float) -> ndarray:
+            elevation: ndarray = deg2rad(sun_elevation, dtype=float32)
+            tilt: float32 = deg2rad(tilt_angle, dtype=float32)
+            return (cos(elevation) * sin(tilt) * cos(deg2rad(sun_azimuth - panel_azimuth, dtype=float32)) +
+                    sin(elevation) * cos(tilt))
+
+        sun_azimuth = asarray(sun_azimuth, dtype=float32)
+        with errstate(divide="ignore", invalid="ignore"):
+            gb_horizontal: ndarray = (asarray(original_gb, dtype=float32) /
+                                      _cos_incidence_angle(original_tilt_angle, original_azimuth_angle))
+        return gb_horizontal * _cos_incidence_angle(new_tilt_angle, new_azimuth_angle)
+
+
+class CalcSunPosTable(CalcSunPos):
+    """
+    Calcs the position of the sun for a date range, the day angle, sun declination and time equation are
+    calculated once for every day of the range.
+    """
+
+    def __init__(self, latitude, longitude, start_date: str, end_date: str) -> None:
+        """
+        Initialize the class
+        :param latitude: latitude
+        :param longitude: longitude
+        :param start_date: Format %d-%m-%Y
+        :param end_date: Format %d-%m-%Y
+        """
+        super().__init__(latitude, longitude, start_date)
+        self.start_date: datetime64 = self.to_datetime64(start_date)
+        self.dates: ndarray = arange(self.start_date, self.to_datetime64(end_date) + 1)
+        self.day_angles: ndarray = self.calc_day_angle(self.dates)
+        self.sun_declinations, self.time_equations = self.calc_day_parameters(self.day_angles)
+        self._days: dict = {}
+
+    @staticmethod
+    def to_datetime64(date: str | datetime.date) -> datetime64:
+        """
+        Converts a date to numpy datetime64.
+        :param date: Date as string in the format %d-%m-%Y or as datetime.date.
+        :return: The date as datetime64[D].
+        """
+        if isinstance(date, str):
+            return datetime64(f"{date[6:10]}-{date[3:5]}-{date[:2]}", "D")
+        return datetime64(date, "D")
+
+    def _day_index(self, date: str | datetime.date) -> int:
+        """
+        Gets the index of the date in the table.
+        :param date: Date as string in the format %d-%m-%Y or as datetime.date.
+        :return: The index, -1 if the date is not in the table.
+        """
+        indx: int = int((self.to_datetime64(date) - self.start_date).astype(int64))
+        return indx if 0 <= indx < len(self.dates) else -1
+
+    def for_date(self, date: str | datetime.date) -> CalcSunPos:
+        """
+        Gets a CalcSunPos object for the given date, the objects are created once per day.
+        :param date: Date as string in the format %d-%m-%Y or as datetime.date.
+        :return: The CalcSunPos object for this date.
+        """
+        indx: int = self._day_index(date)
+        if indx == -1:
+            day_angle: float32 = self.calc_day_angle(asarray([self.to_datetime64(date)]))[0]
+            sun_declination, time_equation = self.calc_day_parameters(day_angle)
+            return CalcSunPos.from_day_parameters(self.latitude, self.longitude, day_angle, sun_declination,
+                                                  time_equation)
+
+        day: CalcSunPos | None = self._days.get(indx)
+        if day is None:
+            day = self._days.setdefault(indx, CalcSunPos.from_day_parameters(
+                self.latitude, self.longitude, self.day_angles[indx], self.sun_declinations[indx],
+                self.time_equations[indx]))
+        return day
+
+    def calc_position_at(self, date: str | datetime.date, t: float) -> (float32, float32):
+        """
+        Calcs the azimuth and the solar elevation for the given date and time.
+        :param date: Date as string in the format %d-%m-%Y or as datetime.date.
+        :param t: Time as float.
+        :return: The azimuth and the solar elevation in degrees.
+        """
+        position: SunPosition = self.for_date(date).calc_position(t)
+        return position.azimuth, position.elevation
+
+    def calc_sun_position_array(self, timestamps: ndarray) -> (ndarray, ndarray):
+        """
+        Calcs azimuth and solar elevation for an array of timestamps, the day parameters are taken from the table.
+        :param timestamps: Array of numpy datetime64.
+        :return: Two arrays, the azimuth and the solar elevation in degrees.
+        """
+        timestamps = asarray(timestamps, dtype="datetime64[m]")
+        days: ndarray = timestamps.astype("datetime64[D]")
+        indx: ndarray = (days - self.start_date).astype(int64)
+        if indx.size == 0 or indx.min() < 0 or indx.max() >= len(self.dates):
+            return super().calc_sun_position_array(timestamps)
+
+        hours = (timestamps - days) / timedelta64(1, "h")
+        position: SunPosition = calc_sun_position(hours, self.latitude, self.longitude,
+                                                  self.sun_declinations[indx], self.time_equations[indx])
+        return position.azimuth, position.elevation
+
 
 class PVProfit:
     """
     Calculates the profit for the pv system
     """
 
+    # Perez model, coefficients of the eight clarity index bins
+    diffuse_index_F11: dict = {
+        1: -0.008, 2: 0.13, 3: 0.33, 4: 0.568, 5: 0.873, 6: 1.132, 7: 1.06, 8: 0.678
+    }
+    diffuse_index_F12: dict = {
+        1: 0.588, 2: 0.683, 3: 0.487, 4: 0.187, 5: -0.392, 6: -1.237, 7: -1.6, 8: -0.327
+    }
+    diffuse_index_F13: dict = {
+        1: -0.062, 2: -0.151, 3: -0.221, 4: -0.295, 5: -0.362, 6: -0.412, 7: -0.359, 8: -0.25
+    }
+    diffuse_index_F21: dict = {
+        1: -0.06, 2: -0.019, 3: 0.055, 4: 0.109, 5: 0.226, 6: 0.288, 7: 0.264, 8: 0.156
+    }
+    diffuse_index_F22: dict = {
+        1: 0.072, 2: 0.066, 3: -0.064, 4: -0.152, 5: -0.462, 6: -0.823, 7: -1.127, 8: -1.377
+    }
+    diffuse_index_F23: dict = {
+        1: -0.022, 2: -0.029, 3: -0.026, 4: -0.014, 5: 0.001, 6: 0.056, 7: 0.131, 8: 0.251
+    }
+
     def __init__(self, module_efficiency: float, module_area: int, tilt_angle: float, exposure_angle: float,
                  temperature_coefficient: float, nominal_temperature: float, mounting_type_index: int) -> None:
         """
@@ -725,24 +1212,6 @@ class PVProfit:
             6: 43,  # Dachintegration, ohne Hinterlüftung
             7: 55  # Fassaden integriert, ohne Hinterlüftung
         }
-        self.diffuse_index_F11: dict = {
-            1: -0.008, 2: 0.13, 3: 0.33, 4: 0.568, 5: 0.873, 6: 1.132, 7: 1.06, 8: 0.678
-        }
-        self.diffuse_index_F12: dict = {
-            1: 0.588, 2: 0.683, 3: 0.487, 4: 0.187, 5: -0.392, 6: -1.237, 7: -1.6, 8: -0.327
-        }
-        self.diffuse_index_F13: dict = {
-            1: -0.062, 2: -0.151, 3: -0.221, 4: -0.295, 5: -0.362, 6: -0.412, 7: -0.359, 8: -0.25
-        }
-        self.diffuse_index_F21: dict = {
-            1: -0.06, 2: -0.019, 3: 0.055, 4: 0.109, 5: 0.226, 6: 0.288, 7: 0.264, 8: 0.156
-        }
-        self.diffuse_index_F22: dict = {
-            1: 0.072, 2: 0.066, 3: -0.064, 4: -0.152, 5: -0.462, 6: -0.823, 7: -1.127, 8: -1.377
-        }
-        self.diffuse_index_F23: dict = {
-            1: -0.022, 2: -0.029, 3: -0.026, 4: -0.014, 5: 0.001, 6: 0.056, 7: 0.131, 8: 0.251
-        }
         self.mounting_type: int = self.mounting_type_dict[mounting_type_index]
 
     def __str__(self) -> str:
@@ -831,62 +1300,50 @@ class PVProfit:
                 print("No radiation")
             return 0
 
+    def calc_incidence_angle_array(self, sun_height: ndarray, sun_azimuth: ndarray) -> ndarray:
+        """
+        Calcs the incidence angle for arrays of sun positions, -1 if the sun is below the horizon.
+        :param sun_height: the heights of the sun in degrees
+        :param sun_azimuth: the azimuths of the sun in degrees
+        :return: the incidence angles in degrees.
+        """
+        sun_height = asarray(sun_height, dtype=float32)
+        sun_azimuth = asarray(sun_azimuth, dtype=float32)
+        incidence_angle = rad2deg(arccos(clip(
+            -cos(deg2rad(sun_height, dtype=float32), dtype=float32) *
+            sin(deg2rad(self.tilt_angle, dtype=float32), dtype=float32) *
+            cos(deg2rad(sun_azimuth, dtype=float32) - deg2rad(self.exposure_angle, dtype=float32), dtype=float32) +
+            sin(deg2rad(sun_height, dtype=float32), dtype=float32) *
+            cos(deg2rad(self.tilt_angle, dtype=float32), dtype=float32), -1, 1), dtype=float32), dtype=float32)
+        return where(sun_height > 0, incidence_angle, float32(-1))
+
+    def calc_power_array(self, radiation: ndarray, temperature: ndarray, sun_height: ndarray,
+                         sun_azimuth: ndarray, dni: bool = False) -> ndarray:
+        """
+        Calcs the power of the pv panel for whole arrays in one pass, same model as calc_power and
+        calc_power_with_dni. Missing values are counted as 0.
+        :param radiation: the radiation in W/m², ghi or with dni=True the direct normal irradiance
+        :param temperature: the surrounding temperatures in °C
+        :param sun_height: the heights of the sun in degrees
+        :param sun_azimuth: the azimuths of the sun in degrees
+        :param dni: if the radiation is the direct normal irradiance
+        :return: the power of the panel in W.
+        """
+        return PVPlant([self]).calc_array_power(radiation, temperature, sun_height, sun_azimuth, dni)[0]
+
     def calc_diffuse_radiation(self, sun_height: float, diffuse_radiation, direct_radiation,
                                incidence_angle: float) -> float32:
         """
-        Calcs the diffuse radiation with the Perez Model
-        :param sun_height:
-        :param diffuse_radiation:
-        :param direct_radiation:
-        :param incidence_angle:
-        :return:
+        Calcs the diffuse radiation on the tilted panel with the Perez Model
+        :param sun_height: the height of the sun in degrees
+        :param diffuse_radiation: the diffuse horizontal radiation in W/m²
+        :param direct_radiation: the direct normal irradiance in W/m²
+        :param incidence_angle: the incidence angle of the sun in degrees
+        :return: the diffuse radiation on the panel in W/m².
         """
-        kappa: float32 = float32(1.041)
-        air_mass: float32 = float32(1 / sin(deg2rad(sun_height, dtype=float32), dtype=float32))
-        clarity_index: float32 = float32(
-            (((diffuse_radiation + direct_radiation * arcsin(sun_height, dtype=float32)) /
-              diffuse_radiation) + kappa * power(incidence_angle, 3)) /
-            (1 + kappa * power(incidence_angle, 3, dtype=float32)))  # Epsilon
-        brightness_index: float32 = float32(air_mass * direct_radiation / 1361)  # Delta
-
-        index: int = 0
-
-        if 1 <= clarity_index <= 1.065:
-            index = 1
-        elif 1.065 < clarity_index <= 1.230:
-            index = 2
-        elif 1.230 < clarity_index <= 1.5:
-            index = 3
-        elif 1.5 < clarity_index <= 1.95:
-            index = 4
-        elif 1.95 < clarity_index <= 2.8:
-            index = 5
-        elif 2.8 < clarity_index <= 4.5:
-            index = 6
-        elif 4.5 < clarity_index <= 6.2:
-            index = 7
-        elif clarity_index > 6.2:
-            index = 8
-
-        f_1: float32 = float32(self.diffuse_index_F11[index] +
-                               self.diffuse_index_F12[index] * brightness_index +
-                               self.diffuse_index_F13[index] * incidence_angle)
-
-        f_2: float32 = float32(self.diffuse_index_F21[index] +
-                               self.diffuse_index_F22[index] * brightness_index +
-                               self.diffuse_index_F23[index] * incidence_angle)
-
-        a: float = np_max(0, cos(deg2rad(incidence_angle, dtype=float32), dtype=float32))
-        b: float = np_max(0.087, sin(deg2rad(sun_height, dtype=float32), dtype=float32))
-
-        diffuse_energy: float32 = float32(diffuse_radiation * (
-                0.5 * (
-                1 + cos(deg2rad(self.tilt_angle, dtype=float32), dtype=float32)) * (
-                        1 - f_1) + a / b * f_1 + f_2 *
-                sin(deg2rad(self.tilt_angle, dtype=float32), dtype=float32)
-        ))
-
-        return diffuse_energy
+        cos_incidence: float32 = cos(deg2rad(incidence_angle, dtype=float32), dtype=float32)
+        return float32(PVPlant([self]).calc_diffuse_array(asarray([diffuse_radiation]), asarray([direct_radiation]),
+                                                          asarray([sun_height]), asarray([[cos_incidence]]))[0][0])
 
     @own_wrapper.precision()
     @lru_cache(maxsize=1_000)
@@ -914,6 +1371,218 @@ class PVProfit:
             return 0
 
 
+class PVPlant:
+    """
+    Calculates the power of a pv system with several arrays (strings with their own orientation) at once
+    """
+
+    perez_kappa: float32 = float32(1.041)
+    perez_bin_edges: ndarray = asarray([1.065, 1.230, 1.5, 1.95, 2.8, 4.5, 6.2], dtype=float32)
+    perez_f11: ndarray = asarray(list(PVProfit.diffuse_index_F11.values()), dtype=float32)
+    perez_f12: ndarray = asarray(list(PVProfit.diffuse_index_F12.values()), dtype=float32)
+    perez_f13: ndarray = asarray(list(PVProfit.diffuse_index_F13.values()), dtype=float32)
+    perez_f21: ndarray = asarray(list(PVProfit.diffuse_index_F21.values()), dtype=float32)
+    perez_f22: ndarray = asarray(list(PVProfit.diffuse_index_F22.values()), dtype=float32)
+    perez_f23: ndarray = asarray(list(PVProfit.diffuse_index_F23.values()), dtype=float32)
+
+    def __init__(self, pv_classes: list[PVProfit]) -> None:
+        """
+        Initialize the class, the parameters of the arrays are stacked into column vectors.
+        :param pv_classes: One PVProfit object for every array.
+        """
+        self.pv_classes: list[PVProfit] = list(pv_classes)
+        self.module_efficiency: ndarray = self._stack("module_efficiency")
+        self.module_area: ndarray = self._stack("module_area")
+        self.tilt_angle: ndarray = self._stack("tilt_angle")
+        self.exposure_angle: ndarray = self._stack("exposure_angle")
+        self.temperature_coefficient: ndarray = self._stack("temperature_coefficient")
+        self.nominal_temperature: ndarray = self._stack("nominal_temperature")
+        self.mounting_type: ndarray = self._stack("mounting_type")
+
+        self._sin_tilt: ndarray = sin(deg2rad(self.tilt_angle, dtype=float32), dtype=float32)
+        self._cos_tilt: ndarray = cos(deg2rad(self.tilt_angle, dtype=float32), dtype=float32)
+        self._sin_exposure: ndarray = sin(deg2rad(self.exposure_angle, dtype=float32), dtype=float32)
+        self._cos_exposure: ndarray = cos(deg2rad(self.exposure_angle, dtype=float32), dtype=float32)
+
+    def __len__(self) -> int:
+        return len(self.pv_classes)
+
+    def __str__(self) -> str:
+        """
+        Can be used to print the data
+        :return: str of the data.
+        """
+        return "\n\n".join(str(pv_class) for pv_class in self.pv_classes)
+
+    def _stack(self, name: str) -> ndarray:
+        """
+        Stacks one parameter of all arrays into a column vector.
+        :param name: Name of the PVProfit attribute.
+        :return: Array of the shape (number of arrays, 1).
+        """
+        return asarray([getattr(pv_class, name) for pv_class in self.pv_classes], dtype=float32).reshape(-1, 1)
+
+    def calc_cos_incidence_array(self, sun_height: ndarray, sun_azimuth: ndarray) -> ndarray:
+        """
+        Calcs the cosine of the incidence angle for every array and time step. The trigonometry of the sun
+        position is calculated once and shared by all arrays.
+        :param sun_height: the heights of the sun in degrees
+        :param sun_azimuth: the azimuths of the sun in degrees
+        :return: Array of the shape (number of arrays, number of time steps).
+        """
+        sun_height = deg2rad(asarray(sun_height, dtype=float32), dtype=float32)
+        sun_azimuth = deg2rad(asarray(sun_azimuth, dtype=float32), dtype=float32)
+        cos_height: ndarray = cos(sun_height, dtype=float32)
+        sin_height: ndarray = sin(sun_height, dtype=float32)
+
+        # cos(azimuth - exposure) = cos(azimuth) * cos(exposure) + sin(azimuth) * sin(exposure)
+        cos_azimuth_diff: ndarray = (cos(sun_azimuth, dtype=float32) * self._cos_exposure +
+                                     sin(sun_azimuth, dtype=float32) * self._sin_exposure)
+        return clip(-cos_height * self._sin_tilt * cos_azimuth_diff + sin_height * self._cos_tilt, -1, 1)
+
+    def calc_diffuse_array(self, diffuse_radiation: ndarray, dni: ndarray, sun_height: ndarray,
+                           cos_incidence: ndarray) -> ndarray:
+        """
+        Calcs the diffuse radiation on the tilted arrays with the Perez Model for whole time series. The clarity
+        index is binned with searchsorted, the coefficients are taken from arrays.
+        :param diffuse_radiation: the diffuse horizontal radiation in W/m²
+        :param dni: the direct normal irradiance in W/m²
+        :param sun_height: the heights of the sun in degrees
+        :param cos_incidence: cosine of the incidence angles, shape (number of arrays, number of time steps)
+        :return: the diffuse radiation in W/m² as array of the shape (number of arrays, number of time steps).
+        """
+        diffuse_radiation = clip(nan_to_num(asarray(diffuse_radiation, dtype=float32)), 0, None)
+        dni = clip(nan_to_num(asarray(dni, dtype=float32)), 0, None)
+        sun_height = asarray(sun_height, dtype=float32)
+
+        zenith: ndarray = deg2rad(90 - sun_height, dtype=float32)
+        cos_zenith: ndarray = cos(zenith, dtype=float32)
+        has_diffuse: ndarray = diffuse_radiation > 0
+        safe_diffuse: ndarray = where(has_diffuse, diffuse_radiation, float32(1))
+
+        kappa_zenith: ndarray = self.perez_kappa * power(zenith, 3, dtype=float32)
+        clarity_index: ndarray = ((safe_diffuse + dni) / safe_diffuse + kappa_zenith) / (1 + kappa_zenith)  # Epsilon
+        air_mass: ndarray = 1 / clip(cos_zenith, 0.0174, None)
+        brightness_index: ndarray = air_mass * diffuse_radiation / 1361  # Delta
+
+        index: ndarray = self.perez_bin_edges.searchsorted(clarity_index, side="left")
+
+        f_1: ndarray = clip(self.perez_f11[index] + self.perez_f12[index] * brightness_index +
+                            self.perez_f13[index] * zenith, 0, None)
+        f_2: ndarray = (self.perez_f21[index] + self.perez_f22[index] * brightness_index +
+                        self.perez_f23[index] * zenith)
+
+        a: ndarray = clip(cos_incidence, 0, None)
+        b: ndarray = clip(cos_zenith, 0.087, None)
+
+        diffuse_energy: ndarray = diffuse_radiation * (0.5 * (1 + self._cos_tilt) * (1 - f_1) + a / b * f_1 +
+                                                       f_2 * self._sin_tilt)
+        return where(has_diffuse & (sun_height > 0), clip(diffuse_energy, 0, None), float32(0)).astype(float32)
+
+    def calc_array_power(self, radiation: ndarray, temperature: ndarray, sun_height: ndarray,
+                         sun_azimuth: ndarray, dni: bool = False, diffuse_radiation: ndarray | None = None,
+                         dni_radiation: ndarray | None = None) -> ndarray:
+        """
+        Calcs the power of every array for whole time series in one broadcasted calculation, same model as
+        PVProfit.calc_power and PVProfit.calc_power_with_dni. Missing values are counted as 0.
+        If diffuse_radiation is given, the radiation is the direct horizontal radiation and the diffuse part on
+        the panel is added with the Perez Model.
+        :param radiation: the radiation in W/m², ghi or with dni=True the direct normal irradiance
+        :param temperature: the surrounding temperatures in °C
+        :param sun_height: the heights of the sun in degrees
+        :param sun_azimuth: the azimuths of the sun in degrees
+        :param dni: if the radiation is the direct normal irradiance
+        :param diffuse_radiation: the diffuse horizontal radiation in W/m²
+        :param dni_radiation: the direct normal irradiance for the Perez Model, calculated from the direct
+                              horizontal radiation if not given
+        :return: the power in W as array of the shape (number of arrays, number of time steps).
+        """
+        radiation = nan_to_num(asarray(radiation, dtype=float32))
+        temperature = nan_to_num(asarray(temperature, dtype=float32))
+        sun_height = asarray(sun_height, dtype=float32)
+
+        cos_incidence: ndarray = self.calc_cos_incidence_array(sun_height, sun_azimuth)
+
+        if diffuse_radiation is not None and not dni:
+            if dni_radiation is None:
+                dni_radiation = radiation / clip(sin(deg2rad(sun_height, dtype=float32), dtype=float32), 0.087, None)
+            direct: ndarray = clip(nan_to_num(asarray(dni_radiation, dtype=float32)) * cos_incidence, 0, None)
+            plane_radiation: ndarray = direct + self.calc_diffuse_array(diffuse_radiation, dni_radiation,
+                                                                        sun_height, cos_incidence)
+            current_efficiency: ndarray = (self.module_efficiency +
+                                           (temperature + self.mounting_type * plane_radiation / 1000 -
+                                            self.nominal_temperature) * self.temperature_coefficient)
+            power: ndarray = plane_radiation * current_efficiency * self.module_area
+        elif dni:
+            adjusted_dni: ndarray = radiation * cos_incidence
+            heating: ndarray = self.mounting_type * adjusted_dni / 1000
+            current_efficiency: ndarray = (self.module_efficiency +
+                                           (temperature + 2 * heating - self.nominal_temperature) *
+                                           self.temperature_coefficient)
+            power: ndarray = adjusted_dni * current_efficiency * self.module_area
+        else:
+            current_efficiency: ndarray = (self.module_efficiency +
+                                           (temperature + self.mounting_type * radiation / 1000 -
+                                            self.nominal_temperature) * self.temperature_coefficient)
+            power: ndarray = absolute(radiation * cos_incidence / cos(deg2rad(sun_height, dtype=float32),
+                                                                      dtype=float32) *
+                                      current_efficiency * self.module_area)
+
+        return where(sun_height > 0, power, float32(0)).astype(float32)
+
+    def calc_power_array(self, radiation: ndarray, temperature: ndarray, sun_height: ndarray,
+                         sun_azimuth: ndarray, dni: bool = False, diffuse_radiation: ndarray | None = None,
+                         dni_radiation: ndarray | None = None) -> ndarray:
+        """
+        Calcs the total power of all arrays, see calc_array_power.
+        :param radiation: the radiation in W/m², ghi or with dni=True the direct normal irradiance
+        :param temperature: the surrounding temperatures in °C
+        :param sun_height: the heights of the sun in degrees
+        :param sun_azimuth: the azimuths of the sun in degrees
+        :param dni: if the radiation is the direct normal irradiance
+        :param diffuse_radiation: the diffuse horizontal radiation in W/m²
+        :param dni_radiation: the direct normal irradiance for the Perez Model
+        :return: the power in W for every time step.
+        """
+        return self.calc_array_power(radiation, temperature, sun_height, sun_azimuth, dni, diffuse_radiation,
+                                     dni_radiation).sum(axis=0)
+
+
+class UValueTable:
+    """
+    U-values of the building elements, stored as year intervals per element and construction. The table is built
+    once at import and shared by every RequiredHeatingPower.
+    """
+
+    def __init__(self, intervals: dict) -> None:
+        """
+        Initialize the class
+        :param intervals: {(element, construction, ...): ((first year, last year, value), ...)}
+        :return: none
+        """
+        self._intervals: dict = {key: tuple(sorted(rows)) for key, rows in intervals.items()}
+        self._first_years: dict = {key: tuple(row[0] for row in rows) for key, rows in self._intervals.items()}
+
+    def get(self, *key: str, year: int, default: float | None = None) -> float | None:
+        """
+        Gets the U-value of an element for the year.
+        :param key: element and construction, e.g. "Wand", "Außenwand", "Massivbauweise"
+        :param year: year of construction
+        :param default: returned if there is no value
+        :return: U-value in W/(m²K).
+        """
+        first_years: tuple | None = self._first_years.get(key)
+        if first_years is None:
+            return default
+        i: int = bisect_right(first_years, int(year)) - 1
+        if i < 0 or int(year) > self._intervals[key][i][1]:
+            return default
+        return self._intervals[key][i][2]
+
+
+U_VALUES: UValueTable = UValueTable(consts.U_VALUES)
+
+
 class RequiredHeatingPower:
     # https://www.bosch-homecomfort.com/de/de/wohngebaeude/wissen/heizungsratgeber/heizleistung-berechnen/
     @dataclasses.dataclass
@@ -1060,504 +1729,63 @@ class RequiredHeatingPower:
             area: float16 = float16(0.0)
             temp_diff: float16 = float16(0.0)
 
-    def __init__(self) -> None:
-        """
-        # https://www.raum-analyse.de/waermedaemmung/enev/
-        """
-        self.u_value: dict = {
-            "Fenster": {
-                "Holzrahmen": {
-                    "Einfachverglasung": {
-                        1918: 5, 1919: 5, 1920: 5, 1921: 5, 1922: 5, 1923: 5, 1924: 5, 1925: 5, 1926: 5, 1927: 5,
-                        1928: 5, 1929: 5, 1930: 5, 1931: 5, 1932: 5, 1933: 5, 1934: 5, 1935: 5, 1936: 5, 1937: 5,
-                        1938: 5, 1939: 5, 1940: 5, 1941: 5, 1942: 5, 1943: 5, 1944: 5, 1945: 5, 1946: 5, 1947: 5,
-                        1948: 5, 1949: 5, 1950: 5, 1951: 5, 1952: 5, 1953: 5, 1954: 5, 1955: 5, 1956: 5, 1957: 5,
-                        1958: 5, 1959: 5, 1960: 5, 1961: 5, 1962: 5, 1963: 5, 1964: 5, 1965: 5, 1966: 5, 1967: 5,
-                        1968: 5, 1969: 5, 1970: 5, 1971: 5, 1972: 5, 1973: 5, 1974: 5, 1975: 5, 1976: 5, 1977: 5,
-                        1978: 5, 1979: 5, 1980: 5, 1981: 5, 1982: 5, 1983: 5
-                    },
-                    "Doppelverglasung": {
-                        1918: 2.7, 1919: 2.7, 1920: 2.7, 1921: 2.7, 1922: 2.7, 1923: 2.7, 1924: 2.7, 1925: 2.7,
-                        1926: 2.7, 1927: 2.7, 1928: 2.7, 1929: 2.7, 1930: 2.7, 1931: 2.7, 1932: 2.7, 1933: 2.7,
-                        1934: 2.7, 1935: 2.7, 1936: 2.7, 1937: 2.7, 1938: 2.7, 1939: 2.7, 1940: 2.7, 1941: 2.7,
-                        1942: 2.7, 1943: 2.7, 1944: 2.7, 1945: 2.7, 1946: 2.7, 1947: 2.7, 1948: 2.7, 1949: 2.7,
-                        1950: 2.7, 1951: 2.7, 1952: 2.7, 1953: 2.7, 1954: 2.7, 1955: 2.7, 1956: 2.7, 1957: 2.7,
-                        1958: 2.7, 1959: 2.7, 1960: 2.7, 1961: 2.7, 1962: 2.7, 1963: 2.7, 1964: 2.7, 1965: 2.7,
-                        1966: 2.7, 1967: 2.7, 1968: 2.7, 1969: 2.7, 1970: 2.7, 1971: 2.7, 1972: 2.7, 1973: 2.7,
-                        1974: 2.7, 1975: 2.7, 1976: 2.7, 1977: 2.7, 1978: 2.7, 1979: 2.7, 1980: 2.7, 1981: 2.7,
-                        1982: 2.7, 1983: 2.7, 1984: 2.7, 1985: 2.7, 1986: 2.7, 1987: 2.7, 1988: 2.7, 1989: 2.7,
-                        1990: 2.7, 1991: 2.7, 1992: 2.7, 1993: 2.7, 1994: 2.7
-                    },
-                    "Isolierverglasung": {
-                        1995: 1.8
-                    }
-
-                },
-                "Kunststoffrahmen": {
-                    "Isolierverglasung": {
-                        1958: 3.0, 1959: 3.0, 1960: 3.0, 1961: 3.0, 1962: 3.0, 1963: 3.0, 1964: 3.0, 1965: 3.0,
-                        1966: 3.0, 1967: 3.0, 1968: 3.0, 1969: 3.0, 1970: 3.0, 1971: 3.0, 1972: 3.0, 1973: 3.0,
-                        1974: 3.0, 1975: 3.0, 1976: 3.0, 1977: 3.0, 1978: 3.0, 1979: 3.0, 1980: 3.0, 1981: 3.0,
-                        1982: 3.0, 1983: 3.0, 1984: 3.0, 1985: 3.0, 1986: 3.0, 1987: 3.0, 1988: 3.0, 1989: 3.0,
-                        1990: 3.0, 1991: 3.0, 1992: 3.0, 1993: 3.0, 1994: 3.0, 1995: 1.8
-                    }
-                },
-                "Metallrahmen": {
-                    "Isolierverglasung": {
-                        1958: 4.3, 1959: 4.3, 1960: 4.3, 1961: 4.3, 1962: 4.3, 1963: 4.3, 1964: 4.3, 1965: 4.3,
-                        1966: 4.3, 1967: 4.3, 1968: 4.3, 1969: 4.3, 1970: 4.3, 1971: 4.3, 1972: 4.3, 1973: 4.3,
-                        1974: 4.3, 1975: 4.3, 1976: 4.3, 1977: 4.3, 1978: 4.3, 1979: 4.3, 1980: 4.3, 1981: 4.3,
-                        1982: 4.3, 1983: 4.3, 1984: 4.3, 1985: 4.3, 1986: 4.3, 1987: 4.3, 1988: 4.3, 1989: 4.3,
-                        1990: 4.3, 1991: 4.3, 1992: 4.3, 1993: 4.3, 1994: 4.3, 1995: 1.8
-                    }
-                },
-                "ENEV": {
-                    2009: 1.3, 2014: 1.3, 2016: 0.98
-                }
-            },
-            "Türen": {
-                "alle": {
-                    1918: 3.5, 1919: 3.5, 1920: 3.5, 1921: 3.5, 1922: 3.5, 1923: 3.5, 1924: 3.5, 1925: 3.5, 1926: 3.5,
-                    1927: 3.5, 1928: 3.5, 1929: 3.5, 1930: 3.5, 1931: 3.5, 1932: 3.5, 1933: 3.5, 1934: 3.5, 1935: 3.5,
-                    1936: 3.5, 1937: 3.5, 1938: 3.5, 1939: 3.5, 1940: 3.5, 1941: 3.5, 1942: 3.5, 1943: 3.5, 1944: 3.5,
-                    1945: 3.5, 1946: 3.5, 1947: 3.5, 1948: 3.5, 1949: 3.5, 1950: 3.5, 1951: 3.5, 1952: 3.5, 1953: 3.5,
-                    1954: 3.5, 1955: 3.5, 1956: 3.5, 1957: 3.5, 1958: 3.5, 1959: 3.5, 1960: 3.5, 1961: 3.5, 1962: 3.5,
-                    1963: 3.5, 1964: 3.5, 1965: 3.5, 1966: 3.5, 1967: 3.5, 1968: 3.5, 1969: 3.5, 1970: 3.5, 1971: 3.5,
-                    1972: 3.5, 1973: 3.5, 1974: 3.5, 1975: 3.5, 1976: 3.5, 1977: 3.5, 1978: 3.5, 1979: 3.5, 1980: 3.5,
-                    1981: 3.5, 1982: 3.5, 1983: 3.5, 1984: 3.5, 1985: 3.5, 1986: 3.5, 1987: 3.5, 1988: 3.5, 1989: 3.5,
-                    1990: 3.5, 1991: 3.5, 1992: 3.5, 1993: 3.5, 1994: 3.5, 1995: 3.5
-                },
-                "ENEV": {
-                    2009: 1.8, 2014: 1.8, 2016: 1.35
-                }
-            },
-            "Wand": {
-                "Außenwand": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "Innenwand": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "gegen Erdreich": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }},
-                "ENEV Außenwand": {
-                    2009: 0.28, 2014: 0.28, 2016: 0.21
-                },
-                "ENEV Innenwand": {
-                    2009: 0, 2014: 0, 2016: 0
-                }
-            },
-            "Decke": {
-                "Decke über Außenbereich": {
-                    "Massiv": {
-                        1918: 2.1, 1919: 2.1, 1920: 2.1, 1921: 2.1, 1922: 2.1, 1923: 2.1, 1924: 2.1, 1925: 2.1,
-                        1926: 2.1,
-                        1927: 2.1, 1928: 2.1, 1929: 2.1, 1930: 2.1, 1931: 2.1, 1932: 2.1, 1933: 2.1, 1934: 2.1,
-                        1935: 2.1,
-                        1936: 2.1, 1937: 2.1, 1938: 2.1, 1939: 2.1, 1940: 2.1, 1941: 2.1, 1942: 2.1, 1943: 2.1,
-                        1944: 2.1,
-                        1945: 2.1, 1946: 2.1, 1947: 2.1, 1948: 2.1, 1949: 2.1, 1950: 2.1, 1951: 2.1, 1952: 2.1,
-                        1953: 2.1,
-                        1954: 2.1, 1955: 2.1, 1956: 2.1, 1957: 2.1, 1958: 2.1, 1959: 2.1, 1960: 2.1, 1961: 2.1,
-                        1962: 2.1,
-                        1963: 2.1, 1964: 2.1, 1965: 2.1, 1966: 2.1, 1967: 2.1, 1968: 2.1, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.3
-                    },
-                    "Holzbalkendecke": {
-                        1918: 1.0, 1919: 0.8, 1920: 0.8, 1921: 0.8, 1922: 0.8, 1923: 0.8, 1924: 0.8, 1925: 0.8,
-                        1926: 0.8,
-                        1927: 0.8, 1928: 0.8, 1929: 0.8, 1930: 0.8, 1931: 0.8, 1932: 0.8, 1933: 0.8, 1934: 0.8,
-                        1935: 0.8,
-                        1936: 0.8, 1937: 0.8, 1938: 0.8, 1939: 0.8, 1940: 0.8, 1941: 0.8, 1942: 0.8, 1943: 0.8,
-                        1944: 0.8,
-                        1945: 0.8, 1946: 0.8, 1947: 0.8, 1948: 0.8, 1949: 0.8, 1950: 0.8, 1951: 0.8, 1952: 0.8,
-                        1953: 0.8,
-                        1954: 0.8, 1955: 0.8, 1956: 0.8, 1957: 0.8, 1958: 0.8, 1959: 0.8, 1960: 0.8, 1961: 0.8,
-                        1962: 0.8,
-                        1963: 0.8, 1964: 0.8, 1965: 0.8, 1966: 0.8, 1967: 0.8, 1968: 0.8, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.4,
-                        1980: 0.4,
-                        1981: 0.4, 1982: 0.4, 1983: 0.4, 1984: 0.3, 1985: 0.3, 1986: 0.3, 1987: 0.3, 1988: 0.3,
-                        1989: 0.3,
-                        1990: 0.3, 1991: 0.3, 1992: 0.3, 1993: 0.3, 1994: 0.3, 1995: 0.3
-                    },
-                    "ENEV": {
-                        2009: 0.24, 2014: 0.20, 2016: 0.15
-                    }
-                },
-                "unbeheiztes Geschoss": {
-                    "Massiv": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzbalkendecke": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "ENEV unbeheiztes Geschoss": {
-                    2009: 0.35, 2014: 0.35, 2016: 0.26
-                },
-                "ENEV beheiztes Geschoss": {
-                    2009: 0, 2014: 0, 2016: 0
-                },
-                "ENEV Dach": {
-                    2009: 0.24, 2014: 0.20, 2016: 0.15
-                }
-            },
-            "Boden": {
-                "gegen Erdreich": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "unbeheiztes Geschoss": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "beheiztes Geschoss": {
-                    "Massivbauweise": {
-                        1918: 1.7, 1919: 1.7, 1920: 1.7, 1921: 1.7, 1922: 1.7, 1923: 1.7, 1924: 1.7, 1925: 1.7,
-                        1926: 1.7,
-                        1927: 1.7, 1928: 1.7, 1929: 1.7, 1930: 1.7, 1931: 1.7, 1932: 1.7, 1933: 1.7, 1934: 1.7,
-                        1935: 1.7,
-                        1936: 1.7, 1937: 1.7, 1938: 1.7, 1939: 1.7, 1940: 1.7, 1941: 1.7, 1942: 1.7, 1943: 1.7,
-                        1944: 1.7,
-                        1945: 1.7, 1946: 1.7, 1947: 1.7, 1948: 1.7, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 1.0, 1970: 1.0,
-                        1971: 1.0,
-                        1972: 1.0, 1973: 1.0, 1974: 1.0, 1975: 1.0, 1976: 1.0, 1977: 1.0, 1978: 1.0, 1979: 0.8,
-                        1980: 0.8,
-                        1981: 0.8, 1982: 0.8, 1983: 0.8, 1984: 0.6, 1985: 0.6, 1986: 0.6, 1987: 0.6, 1988: 0.6,
-                        1989: 0.6,
-                        1990: 0.6, 1991: 0.6, 1992: 0.6, 1993: 0.6, 1994: 0.6, 1995: 0.5
-                    },
-                    "Holzkonstruktion": {
-                        1918: 2.0, 1919: 2.0, 1920: 2.0, 1921: 2.0, 1922: 2.0, 1923: 2.0, 1924: 2.0, 1925: 2.0,
-                        1926: 2.0,
-                        1927: 2.0, 1928: 2.0, 1929: 2.0, 1930: 2.0, 1931: 2.0, 1932: 2.0, 1933: 2.0, 1934: 2.0,
-                        1935: 2.0,
-                        1936: 2.0, 1937: 2.0, 1938: 2.0, 1939: 2.0, 1940: 2.0, 1941: 2.0, 1942: 2.0, 1943: 2.0,
-                        1944: 2.0,
-                        1945: 2.0, 1946: 2.0, 1947: 2.0, 1948: 2.0, 1949: 1.4, 1950: 1.4, 1951: 1.4, 1952: 1.4,
-                        1953: 1.4,
-                        1954: 1.4, 1955: 1.4, 1956: 1.4, 1957: 1.4, 1958: 1.4, 1959: 1.4, 1960: 1.4, 1961: 1.4,
-                        1962: 1.4,
-                        1963: 1.4, 1964: 1.4, 1965: 1.4, 1966: 1.4, 1967: 1.4, 1968: 1.4, 1969: 0.6, 1970: 0.6,
-                        1971: 0.6,
-                        1972: 0.6, 1973: 0.6, 1974: 0.6, 1975: 0.6, 1976: 0.6, 1977: 0.6, 1978: 0.6, 1979: 0.5,
-                        1980: 0.5,
-                        1981: 0.5, 1982: 0.5, 1983: 0.5, 1984: 0.4, 1985: 0.4, 1986: 0.4, 1987: 0.4, 1988: 0.4,
-                        1989: 0.4,
-                        1990: 0.4, 1991: 0.4, 1992: 0.4, 1993: 0.4, 1994: 0.4, 1995: 0.4
-                    }
-                },
-                "ENEV unbeheiztes Geschoss": {
-                    2009: 0.35, 2014: 0.35, 2016: 0.26
-                },
-                "ENEV beheiztes Geschoss": {
-                    2009: 0, 2014: 0, 2016: 0
-                }
-            }
-        }
+    u_value: UValueTable = U_VALUES
 
     @staticmethod
-    def calc_heating_power(room: Room) -> float32:
+    def _element_ua(element) -> float:
+        try:
+            return float(element.area) * float(element.u_wert)
+        except TypeError:
+            # no u value for the element
+            return 0.
+
+    @classmethod
+    def wall_ua(cls, wall_obj) -> float:
         """
+        Gets the static U-value × area of a wall with its windows.
+        :param wall_obj: Room.Wall1 to Room.Wall4
+        :return: UA in W/K.
+        """
+        windows: tuple = (wall_obj.Window1, wall_obj.Window2, wall_obj.Window3, wall_obj.Window4)
+        net_area: float = float(wall_obj.area) - float(wall_obj.Door.area) - sum(float(w.area) for w in windows)
+        try:
+            wall: float = net_area * float(wall_obj.u_wert)
+        except TypeError:
+            wall = 0.
+        # TODO: fix door
+        return wall + sum(cls._element_ua(window) for window in windows)
 
+    @classmethod
+    def calc_heating_power(cls, room: Room) -> float32:
+        """
+        Calculates the heating power for the temperature differences set in the room.
         :param room:
-        :return:
+        :return: heating power in W.
         """
+        walls: tuple = (room.Wall1, room.Wall2, room.Wall3, room.Wall4)
+        # TODO: fix ceiling and floor
+        return float32(sum(cls.wall_ua(wall) * float(wall.temp_diff) for wall in walls))
 
-        @own_wrapper.precision()
-        @lru_cache(maxsize=1_000)
-        def _calc(wall_obj: room.Wall1 | room.Wall2 | room.Wall3 | room.Wall4) -> (float32, float32, float32,
-                                                                                   float32, float32, float32):
-            """
-
-            :param wall_obj:
-            :return:
-            """
-            wall: float32 = float32(
-                (
-                        wall_obj.area - wall_obj.Door.area - wall_obj.Window1.area -
-                        wall_obj.Window2.area - wall_obj.Window3.area - wall_obj.Window4.area
-                ) * wall_obj.u_wert * wall_obj.temp_diff
-            )
-            window1: float32 = float32(0)
-            window2: float32 = float32(0)
-            window3: float32 = float32(0)
-            window4: float32 = float32(0)
-            door: float32 = float32(0)
-
-            try:
-                window1: float32 = (wall_obj.Window1.area * wall_obj.Window1.u_wert * wall_obj.temp_diff)
-            except TypeError:
-                pass
-            try:
-                window2: float32 = (wall_obj.Window2.area * wall_obj.Window2.u_wert * wall_obj.temp_diff)
-            except TypeError:
-                pass
-            try:
-                window3: float32 = (wall_obj.Window3.area * wall_obj.Window3.u_wert * wall_obj.temp_diff)
-            except TypeError:
-                pass
-            try:
-                window4: float32 = (wall_obj.Window4.area * wall_obj.Window4.u_wert * wall_obj.temp_diff)
-            except TypeError:
-                pass
-            try:
-                door: float32 = wall_obj.Door.area * wall_obj.Door.u_wert * wall_obj.temp_diff
-            except TypeError:
-                pass
-            print(wall, window1, window2, window3, window4, door)
-            door = 0
-            #TODO Fix door
-            return wall, window1, window2, window3, window4, door
-
-        wall_1, wall_1_window_1, wall_1_window_2, wall_1_window_3, wall_1_window_4, wall_1_door = _calc(room.Wall1)
-        wall_2, wall_2_window_1, wall_2_window_2, wall_2_window_3, wall_2_window_4, wall_2_door = _calc(room.Wall2)
-        wall_3, wall_3_window_1, wall_3_window_2, wall_3_window_3, wall_3_window_4, wall_3_door = _calc(room.Wall3)
-        wall_4, wall_4_window_1, wall_4_window_2, wall_4_window_3, wall_4_window_4, wall_4_door = _calc(room.Wall4)
-
-        floor: float32 = room.Floor.area * room.Floor.u_wert * room.Floor.temp_diff
-
-        ceiling: float32 = room.Ceiling.area * room.Ceiling.u_wert * room.Floor.temp_diff
-        #TODO: fix ceiling and floor
-        ceiling = float32(0.0)
-        floor = float32(0.0)
-        heating_power: float32 = (wall_1 + wall_1_window_1 + wall_1_window_2 + wall_1_window_3 + wall_1_window_4 +
-                                  wall_1_door +
-                                  wall_2 + wall_2_window_1 + wall_2_window_2 + wall_2_window_3 + wall_2_window_4 +
-                                  wall_2_door +
-                                  wall_3 + wall_3_window_1 + wall_3_window_2 + wall_3_window_3 + wall_3_window_4 +
-                                  wall_3_door +
-                                  wall_4 + wall_4_window_1 + wall_4_window_2 + wall_4_window_3 + wall_4_window_4 +
-                                  wall_4_door +
-                                  floor + ceiling)
-        print(heating_power)
-        return heating_power
+    @classmethod
+    def calc_heating_power_array(cls, room: Room, outdoor_temps: ndarray, indoor_temp: float) -> ndarray:
+        """
+        Calculates the heating power for a whole series of outdoor temperatures. The UA of the walls is summed up once,
+        interior walls lose a constant power to the neighbouring room.
+        :param room:
+        :param outdoor_temps: outdoor temperatures in °C
+        :param indoor_temp: indoor temperature in °C
+        :return: heating power in W for every temperature.
+        """
+        outdoor_ua: float = 0.
+        interior_power: float = 0.
+        for wall in (room.Wall1, room.Wall2, room.Wall3, room.Wall4):
+            if wall.interior_wall_temp:
+                interior_power += cls.wall_ua(wall) * abs(float(wall.interior_wall_temp) - float(indoor_temp))
+            else:
+                outdoor_ua += cls.wall_ua(wall)
+        # TODO: fix ceiling and floor
+        diff_temps: ndarray = float(indoor_temp) - asarray(outdoor_temps, dtype=float64)
+        return (outdoor_ua * diff_temps + interior_power).astype(float32)
 
     @staticmethod
     def adjust_thermal_mass(heizlast: float, v: float, delta_temp: float, time_interval: int,
@@ -6,6 +6,33 @@ DOWNLOADS_FILE_PATH: Final[str] = r'./downloads/'
 UPLOADS_FILE_PATH: Final[str] = r'uploads/'
 PLOT_PATH: Final[str] = r'./static/plots/'
 LOAD_PROFILE_FOLDER: Final[str] = r'./static/load_datas'
+LOAD_PROFILE_CACHE_PATH: Final[str] = r'./module/cache/load_profiles'
+LOAD_PROFILE_CHUNK_SIZE: Final[int] = 100_000
+
+SLOTS_PER_DAY: Final[int] = 96
+LOAD_PROFILE_DAYS: Final[int] = 366
+
+WEATHER_API_URL: Final[str] = r'https://api.open-meteo.com'
+MARKET_API_URL: Final[str] = r'https://api.awattar.de'
+API_TIMEOUT: Final[float] = 10
+API_RETRIES: Final[int] = 3
+
+HTTP_CACHE_PATH: Final[str] = r'./module/cache/http.cache'
+HTTP_CACHE_EXPIRE: Final[dict] = {
+    'nominatim.openstreetmap.org': 60 * 60 * 24 * 30,
+    'api.open-meteo.com': 60 * 60,
+    'api.awattar.de': 60 * 60
+}
+HTTP_POOL_CONNECTIONS: Final[int] = 4
+HTTP_POOL_MAXSIZE: Final[int] = 10
+FORECAST_MAX_AGE: Final[int] = 60 * 60
+FORECAST_KEEP_DAYS: Final[int] = 7
+FORECAST_MAX_LOCATIONS: Final[int] = 16
+PRICE_STORE_PATH: Final[str] = r'./module/cache/prices.sqlite'
+SOC_JOURNAL_PATH: Final[str] = r'./data/soc.sqlite'
+# the results of analyze_data are only kept in memory
+RESULT_CACHE_SIZE: Final[int] = 8
+RESULT_CACHE_TTL: Final[int] = 60 * 60
 
 WINDOW_DATA: Final[dict] = {
     'Holzrahmen': ['Einfachverglasung', 'Doppelverglasung', 'Isolierverglasung'],
@@ -143,3 +170,63 @@ CONFIG_DATA: Final[dict] = {
         'door_wall3_height': ''
     }
 }
+
+# U-values in W/(m²K) as (first year, last year, value) per element and construction
+# https://www.raum-analyse.de/waermedaemmung/enev/
+U_VALUES: Final[dict] = {
+    ('Fenster', 'Holzrahmen', 'Einfachverglasung'): ((1918, 1983, 5),),
+    ('Fenster', 'Holzrahmen', 'Doppelverglasung'): ((1918, 1994, 2.7),),
+    ('Fenster', 'Holzrahmen', 'Isolierverglasung'): ((1995, 1995, 1.8),),
+    ('Fenster', 'Kunststoffrahmen', 'Isolierverglasung'): ((1958, 1994, 3.0), (1995, 1995, 1.8)),
+    ('Fenster', 'Metallrahmen', 'Isolierverglasung'): ((1958, 1994, 4.3), (1995, 1995, 1.8)),
+    ('Fenster', 'ENEV'): ((2009, 2009, 1.3), (2014, 2014, 1.3), (2016, 2016, 0.98)),
+    ('Türen', 'alle'): ((1918, 1995, 3.5),),
+    ('Türen', 'ENEV'): ((2009, 2009, 1.8), (2014, 2014, 1.8), (2016, 2016, 1.35)),
+    ('Wand', 'Außenwand', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Wand', 'Außenwand', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Wand', 'Innenwand', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Wand', 'Innenwand', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Wand', 'gegen Erdreich', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Wand', 'gegen Erdreich', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Wand', 'ENEV Außenwand'): ((2009, 2009, 0.28), (2014, 2014, 0.28), (2016, 2016, 0.21)),
+    ('Wand', 'ENEV Innenwand'): ((2009, 2009, 0), (2014, 2014, 0), (2016, 2016, 0)),
+    ('Decke', 'Decke über Außenbereich', 'Massiv'): (
+        (1918, 1968, 2.1), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1994, 0.4), (1995, 1995, 0.3)),
+    ('Decke', 'Decke über Außenbereich', 'Holzbalkendecke'): (
+        (1918, 1918, 1.0), (1919, 1968, 0.8), (1969, 1978, 0.6), (1979, 1983, 0.4), (1984, 1995, 0.3)),
+    ('Decke', 'Decke über Außenbereich', 'ENEV'): ((2009, 2009, 0.24), (2014, 2014, 0.2), (2016, 2016, 0.15)),
+    ('Decke', 'unbeheiztes Geschoss', 'Massiv'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Decke', 'unbeheiztes Geschoss', 'Holzbalkendecke'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Decke', 'ENEV unbeheiztes Geschoss'): ((2009, 2009, 0.35), (2014, 2014, 0.35), (2016, 2016, 0.26)),
+    ('Decke', 'ENEV beheiztes Geschoss'): ((2009, 2009, 0), (2014, 2014, 0), (2016, 2016, 0)),
+    ('Decke', 'ENEV Dach'): ((2009, 2009, 0.24), (2014, 2014, 0.2), (2016, 2016, 0.15)),
+    ('Boden', 'gegen Erdreich', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Boden', 'gegen Erdreich', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Boden', 'unbeheiztes Geschoss', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Boden', 'unbeheiztes Geschoss', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Boden', 'beheiztes Geschoss', 'Massivbauweise'): (
+        (1918, 1948, 1.7), (1949, 1968, 1.4), (1969, 1978, 1.0), (1979, 1983, 0.8), (1984, 1994, 0.6),
+        (1995, 1995, 0.5)),
+    ('Boden', 'beheiztes Geschoss', 'Holzkonstruktion'): (
+        (1918, 1948, 2.0), (1949, 1968, 1.4), (1969, 1978, 0.6), (1979, 1983, 0.5), (1984, 1995, 0.4)),
+    ('Boden', 'ENEV unbeheiztes Geschoss'): ((2009, 2009, 0.35), (2014, 2014, 0.35), (2016, 2016, 0.26)),
+    ('Boden', 'ENEV beheiztes Geschoss'): ((2009, 2009, 0), (2014, 2014, 0), (2016, 2016, 0))
+}
@@ -38,31 +38,24 @@ def generate_weather_data(request_data: dict, config_data: dict) -> list[str]:
     start_date = datetime.datetime.strptime(request_data['start_date_weather'], "%Y-%m-%d").strftime("%d-%m-%Y")
     end_date = datetime.datetime.strptime(request_data['end_date_weather'], "%Y-%m-%d").strftime("%d-%m-%Y")
 
-    weather_date = functions.get_weather_data(config_data, start_date, end_date)
+    weather = functions.get_weather(config_data, start_date, end_date)
 
     pv_class = functions.init_pv(config_data)
+    sun_table = functions.init_sun_table(config_data, start_date, end_date)
 
     power_data: dict = {}
     energy_data: dict = {}
     msg: list[str] = []
-    # TODO: NEW!
-    for date, day in weather_date.items():
-        sun_class = functions.init_sun(config_data, date)
 
-        power_data[date]: dict = {}
-        energy_data_list: list[float] = []
+    azimuth, elevation = functions.get_sun_data_array(sun_table, weather.timestamps)
+    temp = weather.column("temp")
+    radiation = weather.column("dni_radiation")
+    power = functions.get_pv_data_array(pv_class, temp, radiation, azimuth, elevation, True)
+    times = weather.times.tolist()
 
-        for tme, data in day.items():
-            time_float = functions.string_time_to_float(tme)
-            temp = data.get("temp", 0)
-            radiation = data.get("dni_radiation", 0)
-            azimuth, elevation = functions.get_sun_data(sun_class, time_float)
-
-            power_data[date][tme] = functions.get_pv_data(pv_class, temp, radiation, azimuth, elevation, True)
-
-            energy_data_list.append(power_data[date][tme])
-
-        energy_data[date] = functions.calc_energy(energy_data_list)
+    for date, day in weather.day_slices().items():
+        power_data[date] = dict(zip(times[day], power[day].tolist()))
+        energy_data[date] = functions.calc_energy(power[day].tolist())
 
     if os.path.exists(rf"{consts.DOWNLOADS_FILE_PATH}weather_data.xlsx"):
         os.remove(rf"{consts.DOWNLOADS_FILE_PATH}weather_data.xlsx")
@@ -108,34 +101,18 @@ def generate_weather_data(request_data: dict, config_data: dict) -> list[str]:
     return msg
 
 
-@wrap.freeze_all
-@lru_cache(maxsize=None)
 def generate_market_data(request_data: dict, config_data: dict) -> list[str]:
     if not os.path.exists(consts.DOWNLOADS_FILE_PATH):
         os.mkdir(consts.DOWNLOADS_FILE_PATH)
 
     market_class = functions.init_market(config_data, request_data.get('start_date_market'),
                                          request_data.get('end_date_market'))
-    market_datas: list[dict] = market_class.data
-
-    debug.printer(market_datas)
+    debug.printer(market_class.consumer_prices)
 
     msg: list[str] = []
-    price_data: list[float] = []
-    time_data: list[str] = []
-    data_dict: dict = {}
-
-    for market_data in market_datas:
-        time_data.append(
-            f"{market_data.get('date', '')} {market_data.get('start_timestamp', ':')}"
-        )
-        price_data.append(market_data.get('consumerprice', 0))
-        data_dict.update(
-            {
-                f"{market_data.get('date', '')} {market_data.get('start_timestamp', ':')}": market_data.get(
-                    'consumerprice', "0")
-            }
-        )
+    time_data: list[str] = market_class.labels.tolist()
+    price_data: list[float] = market_class.consumer_prices.tolist()
+    data_dict: dict = dict(zip(time_data, price_data))
 
     if os.path.exists(rf"{consts.DOWNLOADS_FILE_PATH}market_data.xlsx"):
         os.remove(rf"{consts.DOWNLOADS_FILE_PATH}market_data.xlsx")
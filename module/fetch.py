@@ -0,0 +1,97 @@
+#  -*- coding: utf-8 -*-
+import asyncio
+
+import requests
+
+from module import classes, consts, forecast_store, price_store, sessions
+
+
+async def fetch_json(session: requests.Session, url: str, timeout: float = consts.API_TIMEOUT) -> dict:
+    """
+    Requests the url in a worker thread. Failed connections and server errors are repeated by the session, see
+    sessions.mount_retries.
+    :param session: The session for the request.
+    :param url: The url.
+    :param timeout: Timeout of a single request in seconds.
+    :return: The json response.
+    """
+    response = await asyncio.to_thread(session.get, url, timeout=timeout)
+    if response.status_code >= 500:
+        response.raise_for_status()
+    if getattr(response, "from_cache", False):
+        print(f'Cached object {url}')
+    else:
+        print(f'New object {url}')
+    return response.json()
+
+
+async def fetch_weather_and_market(config_data: dict, start_date: str | None = None, end_date: str | None = None,
+                                   days: int | None = None, start_time: str | None = None,
+                                   end_time: str | None = None, weather_url: str = consts.WEATHER_API_URL,
+                                   market_url: str = consts.MARKET_API_URL,
+                                   weather_session: requests.Session | None = None,
+                                   market_session: requests.Session | None = None,
+                                   timeout: float = consts.API_TIMEOUT,
+                                   store: forecast_store.ForecastStore | None = None,
+                                   prices: price_store.PriceStore | None = None
+                                   ) -> (classes.Weather, classes.MarketData):
+    """
+    Requests the weather and the market data at the same time.
+    :param config_data: The config data.
+    :param start_date: Start date of the weather, Format %d-%m-%Y
+    :param end_date: End date of the weather, Format %d-%m-%Y
+    :param days: Forecast days of the weather, used if no start or end date is given.
+    :param start_time: Start time of the market data, Format %Y-%m-%dT%H:%M
+    :param end_time: End time of the market data, Format %Y-%m-%dT%H:%M
+    :param weather_url: Url of the weather api.
+    :param market_url: Url of the market api.
+    :param weather_session: Session for the weather request.
+    :param market_session: Session for the market request.
+    :param timeout: Timeout of a single request in seconds.
+    :param store: Store of the forecasts, only the missing days of the weather are requested.
+    :param prices: Store of the market prices, only the missing intervals are requested.
+    :return: The weather and the market class.
+    """
+    coord: dict = config_data["coordinates"]
+    latitude, longitude = coord["latitude"], coord["longitude"]
+    weather_session = weather_session or sessions.get_session()
+    market_session = market_session or sessions.get_session()
+    store = store or forecast_store.get_store()
+    prices = prices or price_store.get_store()
+
+    first_day, last_day = store.day_range(start_date, end_date, days)
+    missing: tuple | None = store.missing_range(latitude, longitude, first_day, last_day)
+
+    start_ms, end_ms = classes.MarketData.time_range_ms(start_time, end_time)
+    end_ms = prices.end_of_range(start_ms, end_ms)
+    gaps: list = prices.missing_ranges(start_ms, end_ms)
+
+    requests_: list = [fetch_json(market_session, classes.MarketData.build_url(gap_start, gap_end, market_url),
+                                  timeout) for gap_start, gap_end in gaps]
+    if missing is not None:
+        url_weather: str = store.build_url(latitude, longitude, missing, weather_url)
+        requests_.append(fetch_json(weather_session, url_weather, timeout))
+
+    responses: list = await asyncio.gather(*requests_)
+
+    for market_data in responses[:len(gaps)]:
+        prices.insert(market_data.get("data"))
+    if missing is not None:
+        store.update(latitude, longitude, responses[-1])
+    weather = store.weather(latitude, longitude, first_day, last_day)
+    market = classes.MarketData(config_data["market"].get("consumer_price", 0), data=prices.query(start_ms, end_ms))
+    return weather, market
+
+
+def get_weather_and_market(config_data: dict, start_date: str | None = None, end_date: str | None = None,
+                           days: int | None = None, **kwargs) -> (classes.Weather, classes.MarketData):
+    """
+    Blocking call of fetch_weather_and_market.
+    :param config_data: The config data.
+    :param start_date: Start date of the weather, Format %d-%m-%Y
+    :param end_date: End date of the weather, Format %d-%m-%Y
+    :param days: Forecast days of the weather.
+    :param kwargs: see fetch_weather_and_market
+    :return: The weather and the market class.
+    """
+    return asyncio.run(fetch_weather_and_market(config_data, start_date, end_date, days, **kwargs))
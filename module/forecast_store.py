@@ -0,0 +1,192 @@
+#  -*- coding: utf-8 -*-
+import datetime
+import threading
+
+import requests
+from numpy import datetime64, timedelta64, arange, array, ndarray, isin, isnat, unique, float64
+from pandas import DataFrame, DatetimeIndex, concat
+
+from module import classes, consts, sessions
+
+
+class ForecastStore:
+    """
+    Keeps the 15 minute weather series of every location together with the time every day was fetched, so only
+    missing or stale days have to be requested from open-meteo. The store is only kept in memory for the lifetime of
+    the process. On every update the days older than keep_days and the least recently updated locations above
+    max_locations are removed.
+    """
+
+    def __init__(self, max_age: int = consts.FORECAST_MAX_AGE, keep_days: int = consts.FORECAST_KEEP_DAYS,
+                 max_locations: int = consts.FORECAST_MAX_LOCATIONS) -> None:
+        """
+        Initialize the class
+        :param max_age: seconds after which a fetched day of the forecast is requested again
+        :param keep_days: number of past days which are kept
+        :param max_locations: number of locations which are kept
+        :return: none
+        """
+        self.max_age: timedelta64 = timedelta64(int(max_age), "s")
+        self.keep_days: timedelta64 = timedelta64(int(keep_days), "D")
+        self.max_locations: int = max(int(max_locations), 1)
+        self._series: dict = {}
+        self._fetched: dict = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def location(latitude: float, longitude: float) -> tuple[float, float]:
+        """
+        :return: the key of the location.
+        """
+        return round(float(latitude), 4), round(float(longitude), 4)
+
+    @staticmethod
+    def day_range(start_date: str | None = None, end_date: str | None = None,
+                  days: int | None = None) -> tuple[datetime64, datetime64]:
+        """
+        Gets the first and last day of a request, same parameters as for the Weather class.
+        :param start_date: Format %d-%m-%Y
+        :param end_date: Format %d-%m-%Y
+        :param days: forecast days starting today, used if no start or end date is given
+        :return: first and last day as datetime64.
+        """
+        if (start_date is None or end_date is None) and days is not None:
+            today: datetime64 = datetime64(datetime.date.today(), "D")
+            return today, today + max(int(days), 1) - 1
+        return (datetime64(datetime.datetime.strptime(start_date, "%d-%m-%Y").date(), "D"),
+                datetime64(datetime.datetime.strptime(end_date, "%d-%m-%Y").date(), "D"))
+
+    @staticmethod
+    def _now() -> datetime64:
+        return datetime64(datetime.datetime.now(), "s")
+
+    def missing_range(self, latitude: float, longitude: float, first_day: datetime64, last_day: datetime64,
+                      now: datetime64 | None = None) -> tuple[datetime64, datetime64] | None:
+        """
+        Gets the days which have to be requested. A day is stale if it was fetched before it was over and is older
+        than max_age.
+        :param latitude:
+        :param longitude:
+        :param first_day: first day of the request
+        :param last_day: last day of the request
+        :param now: current time, for tests
+        :return: first and last day to request, None if everything is in the store.
+        """
+        now = self._now() if now is None else now
+        days: ndarray = arange(first_day, last_day + 1, dtype="datetime64[D]")
+        with self._lock:
+            fetched_days: dict = self._fetched.get(self.location(latitude, longitude), {})
+            fetched: ndarray = array([fetched_days.get(day, datetime64("NaT", "s")) for day in days],
+                                     dtype="datetime64[s]")
+
+        day_over: ndarray = fetched >= days + timedelta64(1, "D")
+        missing: ndarray = days[isnat(fetched) | ((fetched < now - self.max_age) & ~day_over)]
+        if not len(missing):
+            return None
+        return missing.min(), missing.max()
+
+    def update(self, latitude: float, longitude: float, weather_data: dict, now: datetime64 | None = None) -> None:
+        """
+        Merges a response of the api into the store, the days of the response replace the stored ones.
+        :param latitude:
+        :param longitude:
+        :param weather_data: received weather data from the api
+        :param now: current time, for tests
+        :return: None
+        """
+        now = self._now() if now is None else now
+        series: DataFrame = classes.Weather(latitude, longitude, weather_data=weather_data).series
+        if series.empty:
+            return
+
+        new_days: ndarray = series.index.values.astype("datetime64[D]")
+        key: tuple = self.location(latitude, longitude)
+        with self._lock:
+            self._evict(now.astype("datetime64[D]") - self.keep_days)
+            stored: DataFrame | None = self._series.pop(key, None)
+            if stored is not None:
+                keep: ndarray = ~isin(stored.index.values.astype("datetime64[D]"), new_days)
+                series = concat([stored[keep], series]).sort_index()
+            # the last updated location is at the end
+            self._series[key] = series
+            self._fetched.setdefault(key, {}).update({day: now for day in unique(new_days)})
+            while len(self._series) > self.max_locations:
+                oldest_key: tuple = next(iter(self._series))
+                del self._series[oldest_key]
+                self._fetched.pop(oldest_key, None)
+
+    def _evict(self, first_day: datetime64) -> None:
+        """
+        Removes the days before first_day, the lock has to be held. The days of a response are only removed on a
+        later update, so a request of past days gets its weather.
+        :param first_day: first day which is kept
+        :return: None
+        """
+        for key, stored in self._series.items():
+            keep: ndarray = stored.index.values.astype("datetime64[D]") >= first_day
+            if not keep.all():
+                self._series[key] = stored[keep]
+            self._fetched[key] = {day: fetched for day, fetched in self._fetched.get(key, {}).items()
+                                  if day >= first_day}
+
+    def weather(self, latitude: float, longitude: float, first_day: datetime64,
+                last_day: datetime64) -> classes.Weather:
+        """
+        Gets the stored weather for the given days.
+        :param latitude:
+        :param longitude:
+        :param first_day: first day
+        :param last_day: last day
+        :return: the Weather object.
+        """
+        with self._lock:
+            stored: DataFrame | None = self._series.get(self.location(latitude, longitude))
+        if stored is None:
+            stored = DataFrame(columns=list(classes.Weather.columns), index=DatetimeIndex([]), dtype=float64)
+            return classes.Weather.from_series(latitude, longitude, stored)
+
+        days: ndarray = stored.index.values.astype("datetime64[D]")
+        return classes.Weather.from_series(latitude, longitude, stored[(days >= first_day) & (days <= last_day)])
+
+    def get_weather(self, latitude: float, longitude: float, start_date: str | None = None,
+                    end_date: str | None = None, days: int | None = None, session: requests.Session | None = None,
+                    base_url: str = consts.WEATHER_API_URL) -> classes.Weather:
+        """
+        Gets the weather, only the missing or stale days are requested.
+        :param latitude:
+        :param longitude:
+        :param start_date: Format %d-%m-%Y
+        :param end_date: Format %d-%m-%Y
+        :param days: forecast days starting today, used if no start or end date is given
+        :param session: session for the request
+        :param base_url: url of the api
+        :return: the Weather object.
+        """
+        first_day, last_day = self.day_range(start_date, end_date, days)
+        missing: tuple | None = self.missing_range(latitude, longitude, first_day, last_day)
+        if missing is not None:
+            url: str = self.build_url(latitude, longitude, missing, base_url)
+            print(url)
+            response = (session or sessions.get_session()).get(url, timeout=consts.API_TIMEOUT)
+            self.update(latitude, longitude, response.json())
+        return self.weather(latitude, longitude, first_day, last_day)
+
+    @staticmethod
+    def build_url(latitude: float, longitude: float, day_range: tuple[datetime64, datetime64],
+                  base_url: str = consts.WEATHER_API_URL) -> str:
+        """
+        Builds the url for the days of the range.
+        :return: the url.
+        """
+        first_day, last_day = (classes.Weather.date_string(day) for day in day_range)
+        return classes.Weather.build_url(latitude, longitude, first_day, last_day, None, base_url)
+
+
+_store: ForecastStore = ForecastStore()
+
+
+def get_store() -> ForecastStore:
+    """
+    :return: the forecast store of the process.
+    """
+    return _store
@@ -5,13 +5,11 @@ from functools import lru_cache
 
 # import ADS1x15
 # import RPi.GPIO as GPIO
-import requests
 import toml
-from numpy import float32, float16, uint16
-from pandas import ExcelFile
+from numpy import float32, float16, uint16, ndarray
 
 # from module import GP8403
-from module import classes, debug, own_wrapper as wrap
+from module import classes, consts, debug, forecast_store, load_profile, sessions, own_wrapper as wrap
 
 
 def read_data_from_file(file_path: str) -> dict | None:
@@ -76,7 +74,7 @@ def get_coord(street: str, nr: str, city: str, postalcode: int, country: str) ->
     url = (f"https://nominatim.openstreetmap.org/search?q={street_rep}%20{nr}%20{city_rep}%20{postalcode}%20{country}"
            f"&format=json&addressdetails=1")
     debug.printer(url)
-    req = requests.request("GET", url).json()
+    req = sessions.get_session().get(url, timeout=consts.API_TIMEOUT).json()
     if len(req) > 1:
         for result in req:
             if "address" in result.keys():
@@ -118,10 +116,15 @@ def calc_energy(power: list, interval: float = 0.25, kwh: bool = True, round_: N
     return float(total_energy)
 
 
-def get_weather_data(config_data: dict, start: str | None = None, end: str | None = None, days: int | None = None):
+def get_weather(config_data: dict, start: str | None = None, end: str | None = None,
+                days: int | None = None) -> classes.Weather:
     coord = config_data["coordinates"]
-    w = classes.Weather(coord["latitude"], coord["longitude"], start, end, days)
-    return w.data
+    w = forecast_store.get_store().get_weather(coord["latitude"], coord["longitude"], start, end, days)
+    return w
+
+
+def get_weather_data(config_data: dict, start: str | None = None, end: str | None = None, days: int | None = None):
+    return get_weather(config_data, start, end, days).data
 
 
 def init_sun(config_data: dict, date: str | None = None) -> classes.CalcSunPos:
@@ -130,12 +133,23 @@ def init_sun(config_data: dict, date: str | None = None) -> classes.CalcSunPos:
     return s
 
 
+def init_sun_table(config_data: dict, start_date: str, end_date: str) -> classes.CalcSunPosTable:
+    coord = config_data["coordinates"]
+    s = classes.CalcSunPosTable(coord["latitude"], coord["longitude"], start_date, end_date)
+    return s
+
+
 def get_sun_data(sun_class: classes.CalcSunPos, tme: float) -> (float, float):
     az = sun_class.calc_azimuth(tme)
     el = sun_class.calc_solar_elevation(tme)
     return az, el
 
 
+def get_sun_data_array(sun_class: classes.CalcSunPos, timestamps: ndarray) -> (ndarray, ndarray):
+    az, el = sun_class.calc_sun_position_array(timestamps)
+    return az, el
+
+
 def init_pv(config_data: dict, number: int = 1) -> classes.PVProfit:
     pv = config_data["pv"]
     p = classes.PVProfit(pv[f"module_efficiency{number}"], pv[f"area{number}"], pv[f"tilt_angle{number}"],
@@ -144,6 +158,17 @@ def init_pv(config_data: dict, number: int = 1) -> classes.PVProfit:
     return p
 
 
+def init_pv_plant(config_data: dict) -> classes.PVPlant:
+    """
+    Creates the pv plant with all arrays of the config, the number of arrays is set by the key "alignment".
+    :param config_data: The config data.
+    :return: The pv plant.
+    """
+    alignment: int = max(int(config_data["pv"].get("alignment", 1)), 1)
+    p = classes.PVPlant([init_pv(config_data, number) for number in range(1, alignment + 1)])
+    return p
+
+
 def get_pv_data(pv_class: classes.PVProfit, temp: float, radiation: float, azimuth: float, elevation: float,
                 dni: bool = False) -> float32:
     incidence_angle: float32 = pv_class.calc_incidence_angle(elevation, azimuth)
@@ -155,12 +180,39 @@ def get_pv_data(pv_class: classes.PVProfit, temp: float, radiation: float, azimu
     return power
 
 
+def get_pv_data_array(pv_class: classes.PVProfit, temp: ndarray, radiation: ndarray, azimuth: ndarray,
+                      elevation: ndarray, dni: bool = False) -> ndarray:
+    power: ndarray = pv_class.calc_power_array(radiation, temp, elevation, azimuth, dni)
+    return power
+
+
+def get_pv_plant_data_array(pv_plant: classes.PVPlant, temp: ndarray, radiation: ndarray, azimuth: ndarray,
+                            elevation: ndarray, dni: bool = False, diffuse_radiation: ndarray | None = None,
+                            dni_radiation: ndarray | None = None) -> (ndarray, ndarray):
+    power_arrays: ndarray = pv_plant.calc_array_power(radiation, temp, elevation, azimuth, dni, diffuse_radiation,
+                                                      dni_radiation)
+    return power_arrays.sum(axis=0), power_arrays
+
+
 def init_market(config_data: dict, start_time: int | None = None, end_time: int | None = None) -> classes.MarketData:
     cc: float = config_data["market"].get("consumer_price", 0)
     m = classes.MarketData(cc, start_time, end_time)
     return m
 
 
+def init_period_market(config_data: dict, weather_data: classes.Weather) -> classes.MarketData:
+    """
+    Gets the market prices for the days of the weather, the prices already in the price store are not requested.
+    :param config_data: The config data.
+    :param weather_data: The weather of the period.
+    :return: The market data.
+    """
+    days: ndarray = weather_data.timestamps.astype("datetime64[D]")
+    if not len(days):
+        return classes.MarketData(config_data["market"].get("consumer_price", 0), data=[])
+    return init_market(config_data, f"{days[0]}T00:00", f"{days[-1] + 1}T00:00")
+
+
 @lru_cache(maxsize=100)
 def string_time_to_float(tme: str) -> float16:
     tme_list: list = tme.split(":")
@@ -171,29 +223,30 @@ def save_mor_ev_data(config_data: dict) -> dict:
     power_list: list = []
     write_dict: dict = {}
 
-    weather_data: dict = get_weather_data(config_data)
-    today_data = list(weather_data.keys())[0]
-    weather_data_today = weather_data[today_data]
+    weather: classes.Weather = get_weather(config_data, days=1)
+    today_data: str = weather.dates[0]
+    today: slice = weather.day_slices()[today_data]
 
-    sun_class = init_sun(config_data)
+    sun_class = init_sun(config_data, today_data)
     pv_class = init_pv(config_data)
 
-    for tme, data in weather_data_today.items():
-        tme_float: float = string_time_to_float(tme)
-        azimuth, elevation = get_sun_data(sun_class, tme_float)
-        temp: float = float(data.get("temp", 0))
-        radiation: float = float(data.get("dni_radiation", 0))
-        radiation_ghi: float = float(data.get("ghi_radiation", 0))
-        # power: float = get_pv_data(pv_class, temp, radiation, azimuth, elevation, True)
-        power: float = get_pv_data(pv_class, temp, radiation_ghi, azimuth, elevation, False)
+    azimuth, elevation = get_sun_data_array(sun_class, weather.timestamps[today])
+    temp: ndarray = weather.column("temp")[today]
+    radiation: ndarray = weather.column("dni_radiation")[today]
+    radiation_ghi: ndarray = weather.column("ghi_radiation")[today]
+    cloudcover: ndarray = weather.column("cloudcover")[today]
+    # power: ndarray = get_pv_data_array(pv_class, temp, radiation, azimuth, elevation, True)
+    power_data: ndarray = get_pv_data_array(pv_class, temp, radiation_ghi, azimuth, elevation, False)
 
+    for i, tme in enumerate(weather.times[today].tolist()):
+        power: float = float(power_data[i])
         write_dict.update(
             {
                 tme: {
-                    "dni_radiation": radiation,
-                    "ghi_radiation": radiation_ghi,
-                    "cloudcover": data.get("cloudcover", 0),
-                    "temp": temp,
+                    "dni_radiation": float(radiation[i]),
+                    "ghi_radiation": float(radiation_ghi[i]),
+                    "cloudcover": float(cloudcover[i]),
+                    "temp": float(temp[i]),
                     "power": power
                 }
             }
@@ -304,66 +357,23 @@ def calc_diff_hp_energy(hp: list, cop: list, power: list) -> list:
     return diff
 
 
-def load_load_profile(path: str | None) -> dict:
-    def _create_null_profile() -> dict:
-        empty_dict: dict = {}
-        start = datetime.date(2024, 1, 1)
-        end = datetime.date(2024, 12, 31)
-
-        delta = (end - start).days
-
-        for i in range(0, delta + 1):
-            day = start + datetime.timedelta(days=i)
-            date_ = day.strftime("%d-%m")
-            empty_dict[date_] = {}
-            for hour in range(0, 24):
-                for minute in range(0, 60, 15):
-                    tme = f'{str(hour).zfill(2)}:{str(minute).zfill(2)}'
-                    empty_dict[date_][tme] = 0
-        return empty_dict
-
+def load_load_profile(path: str | None) -> ndarray:
+    """
+    Loads the load profile, the zero profile is returned if there is none or it can not be read.
+    :param path: path of the csv, json, xls or xlsx file
+    :return: read only array of the load in W with one row per day of the year and one column per 15 minutes, nan
+        if the profile has no value.
+    """
     if path is None or 'None' in path:
-        return _create_null_profile()
-
-    data_extension = path[path.rfind('.'):]
-
-    if '.json' in data_extension:
-        print('json File')
-        return _create_null_profile()
-        # sheet = json.load(open(path, "rb+"))
+        return load_profile.NULL_LOAD_PROFILE
 
-    elif '.xlsx' in data_extension or '.xls' in data_extension:
-        try:
-            xl = ExcelFile(path)
-        except FileNotFoundError:
-            print('File Not Found')
-            return _create_null_profile()
-
-        df = xl.parse(xl.sheet_names[0])
-        data_dict = {}
-        date_str = ''
-        for row in df.values:
-            try:
-                date_str, load = row[0], row[1]
-
-                if 'datetime' in str(type(date_str)) or 'timestamp' in str(type(date_str)):
-                    date_time = date_str
-
-                else:
-                    date_time = datetime.datetime.strptime(date_str, "%d.%m.%Y %H:%M:%S")
-
-                date = date_time.date().strftime("%d-%m")
-                time = date_time.time().strftime("%H:%M")
-
-                if date not in data_dict:
-                    data_dict[date] = {}
-                data_dict[date][time] = float(str(load).replace(",", '.'))  # * 1000
-            except Exception as e:
-                print(date_str)
-                print(f'Following error is occurred by loading load_profile: {e}')
-                return _create_null_profile()
-
-        return data_dict
+    try:
+        return load_profile.read_cached(path)
+    except FileNotFoundError:
+        print('File Not Found')
+    except ValueError as e:
+        print(f'Following error is occurred by loading load_profile: {e}')
+    return load_profile.NULL_LOAD_PROFILE
 
 
 @wrap.precision()
@@ -0,0 +1,128 @@
+#  -*- coding: utf-8 -*-
+import json
+import re
+from typing import IO, Iterator
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _Reader:
+    """
+    Reads a json text block by block, only the unread part of the current block is kept.
+    """
+
+    def __init__(self, file: IO[str], block_size: int) -> None:
+        self.file: IO[str] = file
+        self.block_size: int = block_size
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+        self.buffer: str = ""
+        self.pos: int = 0
+        self.eof: bool = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        block: str = self.file.read(size or self.block_size)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        :return: the next character which is no whitespace, empty at the end of the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """
+        Reads one of the characters.
+        :param characters: the allowed characters
+        :return: the read character.
+        """
+        character: str = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r} but got {character!r}")
+        self.pos += 1
+        return character
+
+    def value(self):
+        """
+        Decodes the next value, more blocks are read until it is complete. Every retry reads twice as much as the
+        one before, so a value spanning many blocks is decoded a logarithmic number of times.
+        :return: the value.
+        """
+        self.peek()
+        size: int = self.block_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the block could go on in the next one
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+
+def _keys(reader: _Reader, start: str) -> Iterator:
+    # the caller reads the value of every key before the next one is read
+    end: str = "]" if start == "[" else "}"
+    if reader.peek() == end:
+        reader.pos += 1
+        return
+    index: int = 0
+    while True:
+        key = index
+        if start == "{":
+            key = reader.value()
+            reader.expect(":")
+        yield key
+        index += 1
+        if reader.expect("," + end) == end:
+            return
+
+
+def _skip(reader: _Reader) -> None:
+    # arrays and objects are skipped item by item, so a large value is never decoded at once
+    character: str = reader.peek()
+    if character and character in "[{":
+        reader.pos += 1
+        for _ in _keys(reader, character):
+            _skip(reader)
+    else:
+        reader.value()
+
+
+def _iter_path(reader: _Reader, path: tuple, others: dict | None) -> Iterator[tuple]:
+    for key in _keys(reader, reader.expect("[{")):
+        if not path:
+            yield key, reader.value()
+        elif key == path[0]:
+            yield from _iter_path(reader, path[1:], others)
+        elif others is not None:
+            others[key] = reader.value()
+        else:
+            _skip(reader)
+
+
+def iter_items(file: IO[str], path: tuple = (), others: dict | None = None,
+               block_size: int = 1 << 16) -> Iterator[tuple]:
+    """
+    Reads the items of an array or object of a json file one after another, so only one item is in memory at a time.
+    A single item is decoded as a whole and has to fit into memory.
+    :param file: json file opened in text mode
+    :param path: keys from the top level to the array or object, the top level if it is empty
+    :param others: gets the members beside the path, they are skipped without decoding if it is None
+    :param block_size: number of characters read at once
+    :return: generator of (index, value) for an array and (key, value) for an object.
+    """
+    yield from _iter_path(_Reader(file, block_size), tuple(path), others)
@@ -0,0 +1,316 @@
+#  -*- coding: utf-8 -*-
+import itertools
+import os
+import re
+from collections import Counter
+from typing import Final, Iterator, NamedTuple
+
+import openpyxl
+import xlrd
+from numpy import (asarray, bincount, char, concatenate, cumsum, flatnonzero, float64, full, int64, isnan,
+                   load as np_load, nan, ndarray, save as np_save, unique, where, zeros)
+from pandas import Series, read_csv, to_datetime, to_numeric
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from module import consts, json_stream, own_wrapper as wrap
+
+# the first format which fits is used for every row
+TIME_FORMATS: Final[tuple] = ("ISO8601", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M", "%d-%m-%Y %H:%M")
+# changes if the parsed profile changes, so older caches are not used
+CACHE_VERSION: Final[int] = 2
+
+# day of the year of the first day of every month in a leap year, so every date has its own row
+_MONTH_STARTS: Final[ndarray] = cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+_SLOTS: Final[int] = consts.LOAD_PROFILE_DAYS * consts.SLOTS_PER_DAY
+_SLOT_MINUTES: Final[int] = 24 * 60 // consts.SLOTS_PER_DAY
+# position of the characters of %d.%m.%Y %H:%M:%S in the ISO format %Y-%m-%dT%H:%M:%S
+_DOTTED_TO_ISO: Final[list] = [6, 7, 8, 9, 2, 3, 4, 5, 0, 1, 10, 11, 12, 13, 14, 15, 16, 17, 18]
+
+NULL_LOAD_PROFILE: Final[ndarray] = zeros((consts.LOAD_PROFILE_DAYS, consts.SLOTS_PER_DAY), dtype=float64)
+NULL_LOAD_PROFILE.flags.writeable = False
+
+
+class LoadProfileReport(NamedTuple):
+    rows: int
+    bad_rows: int
+    examples: list
+    interval: int
+
+
+def profile_days(days: ndarray) -> ndarray:
+    """
+    Gets the row of the dates in a load profile, the 29th of february has its own row in every year.
+    :param days: dates as datetime64
+    :return: the rows from 0 to 365.
+    """
+    days = asarray(days, dtype="datetime64[D]")
+    months: ndarray = days.astype("datetime64[M]")
+    return _MONTH_STARTS[months.astype(int64) % 12] + (days - months.astype("datetime64[D]")).astype(int64)
+
+
+def _parse_dotted(values: ndarray) -> ndarray:
+    """
+    Parses %d.%m.%Y %H:%M and %d.%m.%Y %H:%M:%S without strptime, the characters are moved to the ISO order.
+    :param values: times as strings
+    :return: the times as datetime64, NaT if a row has an other format.
+    """
+    lengths: ndarray = char.str_len(values)
+    chars: ndarray = values.astype("U19").view("U1").reshape(len(values), 19)
+    valid: ndarray = (((lengths == 16) | (lengths == 19)) & (chars[:, 2] == ".") & (chars[:, 5] == ".") &
+                      (chars[:, 10] == " ") & (chars[:, 13] == ":"))
+    iso: ndarray = chars[:, _DOTTED_TO_ISO]
+    iso[:, 4] = iso[:, 7] = "-"
+    iso[:, 10] = "T"
+    strings: ndarray = iso.copy().view("U19").ravel()
+    strings[~valid] = "NaT"
+    try:
+        return strings.astype("datetime64[s]")
+    except ValueError:
+        return full(len(values), "NaT", dtype="datetime64[s]")
+
+
+def parse_times(values: Series) -> Series:
+    """
+    Converts the times of the rows, datetimes are kept and strings are parsed with the TIME_FORMATS.
+    :param values: times of the rows
+    :return: the times, NaT if a row could not be parsed.
+    """
+    if is_datetime64_any_dtype(values):
+        return values
+    # most load profiles use the german format, it is parsed without strptime
+    times: Series = Series(_parse_dotted(values.to_numpy(dtype=str)), index=values.index, dtype="datetime64[us]")
+    missing: Series = times.isna()
+    if not missing.any():
+        return times
+    for time_format in TIME_FORMATS:
+        try:
+            parsed: Series = to_datetime(values[missing], format=time_format, errors="coerce")
+        except (TypeError, ValueError):
+            continue
+        if getattr(parsed.dt, "tz", None) is not None:
+            parsed = parsed.dt.tz_localize(None)
+        times[missing] = parsed
+        missing = times.isna()
+        if not missing.any():
+            break
+    return times
+
+
+def parse_loads(values: Series) -> Series:
+    """
+    Converts the loads of the rows, decimal commas are allowed.
+    :param values: loads of the rows
+    :return: the loads in W, nan if a row could not be parsed.
+    """
+    if is_numeric_dtype(values):
+        return values.astype(float64)
+    return to_numeric(values.astype(str).str.strip().str.replace(",", ".", regex=False), errors="coerce")
+
+
+class _Accumulator:
+    """
+    Sums up the loads of every 15 minute slot of the year chunk by chunk, so the memory does not depend on the number
+    of rows.
+    """
+
+    def __init__(self) -> None:
+        self.sums: ndarray = zeros(_SLOTS, dtype=float64)
+        self.counts: ndarray = zeros(_SLOTS, dtype=int64)
+        self.steps: Counter = Counter()
+        self.last: ndarray | None = None
+        self.rows: int = 0
+        self.bad_rows: int = 0
+        self.examples: list = []
+
+    def add(self, first_row: int, times: Series, loads: Series) -> None:
+        """
+        Adds a chunk of rows, rows which can not be parsed are counted, rows before the first valid one are the
+        header.
+        :param first_row: row number of the first row in the file
+        :param times: times of the rows
+        :param loads: loads of the rows
+        :return: None
+        """
+        times, loads = times.reset_index(drop=True), loads.reset_index(drop=True)
+        stamps: Series = parse_times(times)
+        values: Series = parse_loads(loads)
+        bad: ndarray = (stamps.isna() | values.isna()).to_numpy()
+        start: int = 0
+        if self.rows == 0:
+            if bad.all():
+                return
+            start = int(bad.argmin())
+
+        bad, stamps, values = bad[start:], stamps[start:], values[start:]
+        self.rows += len(bad)
+        self.bad_rows += int(bad.sum())
+        for row in flatnonzero(bad)[:max(10 - len(self.examples), 0)].tolist():
+            self.examples.append((first_row + start + row, times[start + row], loads[start + row]))
+
+        good: ndarray = stamps.to_numpy(dtype="datetime64[m]")[~bad]
+        if not len(good):
+            return
+        days: ndarray = good.astype("datetime64[D]")
+        slots: ndarray = (profile_days(days) * consts.SLOTS_PER_DAY +
+                          (good - days).astype(int64) // _SLOT_MINUTES)
+        self.sums += bincount(slots, weights=values.to_numpy(dtype=float64)[~bad], minlength=_SLOTS)
+        self.counts += bincount(slots, minlength=_SLOTS)
+
+        previous: ndarray = good[:1] if self.last is None else self.last
+        steps: ndarray = (good - concatenate((previous, good[:-1]))).astype(int64)
+        step_values, step_counts = unique(steps[steps > 0], return_counts=True)
+        self.steps.update(dict(zip(step_values.tolist(), step_counts.tolist())))
+        self.last = good[-1:]
+
+    def profile(self) -> tuple[ndarray, int]:
+        """
+        Gets the mean load of every slot, a value of a longer interval than 15 minutes is used for the following
+        slots of its interval.
+        :return: the profile and the interval of the rows in minutes.
+        """
+        if not self.counts.any():
+            raise ValueError("no valid rows")
+        interval: int = self.steps.most_common(1)[0][0] if self.steps else _SLOT_MINUTES
+        profile: ndarray = where(self.counts > 0, self.sums / where(self.counts > 0, self.counts, 1), nan)
+
+        for _ in range(1, min(interval // _SLOT_MINUTES, consts.SLOTS_PER_DAY)):
+            empty: ndarray = isnan(profile[1:])
+            profile[1:][empty] = profile[:-1][empty]
+        return profile.reshape(consts.LOAD_PROFILE_DAYS, consts.SLOTS_PER_DAY), interval
+
+
+def _read_csv(path: str, chunksize: int) -> Iterator[tuple]:
+    with open(path, mode="r", encoding="utf-8-sig") as file:
+        lines: list = [line for line in itertools.islice(file, 20) if line.strip()]
+    # the decimal comma is common, so the delimiter which is in the most lines is used and ";" is preferred
+    delimiter: str = max((";", "\t", ","), key=lambda d: sum(d in line for line in lines))
+
+    for chunk in read_csv(path, sep=delimiter, header=None, usecols=[0, 1], dtype=str, chunksize=chunksize,
+                          encoding="utf-8-sig"):
+        yield int(chunk.index[0]) + 1, chunk[0], chunk[1]
+
+
+def _read_xls(path: str, chunksize: int) -> Iterator[tuple]:
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        origin: str = "1904-01-01" if book.datemode else "1899-12-30"
+        for start in range(0, sheet.nrows, chunksize):
+            end: int = min(start + chunksize, sheet.nrows)
+            times: Series = Series(sheet.col_values(0, start, end), dtype=object)
+            dates: ndarray = asarray(sheet.col_types(0, start, end)) == xlrd.XL_CELL_DATE
+            if dates.any():
+                times[dates] = to_datetime(times[dates].astype(float64), unit="D", origin=origin).dt.round("s")
+            loads: Series = Series(sheet.col_values(1, start, end) if sheet.ncols > 1 else [None] * (end - start),
+                                   dtype=object)
+            yield start + 1, times, loads
+    finally:
+        book.release_resources()
+
+
+def _read_xlsx(path: str, chunksize: int) -> Iterator[tuple]:
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = book.worksheets[0].iter_rows(max_col=2, values_only=True)
+        start: int = 1
+        while True:
+            chunk: list = [(tuple(row) + (None, None))[:2] for row in itertools.islice(rows, chunksize)]
+            if not chunk:
+                break
+            times, loads = zip(*chunk)
+            yield start, Series(times, dtype=object), Series(loads, dtype=object)
+            start += len(chunk)
+    finally:
+        book.close()
+
+
+def _json_rows(key, value) -> list:
+    if isinstance(key, str) and isinstance(value, dict):
+        # format of the former load profile {"%d-%m": {"%H:%M": load}}
+        return [(f"{key}-2024 {time}", load) for time, load in value.items()]
+    if isinstance(key, str):
+        return [(key, value)]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [tuple(value + [None, None])[:2]]
+    return [(None, value)]
+
+
+def _read_json(path: str, chunksize: int) -> Iterator[tuple]:
+    with open(path, mode="r", encoding="utf-8") as file:
+        rows: list = []
+        start: int = 1
+        for key, value in json_stream.iter_items(file):
+            rows.extend(_json_rows(key, value))
+            if len(rows) >= chunksize:
+                times, loads = zip(*rows)
+                yield start, Series(times, dtype=object), Series(loads, dtype=object)
+                start += len(rows)
+                rows = []
+        if rows:
+            times, loads = zip(*rows)
+            yield start, Series(times, dtype=object), Series(loads, dtype=object)
+
+
+_READERS: Final[dict] = {".csv": _read_csv, ".xls": _read_xls, ".xlsx": _read_xlsx, ".json": _read_json}
+
+
+def read_load_profile(path: str, chunksize: int = consts.LOAD_PROFILE_CHUNK_SIZE) -> tuple[ndarray, LoadProfileReport]:
+    """
+    Reads a load profile chunk by chunk, the first column holds the time and the second one the load in W. Rows which
+    can not be parsed are skipped and reported, the rows are averaged or repeated to 15 minute slots.
+    :param path: path of the csv, json, xls or xlsx file
+    :param chunksize: number of rows read at once
+    :return: the load with one row per day of the year and one column per 15 minutes, nan if there is no value,
+        and the report of the rows.
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+    if extension not in _READERS:
+        raise ValueError(f"unsupported file {extension}")
+
+    accumulator: _Accumulator = _Accumulator()
+    for first_row, times, loads in _READERS[extension](path, chunksize):
+        accumulator.add(first_row, times, loads)
+    profile, interval = accumulator.profile()
+    return profile, LoadProfileReport(accumulator.rows, accumulator.bad_rows, accumulator.examples, interval)
+
+
+def read_cached(path: str) -> ndarray:
+    """
+    Gets the load profile from the cache folder, the file is read and cached if it changed. The cache is found by
+    the size and modification time of the file, so the file itself is only read if it changed.
+    :param path: path of the csv, json, xls or xlsx file
+    :return: the load profile, memory mapped if it is cached.
+    """
+    stat = os.stat(path)
+    key: str = wrap.digest(os.path.abspath(path), stat.st_size, stat.st_mtime_ns, CACHE_VERSION,
+                           (consts.LOAD_PROFILE_DAYS, consts.SLOTS_PER_DAY))
+    name: str = os.path.basename(path).rsplit(".", 1)[0]
+    cache_file: str = os.path.join(consts.LOAD_PROFILE_CACHE_PATH, f"{name}-{key}.npy")
+
+    try:
+        return np_load(cache_file, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    profile, report = read_load_profile(path)
+    if report.bad_rows:
+        print(f"{report.bad_rows} of {report.rows} rows of {os.path.basename(path)} are skipped")
+        for row, time, load in report.examples:
+            print(f"  row {row}: {time} {load}")
+
+    os.makedirs(consts.LOAD_PROFILE_CACHE_PATH, exist_ok=True)
+    # older versions of the same file are replaced, files of other processes which are not finished are kept
+    old_files: re.Pattern = re.compile(rf"{re.escape(name)}-[0-9a-f]{{32}}\.npy")
+    for old_file in os.listdir(consts.LOAD_PROFILE_CACHE_PATH):
+        if old_files.fullmatch(old_file) and old_file != os.path.basename(cache_file):
+            try:
+                os.remove(os.path.join(consts.LOAD_PROFILE_CACHE_PATH, old_file))
+            except OSError:
+                pass
+    temp_file: str = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as file:
+        np_save(file, profile)
+    os.replace(temp_file, cache_file)
+    return profile
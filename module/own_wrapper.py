@@ -1,7 +1,12 @@
 #  -*- coding: utf-8 -*-
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
 from functools import wraps
 
-from numpy import float32, uint16, round as np_round
+from numpy import float32, uint16, round as np_round, ndarray
 
 from frozendict import frozendict
 
@@ -46,3 +51,81 @@ def formatter(func):
                    for arg in args)
         return func(*np_args, **kwargs)
     return wrapped
+
+
+def _update_digest(hasher, obj) -> None:
+    hasher.update(type(obj).__name__.encode())
+    if hasattr(obj, "_digest"):
+        digest_ = obj._digest
+        hasher.update(digest_() if callable(digest_) else digest_)
+    elif isinstance(obj, Mapping):
+        for key in sorted(obj, key=str):
+            _update_digest(hasher, key)
+            _update_digest(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(str(len(obj)).encode())
+        for value in obj:
+            _update_digest(hasher, value)
+    elif isinstance(obj, ndarray):
+        hasher.update(str(obj.shape).encode())
+        hasher.update(obj.tobytes())
+    else:
+        hasher.update(repr(obj).encode())
+    hasher.update(b";")
+
+
+def digest(*parts) -> str:
+    """
+    Builds a stable key from the parts, objects with a _digest like Weather and MarketData use it instead of their
+    data.
+    :param parts: dicts, lists, arrays, objects with a _digest or values with a stable repr
+    :return: hex digest.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_digest(hasher, part)
+    return hasher.hexdigest()
+
+
+def result_cache(maxsize: int = 8, ttl: float | None = None, key=None):
+    """
+    Caches the results of a function in memory by a digest of its arguments, the results are lost on a restart.
+    :param maxsize: number of results, the least recently used one is removed
+    :param ttl: seconds a result is valid, None for no limit
+    :param key: function which gets the arguments and returns the key, digest of all arguments if None
+    :return: the decorator.
+    """
+    def _result_cache(func):
+        entries: OrderedDict = OrderedDict()
+        lock: threading.Lock = threading.Lock()
+
+        def _valid(entry: tuple | None, now: float) -> bool:
+            return entry is not None and (ttl is None or now - entry[0] < ttl)
+
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            cache_key: str = key(*args, **kwargs) if key is not None else digest(args, kwargs)
+            now: float = time.time()
+
+            with lock:
+                entry: tuple | None = entries.get(cache_key)
+                if _valid(entry, now):
+                    entries.move_to_end(cache_key)
+                    return entry[1]
+
+            entry = (now, func(*args, **kwargs))
+
+            with lock:
+                entries[cache_key] = entry
+                entries.move_to_end(cache_key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return entry[1]
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        wrapped.cache_clear = cache_clear
+        return wrapped
+    return _result_cache
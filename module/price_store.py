@@ -0,0 +1,110 @@
+#  -*- coding: utf-8 -*-
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+from numpy import array, concatenate, int64, maximum, ndarray
+
+from module import consts
+
+HOUR_MS: int = 3_600_000
+
+
+class PriceStore:
+    """
+    Append only store of the aWATTar market prices in a SQLite file, keyed by the start timestamp. Only the
+    intervals without stored prices have to be requested from the api.
+    """
+
+    def __init__(self, path: str = consts.PRICE_STORE_PATH) -> None:
+        """
+        Initialize the class
+        :param path: path of the SQLite file
+        :return: none
+        """
+        self.path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS prices ("
+                               "start_timestamp INTEGER PRIMARY KEY, "
+                               "end_timestamp INTEGER NOT NULL, "
+                               "marketprice REAL NOT NULL, "
+                               "unit TEXT NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS prices_end ON prices (end_timestamp)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def end_of_range(start: int, end: int | None = None) -> int:
+        """
+        Without end the api returns 24 hours from the start.
+        :param start: start in milliseconds
+        :param end: end in milliseconds
+        :return: the end in milliseconds.
+        """
+        return int(end) if end else int(start) + 24 * HOUR_MS
+
+    def missing_ranges(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Gets the intervals between start and end without stored prices.
+        :param start: start in milliseconds
+        :param end: end in milliseconds
+        :return: list of (start, end) in milliseconds.
+        """
+        with closing(self._connect()) as connection:
+            rows: list = connection.execute("SELECT start_timestamp, end_timestamp FROM prices "
+                                            "WHERE end_timestamp > ? AND start_timestamp < ? "
+                                            "ORDER BY start_timestamp", (int(start), int(end))).fetchall()
+        intervals: ndarray = array(rows, dtype=int64).reshape(-1, 2)
+
+        # a gap is between the end of everything before and the start of the next price
+        covered_until: ndarray = maximum.accumulate(concatenate(([int(start)], intervals[:, 1])))
+        next_start: ndarray = concatenate((intervals[:, 0], [int(end)]))
+        gap: ndarray = next_start > covered_until
+        return [(int(s), int(e)) for s, e in zip(covered_until[gap], next_start[gap])]
+
+    def insert(self, data: list[dict] | None) -> int:
+        """
+        Appends the prices of an api response, already stored prices are not changed.
+        :param data: the "data" list of the api response
+        :return: number of new prices.
+        """
+        rows: list = [(int(price["start_timestamp"]), int(price["end_timestamp"]), float(price["marketprice"]),
+                       price.get("unit", "Eur/MWh")) for price in data or []]
+        with self._lock, closing(self._connect()) as connection, connection:
+            before: int = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO prices VALUES (?, ?, ?, ?)", rows)
+            return connection.total_changes - before
+
+    def query(self, start: int, end: int) -> list[dict]:
+        """
+        Gets the stored prices between start and end in the format of the api.
+        :param start: start in milliseconds
+        :param end: end in milliseconds
+        :return: list of the prices.
+        """
+        with closing(self._connect()) as connection:
+            rows: list = connection.execute("SELECT start_timestamp, end_timestamp, marketprice, unit FROM prices "
+                                            "WHERE end_timestamp > ? AND start_timestamp < ? "
+                                            "ORDER BY start_timestamp", (int(start), int(end))).fetchall()
+        return [{"start_timestamp": s, "end_timestamp": e, "marketprice": price, "unit": unit}
+                for s, e, price, unit in rows]
+
+
+_store: PriceStore | None = None
+_store_lock: threading.Lock = threading.Lock()
+
+
+def get_store() -> PriceStore:
+    """
+    :return: the price store of the process, it is created on the first call.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore()
+        return _store
@@ -0,0 +1,65 @@
+#  -*- coding: utf-8 -*-
+import datetime
+import threading
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from module import consts
+
+_lock: threading.Lock = threading.Lock()
+_session: requests_cache.CachedSession | None = None
+
+
+def _create_session() -> requests_cache.CachedSession:
+    """
+    Creates the cached session with keep alive connection pools for the external apis.
+    :return: the session.
+    """
+    session = requests_cache.CachedSession(consts.HTTP_CACHE_PATH,
+                                           expire_after=datetime.timedelta(hours=1),
+                                           urls_expire_after=consts.HTTP_CACHE_EXPIRE)
+    return mount_retries(session)
+
+
+def mount_retries(session: requests.Session, retries: int = consts.API_RETRIES) -> requests.Session:
+    """
+    Mounts keep alive connection pools which repeat failed connections and server errors with a growing delay. This
+    is the only retry layer of the requests to the external apis, timeouts are not repeated.
+    :param session: the session
+    :param retries: number of repeats after the first attempt
+    :return: the session.
+    """
+    adapter = HTTPAdapter(pool_connections=consts.HTTP_POOL_CONNECTIONS, pool_maxsize=consts.HTTP_POOL_MAXSIZE,
+                          max_retries=Retry(total=retries, connect=retries, read=False, status=retries,
+                                            status_forcelist=(500, 502, 503, 504), allowed_methods=("GET",),
+                                            backoff_factor=0.3, raise_on_status=False))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests_cache.CachedSession:
+    """
+    Gets the session which is shared by all requests to the external apis, it is created on the first call.
+    :return: the session.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def close_session() -> None:
+    """
+    Closes the shared session, the next call of get_session creates a new one.
+    :return: None
+    """
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
@@ -62,6 +62,8 @@ def write_data_to_config(config_data: dict, data: dict) -> dict | int:
                 else:
                     pv[key] = 0.0
 
+        pv['diffuse_model'] = data.get('diffuse_model') == '1'
+
         for key in converter:
             converter[key] = float(data.get(f'converter_{key}', 0))
 
@@ -0,0 +1,116 @@
+#  -*- coding: utf-8 -*-
+import datetime
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import toml
+
+from module import consts
+
+
+class SocJournal:
+    """
+    Journal of the state of charge at the end of a day in a SQLite file, keyed by the ISO date. Writing a day and
+    reading the latest entry do not depend on the length of the history.
+    """
+
+    def __init__(self, path: str = consts.SOC_JOURNAL_PATH, import_path: str | None = None) -> None:
+        """
+        Initialize the class
+        :param path: path of the SQLite file
+        :param import_path: toml file with the old entries, imported if the journal is empty
+        :return: none
+        """
+        self.path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS soc ("
+                               "date TEXT PRIMARY KEY, "
+                               "state_of_charge REAL NOT NULL)")
+            empty: bool = connection.execute("SELECT 1 FROM soc LIMIT 1").fetchone() is None
+        if empty and import_path is not None and os.path.isfile(import_path):
+            self.import_toml(import_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def iso_date(date: str | datetime.date) -> str:
+        """
+        :param date: date, Format %d-%m-%Y if it is a string
+        :return: the date in the format %Y-%m-%d.
+        """
+        if isinstance(date, str):
+            date = datetime.datetime.strptime(date, "%d-%m-%Y").date()
+        return date.isoformat()
+
+    def record(self, date: str | datetime.date, state_of_charge: float) -> None:
+        """
+        Writes the state of charge of a day, an existing entry of the day is replaced.
+        :param date: date, Format %d-%m-%Y if it is a string
+        :param state_of_charge: state of charge in %
+        :return: None
+        """
+        self.record_many({date: state_of_charge})
+
+    def record_many(self, entries: dict) -> None:
+        """
+        Writes the state of charge of several days.
+        :param entries: {date: state of charge}
+        :return: None
+        """
+        rows: list = [(self.iso_date(date), float(soc)) for date, soc in entries.items()]
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.executemany("INSERT OR REPLACE INTO soc VALUES (?, ?)", rows)
+
+    def latest_before(self, date: str | datetime.date) -> tuple[datetime.date, float] | None:
+        """
+        Gets the last entry before the date.
+        :param date: date, Format %d-%m-%Y if it is a string
+        :return: date and state of charge, None if there is no entry.
+        """
+        with closing(self._connect()) as connection:
+            row: tuple | None = connection.execute("SELECT date, state_of_charge FROM soc WHERE date < ? "
+                                                   "ORDER BY date DESC LIMIT 1", (self.iso_date(date),)).fetchone()
+        if row is None:
+            return None
+        return datetime.date.fromisoformat(row[0]), row[1]
+
+    def import_toml(self, path: str) -> int:
+        """
+        Imports the entries of the old data.toml.
+        :param path: path of the toml file
+        :return: number of imported days.
+        """
+        with open(path, mode='r') as file:
+            data: dict = toml.load(file)
+
+        entries: dict = {}
+        for date, value in data.items():
+            if not isinstance(value, dict) or "state_of_charge" not in value:
+                continue
+            try:
+                entries[datetime.datetime.strptime(date, "%d-%m-%Y").date()] = value["state_of_charge"]
+            except ValueError:
+                print(f"Invalid date in {path}: {date}")
+        self.record_many(entries)
+        return len(entries)
+
+
+_journal: SocJournal | None = None
+_journal_lock: threading.Lock = threading.Lock()
+
+
+def get_journal() -> SocJournal:
+    """
+    :return: the journal of the process, it is created on the first call and imports the data.toml once.
+    """
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = SocJournal(import_path=consts.DATA_FILE_PATH)
+        return _journal
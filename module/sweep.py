@@ -0,0 +1,167 @@
+#  -*- coding: utf-8 -*-
+import argparse
+import copy
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from numpy import ndarray
+from pandas import DataFrame
+
+from config import ConfigManager
+from module import analytics, classes, consts, functions, upload
+
+SECTIONS: tuple = ("pv", "battery", "converter")
+
+_shared: dict = {}
+
+
+def parse_grid(items: list[str]) -> dict:
+    """
+    Parses grid arguments of the format section.key=value1,value2.
+    :param items: list of the arguments
+    :return: dict in the format {"section.key": [values]}.
+    """
+    grid: dict = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"No values for {key}, use section.key=value1,value2")
+        grid[key.strip()] = [_parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def _parse_value(value: str) -> int | float | str:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            continue
+    return value.strip()
+
+
+def scenarios(grid: dict) -> list[dict]:
+    """
+    Creates every combination of the grid.
+    :param grid: dict in the format {"section.key": [values]}
+    :return: list of dicts in the format {"section.key": value}.
+    """
+    for key in grid:
+        section, _, name = key.partition(".")
+        if section not in SECTIONS or not name:
+            raise ValueError(f"{key} is not in the sections {', '.join(SECTIONS)}")
+    return [dict(zip(grid.keys(), values)) for values in itertools.product(*grid.values())]
+
+
+def scenario_config(config_data: dict, scenario: dict) -> dict:
+    """
+    Applies a scenario to a copy of the config.
+    :param config_data: config
+    :param scenario: dict in the format {"section.key": value}
+    :return: the changed config.
+    """
+    config: dict = dict(config_data)
+    for section in SECTIONS:
+        config[section] = copy.deepcopy(config_data.get(section, {}))
+    for key, value in scenario.items():
+        section, _, name = key.partition(".")
+        config[section][name] = value
+    return config
+
+
+def _init_worker(config_data: dict, weather_data: classes.Weather, market_data: classes.MarketData,
+                 load_profile_data: ndarray, heating: tuple, init_battery_charge: float) -> None:
+    # the inputs are sent once to every process and only read
+    _shared.update(config=config_data, weather=weather_data, market=market_data, load_profile=load_profile_data,
+                   heating=heating, init_battery_charge=init_battery_charge)
+
+
+def _run(scenario: dict) -> dict:
+    summary: dict = analytics.simulate_period(scenario_config(_shared["config"], scenario), _shared["weather"],
+                                              init_battery_charge=_shared["init_battery_charge"],
+                                              market_data=_shared["market"],
+                                              load_profile_data=_shared["load_profile"], heating=_shared["heating"])
+    return {**scenario,
+            "energy": round(summary["pv_energy"] / 1_000, 2),
+            "self_consumption": round(summary["self_consumption"] * 100, 1),
+            "grid": round(summary["grid"] / 1_000, 2),
+            "feed_in": round(summary["feed_in"] / 1_000, 2),
+            "full_cycles": round(summary["full_cycles"], 1),
+            "cost": round(summary["cost"] / 100, 2),
+            "priced_days": summary["priced_days"]}
+
+
+def run_sweep(config_data: dict, weather_data: classes.Weather, grid: dict,
+              market_data: classes.MarketData | None = None, init_battery_charge: float = 0,
+              workers: int | None = None) -> DataFrame:
+    """
+    Simulates every combination of the grid, the combinations are distributed over the cores.
+    :param config_data: config
+    :param weather_data: weather of the period
+    :param grid: dict in the format {"section.key": [values]}
+    :param market_data: market prices, taken from the price store for the period of the weather if None
+    :param init_battery_charge: state of charge at the start in %
+    :param workers: number of processes, all cores if None
+    :return: table ranked by the cost, energies in kWh, self consumption in % and cost in €, the cost only contains
+             the priced days.
+    """
+    combinations: list = scenarios(grid)
+
+    # everything which does not depend on the swept sections is calculated once
+    market_data = market_data if market_data is not None else functions.init_period_market(config_data, weather_data)
+    load_profile = config_data.get("load_profile")
+    load_profile_data: ndarray = functions.load_load_profile(f'{consts.LOAD_PROFILE_FOLDER}/{load_profile.get("name")}')
+    heating: tuple = analytics.heating_power(config_data, weather_data)
+
+    # the sessions can not be sent to other processes
+    weather_data, market_data = copy.copy(weather_data), copy.copy(market_data)
+    weather_data.session = market_data.session = None
+
+    init_args: tuple = (config_data, weather_data, market_data, load_profile_data, heating, init_battery_charge)
+    workers = min(workers or os.cpu_count() or 1, len(combinations))
+    if workers <= 1:
+        _init_worker(*init_args)
+        rows: list = [_run(scenario) for scenario in combinations]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as executor:
+            rows = list(executor.map(_run, combinations, chunksize=max(len(combinations) // (workers * 4), 1)))
+
+    table: DataFrame = DataFrame(rows).sort_values(["cost", "self_consumption"], ascending=[True, False])
+    table.index = range(1, len(table) + 1)
+    return table
+
+
+def main(args: list[str] | None = None) -> DataFrame:
+    parser = argparse.ArgumentParser(description="Parameter sweep over the pv, battery and converter config",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="python -m module.sweep --grid battery.capacity=1,2.5,5 "
+                                            "--grid converter.max_power=600,800 --days 14\n"
+                                            "python -m module.sweep --grid battery.capacity=1,2.5,5 "
+                                            "--pvgis uploads/Timeseries_2020.json")
+    parser.add_argument("--grid", action="append", required=True, help="section.key=value1,value2")
+    parser.add_argument("--config", default="config_test.toml", help="config file in the config folder")
+    parser.add_argument("--start", help="first day, Format %%d-%%m-%%Y")
+    parser.add_argument("--end", help="last day, Format %%d-%%m-%%Y")
+    parser.add_argument("--days", type=int, default=14, help="forecast days if no start and end is given")
+    parser.add_argument("--pvgis", help="PVGIS hourly export with radiation components, used instead of the forecast")
+    parser.add_argument("--soc", type=float, default=0, help="state of charge at the start in %%")
+    parser.add_argument("--workers", type=int, help="number of processes")
+    parser.add_argument("--csv", help="path to save the table")
+    arguments = parser.parse_args(args)
+
+    config_data: dict = ConfigManager(arguments.config).config_data
+    if arguments.pvgis:
+        weather_data = upload.read_weather(arguments.pvgis)
+    else:
+        weather_data = functions.get_weather(config_data, arguments.start, arguments.end, arguments.days)
+
+    table: DataFrame = run_sweep(config_data, weather_data, parse_grid(arguments.grid),
+                                 init_battery_charge=arguments.soc, workers=arguments.workers)
+    print(table.to_string())
+    if arguments.csv:
+        table.to_csv(arguments.csv)
+    return table
+
+
+if __name__ == "__main__":
+    main()
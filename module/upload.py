@@ -1,27 +1,136 @@
 #  -*- coding: utf-8 -*-
 
-import datetime
-import json
 import os
+from typing import Final
 
 import matplotlib.pyplot as plt
-from numpy import linspace
-
-from module import consts, functions
+from numpy import (linspace, arange, argmax, asarray, absolute, concatenate, deg2rad, empty, full, float32, float64,
+                   int64, nan, nan_to_num, ndarray, round as np_round, sin)
+from pandas import DataFrame, DatetimeIndex
+
+from module import classes, consts, functions, json_stream
+
+_HOURS_PER_YEAR: Final[int] = 8784
+# the characters of %Y%m%d:%H%M in the order of the ISO format and of the labels %d-%m-%Y - %H:%M
+_PVGIS_TO_ISO: Final[list] = [0, 1, 2, 3, 8, 4, 5, 8, 6, 7, 8, 9, 10, 8, 11, 12]
+_PVGIS_TO_LABEL: Final[list] = [6, 7, 8, 4, 5, 8, 0, 1, 2, 3, 8, 8, 8, 9, 10, 8, 11, 12]
+
+
+def _read_hourly(path: str, keys: tuple = ("Gb(i)",)) -> tuple[dict, dict, ndarray, dict]:
+    """
+    Streams the hourly records of a PVGIS export into typed arrays, no record is kept as dict.
+    :param path: path of the json export
+    :param keys: keys of the records to read, missing values are 0
+    :return: the inputs, the first record, the times as bytes of the format %Y%m%d:%H%M and the values of the keys
+             as float32.
+    """
+    others: dict = {}
+    first: dict = {}
+    times: ndarray = empty(0, dtype="S13")
+    columns: dict = {key: empty(0, dtype=float32) for key in keys}
+    count: int = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for index, record in json_stream.iter_items(file, ("outputs", "hourly"), others):
+            if index == 0:
+                first = record
+                if "Gb(i)" not in first:
+                    break
+                # PVGIS writes the inputs first, so the number of hours is known before the records
+                meteo_data: dict = others.get("inputs", {}).get("meteo_data", {})
+                try:
+                    years: int = int(meteo_data["year_max"]) - int(meteo_data["year_min"]) + 1
+                except (KeyError, TypeError, ValueError):
+                    years = 1
+                times = empty(max(years, 1) * _HOURS_PER_YEAR, dtype="S13")
+                columns = {key: empty(len(times), dtype=float32) for key in keys}
+            elif index == len(times):
+                times = concatenate((times, empty(index, dtype="S13")))
+                columns = {key: concatenate((values, empty(index, dtype=float32))) for key, values in columns.items()}
+            times[index] = record["time"]
+            for key, values in columns.items():
+                values[index] = record.get(key, 0)
+            count = index + 1
+    return others.get("inputs", {}), first, times[:count], {key: values[:count] for key, values in columns.items()}
+
+
+def _reorder(times: ndarray, order: list) -> ndarray:
+    chars: ndarray = times.view("S1").reshape(len(times), 13)[:, order]
+    return chars.copy().view(f"S{len(order)}").ravel()
+
+
+def _timestamps(times: ndarray) -> ndarray:
+    iso: ndarray = _reorder(times, _PVGIS_TO_ISO)
+    iso.view("S1").reshape(len(iso), 16)[:, [4, 7, 10]] = [b"-", b"-", b"T"]
+    return iso.astype("datetime64[m]")
+
+
+def _horizontal_direct(gb: ndarray, pv_alignment: dict, sun_azimuth: ndarray, sun_elevation: ndarray) -> ndarray:
+    """
+    Projects the direct radiation of the export plane to the horizontal plane.
+    :param gb: Gb(i) in W/m²
+    :param pv_alignment: the fixed mounting system of the export
+    :param sun_azimuth: azimuth of the sun in degrees
+    :param sun_elevation: solar elevation in degrees
+    :return: the direct horizontal radiation in W/m², 0 if the sun is below the horizon.
+    """
+    slope: float = pv_alignment["slope"]["value"]
+    azimuth: float = pv_alignment["azimuth"]["value"]
+    if slope != 0:
+        # PVGIS counts the azimuth of the plane from the south, adjust_for_new_angle_array from the north
+        gb = classes.CalcSunPos.adjust_for_new_angle_array(gb, slope, azimuth + 180, 0, 0, sun_azimuth, sun_elevation)
+    return absolute(nan_to_num(gb, nan=0, posinf=0, neginf=0)) * (asarray(sun_elevation) > 0)
+
+
+def read_weather(path: str) -> classes.Weather:
+    """
+    Creates the weather of a whole PVGIS export, for example to simulate a year with analytics.simulate_period.
+    The hourly values are used for the four 15 minute steps of their hour. The direct radiation of the export
+    plane is projected to the horizontal plane, the diffuse radiation of the plane is taken as the diffuse
+    horizontal radiation.
+    :param path: path of the json export with the radiation components
+    :return: the Weather object, without cloudcover.
+    """
+    inputs, first, times, columns = _read_hourly(path, ("Gb(i)", "Gd(i)", "T2m"))
+    if "Gb(i)" not in first or "Gd(i)" not in first:
+        raise ValueError(f"{path} has no radiation components Gb(i) and Gd(i)")
+
+    location: dict = inputs["location"]
+    pv_alignment: dict = inputs["mounting_system"]["fixed"]
+    timestamps: ndarray = _timestamps(times)
+    days: ndarray = timestamps.astype("datetime64[D]")
+    sun_table = classes.CalcSunPosTable(location["latitude"], location["longitude"],
+                                        classes.Weather.date_string(days[0]), classes.Weather.date_string(days[-1]))
+    sun_azimuth, sun_elevation = sun_table.calc_sun_position_array(timestamps)
+
+    direct: ndarray = _horizontal_direct(columns["Gb(i)"], pv_alignment, sun_azimuth, sun_elevation)
+    sin_elevation: ndarray = sin(deg2rad(sun_elevation)).clip(0.087)
+
+    # PVGIS gives the values in the middle of the hour
+    slots: ndarray = (timestamps.astype("datetime64[h]")[:, None] + arange(0, 60, 15).astype("timedelta64[m]")).ravel()
+    series: DataFrame = DataFrame({"temp": columns["T2m"].repeat(4), "cloudcover": nan,
+                                   "direct_radiation": direct.repeat(4),
+                                   "dni_radiation": (direct / sin_elevation).repeat(4),
+                                   "ghi_radiation": (direct + columns["Gd(i)"]).repeat(4)},
+                                  index=DatetimeIndex(slots.astype("datetime64[ns]")), dtype=float64)
+    return classes.Weather.from_series(location["latitude"], location["longitude"], series)
 
 
 def data_analyzer(config_data: dict, path: None | str = None):
     if path is None:
         path = rf"./uploads/{os.listdir('./uploads')[0]}"
 
-    data = json.load(open(path, "rb+"))
+    inputs, first, times, columns = _read_hourly(path, ("Gb(i)", "Gd(i)"))
+    radiation_data: ndarray = columns["Gb(i)"]
+
+    if "Gb(i)" not in first:
+        print(first)
+        return -1
 
     config_pv: dict = config_data["pv"]
 
-    location: dict = data["inputs"]["location"]
-    meteo_data: dict = data["inputs"]["meteo_data"]
-    pv_alignment: dict = data["inputs"]["mounting_system"]["fixed"]
-    datas: dict = data["outputs"]["hourly"]
+    location: dict = inputs["location"]
+    meteo_data: dict = inputs["meteo_data"]
+    pv_alignment: dict = inputs["mounting_system"]["fixed"]
 
     lat: float = location["latitude"]
     lon: float = location["longitude"]
@@ -35,97 +144,56 @@ def data_analyzer(config_data: dict, path: None | str = None):
     year_min: str = meteo_data.get("year_min", "0")
     year_max: str = meteo_data.get("year_max", "0")
 
-    power_data: list = []
-    date_time_data: list = []
-
     pv_class = functions.init_pv(config_data)
 
-    if "Gb(i)" not in datas[0]:
-        print(datas[0])
-        return -1
-
-    if slope == 0 and azimuth == 0:
-        for data in datas:
-            date: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y")
-            tme: float = float(datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%H.%M"))
-
-            sun_class = functions.init_sun(config_data, date)
-            azimuth, elevation = functions.get_sun_data(sun_class, tme)
-
-            temp: float = 17
-            radiation: float = data.get("Gb(i)", 0)
-
-            power: float = functions.get_pv_data(pv_class, temp, radiation, azimuth, elevation)
-
-            date_time: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y - %H:%M")
-
-            power_data.append(round(power, 2))
-            date_time_data.append(date_time)
-
-    elif slope == config_pv["tilt_angle1"] and azimuth == config_pv["exposure_angle1"]:
-        for data in datas:
-            date: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y")
-            tme: float = float(datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%H.%M"))
-
-            sun_class = functions.init_sun(config_data, date)
-
-            temp: float = 17
-            radiation: float = data.get("Gb(i)", 0)
-
-            adj_data: float = sun_class.adjust_for_new_angle(radiation, slope, azimuth, config_pv["tilt_angle"],
-                                                             config_pv["exposure_angle"], tme)
-
-            azimuth, elevation = functions.get_sun_data(sun_class, tme)
-
-            power: float = functions.get_pv_data(pv_class, temp, abs(adj_data), azimuth, elevation)
-
-            """incidence: float = pv.calc_incidence_angle(elevation, azimuth)
-            eff: float = pv.calc_temp_dependency(20, abs(adj_data))
-            power: float = pv.calc_power(abs(adj_data), incidence, elevation, eff)"""
-
-            date_time: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y - %H:%M")
-
-            power_data.append(round(power, 2))
-            date_time_data.append(date_time)
-
+    timestamps: ndarray = _timestamps(times)
+    labels: ndarray = _reorder(times, _PVGIS_TO_LABEL)
+    labels.view("S1").reshape(len(labels), 18)[:, [2, 5, 10, 11, 12]] = [b"-", b"-", b" ", b"-", b" "]
+    date_time_data: list = labels.astype(str).tolist()
+
+    days: ndarray = timestamps.astype("datetime64[D]")
+    sun_table = functions.init_sun_table(config_data, classes.Weather.date_string(days[0]),
+                                         classes.Weather.date_string(days[-1]))
+    sun_azimuth_data, sun_elevation_data = functions.get_sun_data_array(sun_table, timestamps)
+
+    temp: ndarray = full(len(radiation_data), 17, dtype=float32)
+    if config_pv.get("diffuse_model", False) and "Gd(i)" in first:
+        # the direct part is taken from the horizontal plane, the diffuse part is added with the Perez model
+        direct: ndarray = _horizontal_direct(radiation_data, pv_alignment, sun_azimuth_data, sun_elevation_data)
+        pv_power, _ = functions.get_pv_plant_data_array(
+            classes.PVPlant([pv_class]), temp, direct, sun_azimuth_data, sun_elevation_data,
+            diffuse_radiation=columns["Gd(i)"], dni_radiation=direct / sin(deg2rad(sun_elevation_data)).clip(0.087))
     else:
-        for data in datas:
-            date: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y")
-            tme: float = float(datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%H.%M"))
-
-            temp: float = 17
-            radiation: float = data.get("Gb(i)", 0)
-
-            sun_class = functions.init_sun(config_data, date)
-
-            adj_data: float = sun_class.adjust_for_new_angle(radiation, slope, azimuth, config_pv["tilt_angle1"],
-                                                             config_pv["exposure_angle1"], tme)
-
-            azimuth, elevation = functions.get_sun_data(sun_class, tme)
-
-            """incidence: float = pv.calc_incidence_angle(elevation, azimuth)
-            eff: float = pv.calc_temp_dependency(20, abs(adj_data))
-
-            power: float = pv.calc_power(abs(adj_data), incidence, elevation, eff)"""
-
-            power: float = functions.get_pv_data(pv_class, temp, abs(adj_data), azimuth, elevation)
-
-            date_time: str = datetime.datetime.strptime(data["time"], "%Y%m%d:%H%M").strftime("%d-%m-%Y - %H:%M")
-
-            power_data.append(round(power, 2))
-            date_time_data.append(date_time)
-
-    max_energy: float = max(power_data)
-    time_max_energy: str = date_time_data[power_data.index(max_energy)]
+        if slope != 0 or azimuth != 0:
+            # the radiation of the tilted plane is projected to the first pv array
+            adj_data: ndarray = classes.CalcSunPos.adjust_for_new_angle_array(
+                radiation_data, slope, azimuth, config_pv["tilt_angle1"], config_pv["exposure_angle1"],
+                sun_azimuth_data, sun_elevation_data)
+            radiation_data = absolute(nan_to_num(adj_data, nan=0, posinf=0, neginf=0))
+        pv_power: ndarray = functions.get_pv_data_array(pv_class, temp, radiation_data,
+                                                        asarray(sun_azimuth_data, dtype=float32),
+                                                        asarray(sun_elevation_data, dtype=float32))
+
+    # rounded as float64, float32 values would print as 0.10999999940395355
+    power: ndarray = np_round(pv_power.astype(float64), 2)
+    power_data: list = power.tolist()
+
+    max_index: int = int(argmax(power))
+    max_energy: float = power_data[max_index]
+    time_max_energy: str = date_time_data[max_index]
     average_energy: float = round(functions.calc_energy(power_data, 1, True) / (float(year_max) + 1 - float(year_min)), 2)
+
+    # the x axis is numeric, a category for every hour is too slow for years of data
+    ticks: list = linspace(0, len(date_time_data) - 1, 100).astype(int64).tolist()
     plt.clf()
     plt.figure(figsize=(20, 6))
     plt.grid(True)
-    plt.step(date_time_data, power_data, '-', linewidth=0.5, alpha=0.5)
-    plt.xticks(linspace(0, len(date_time_data), 100), rotation=90, ha='right', fontsize=8)
+    plt.step(arange(len(power_data)), power_data, '-', linewidth=0.5, alpha=0.5)
+    plt.xticks(ticks, [date_time_data[tick] for tick in ticks], rotation=90, ha='right', fontsize=8)
     plt.tight_layout()
     plt.margins(0.01)
     plt.savefig(f"{consts.DOWNLOADS_FILE_PATH}plot_uploaded_data.png", dpi=300)
+    plt.close()
 
     return (lat, lon, ele, rad_database, meteo_database, year_min, year_max, power_data, date_time_data,
             max_energy, time_max_energy, average_energy)
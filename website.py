@@ -4,7 +4,6 @@ import datetime
 import json
 import os
 
-import toml
 from flask import Flask, render_template, request, send_from_directory, redirect, flash, jsonify
 from flask_apscheduler import APScheduler
 from werkzeug.utils import secure_filename
@@ -14,8 +13,10 @@ from data import EnergyManager
 from module import analytics as analytics_module
 from module import consts, debug
 from module import download as download_module
+from module import fetch
 from module import functions as fc
 from module import set_vals
+from module import soc_journal
 from module import upload as upload_module
 
 app = Flask(__name__)
@@ -57,22 +58,18 @@ def dashboard():
 @app.route('/analytics')
 def analytics():
     config_data = config_manager.config_data
-    weather_data = fc.get_weather_data(config_data, days=14)
+    weather_data, market_data = fetch.get_weather_and_market(config_data, days=14)
 
-    file = open('./data/data.toml', mode='r')
-    analytics_data = toml.load(file)
-    file.close()
-
-    value_yesterday = list(analytics_data.keys())[len(list(analytics_data.keys())) - 2]
+    yesterday = soc_journal.get_journal().latest_before(datetime.date.today())
     state_of_charge = 0
-    if (datetime.datetime.strptime(value_yesterday, '%d-%m-%Y').date() -
-        datetime.datetime.today().date()).days == -1:
-        state_of_charge = analytics_data.get(value_yesterday).get('state_of_charge')
+    if yesterday is not None and (yesterday[0] - datetime.date.today()).days == -1:
+        state_of_charge = yesterday[1]
 
     print(state_of_charge)
 
     energy_today, pv_power_data, market_data, heating_power_data, difference_power, battery_power, _ = (
-        analytics_module.analyze_data(config_data, weather_data, init_battery_charge=state_of_charge))
+        analytics_module.analyze_data(config_data, weather_data, init_battery_charge=state_of_charge,
+                                      market_data=market_data))
 
     return render_template('analytics.html', energy_data=energy_today,
                            pv_power_data=pv_power_data, market_data=market_data,
@@ -207,7 +204,7 @@ def upload_file_solar_data():
 
 @app.route('/upload_load_profile', methods=['GET', 'POST'])
 def upload_load_profile():
-    ex: set = {'json', 'xls', 'xlsx'}
+    ex: set = {'csv', 'json', 'xls', 'xlsx'}
     if not os.path.exists(consts.LOAD_PROFILE_FOLDER):
         os.makedirs(consts.LOAD_PROFILE_FOLDER)
     err, filename, data = upload_file(ex, consts.LOAD_PROFILE_FOLDER, False)
@@ -340,10 +337,10 @@ def steering():
     config_data: dict = config_manager.config_data
     heater = config_data.get('heater')
 
-    weather_data = fc.get_weather_data(config_data, days=1)
+    weather_data, market = fetch.get_weather_and_market(config_data, days=1)
 
     energy_today, pv_power_data, market_data, heating_power_data, difference_power, battery_power, _ = (
-        analytics_module.analyze_data(config_data, weather_data, False)
+        analytics_module.analyze_data(config_data, weather_data, False, market_data=market)
     )
 
     heating_cost: list = []
@@ -385,9 +382,10 @@ def steering():
 def save_index_data():
     config_data: dict = config_manager.config_data
 
-    weather_data = fc.get_weather_data(config_data, days=16)
+    weather_data, market_data = fetch.get_weather_and_market(config_data, days=16)
 
-    data = (analytics_module.analyze_data(config_data, weather_data, False, index_data=True))
+    data = (analytics_module.analyze_data(config_data, weather_data, False, index_data=True,
+                                          market_data=market_data))
 
     file = open('./data/index_data.json', mode='w')
     json.dump(data, file)